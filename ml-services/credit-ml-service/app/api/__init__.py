@@ -4,6 +4,8 @@ from .predict import router as predict_router
 from .schemas import (
     PredictRequest,
     PredictResponse,
+    BatchPredictRequest,
+    BatchPredictResponse,
     FeatureImportance,
     ModelPrediction,
     HealthResponse,
@@ -14,6 +16,8 @@ __all__ = [
     'predict_router',
     'PredictRequest',
     'PredictResponse',
+    'BatchPredictRequest',
+    'BatchPredictResponse',
     'FeatureImportance',
     'ModelPrediction',
     'HealthResponse',
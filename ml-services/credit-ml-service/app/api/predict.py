@@ -5,51 +5,66 @@ FastAPI endpoints for ML predictions.
 """
 
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+import asyncio
+import json
 import logging
+import os
 import time
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
-from .schemas import PredictRequest, PredictResponse, FeatureImportance, ModelPrediction
-from app.features import transform_for_prediction
-from app.models import EnsembleModel
+from .schemas import (
+    PredictRequest,
+    PredictResponse,
+    BatchPredictRequest,
+    BatchPredictResponse,
+    FeatureImportance,
+    ModelPrediction
+)
+from app.features import transform_batch_for_prediction
+from app.mlops.drift_accumulator import drift_accumulator, reload_drift_reference
+from app.models import EnsembleModel, model_store
+from app.models.ensemble import top_feature_contributions
+from app.utils.inference_pool import inference_pool, InferencePoolFull
+from app.utils.micro_batcher import MicroBatcher
+from app.utils.prediction_cache import prediction_cache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["predictions"])
 
-# Global model instance (loaded on first request - lazy loading)
-_model: EnsembleModel = None
+# Upper bound on buyers per /predict/batch call (protects worker memory)
+MAX_BATCH_SIZE = int(os.getenv("PREDICT_BATCH_MAX_SIZE", "10000"))
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl", "application/ndjson")
+
+# Coalesce concurrent /predict calls into one vectorized scoring pass
+MICRO_BATCH_ENABLED = os.getenv("PREDICT_MICRO_BATCH_ENABLED", "true").lower() == "true"
+MICRO_BATCH_WINDOW_MS = float(os.getenv("PREDICT_MICRO_BATCH_WINDOW_MS", "2"))
+MICRO_BATCH_MAX_SIZE = int(os.getenv("PREDICT_MICRO_BATCH_MAX_SIZE", "64"))
+
+# Per-prediction feature contributions are opt-in: off unless
+# PREDICT_EXPLAIN_ENABLED=true or the request sets "explain". Without them
+# top_features falls back to the model's global feature importances
+EXPLAIN_ENABLED = os.getenv("PREDICT_EXPLAIN_ENABLED", "false").lower() == "true"
+TOP_FEATURES = 10
 
 
 def get_model() -> EnsembleModel:
     """
-    Get or load the ensemble model
+    Get the ensemble currently serving requests
     
-    Uses lazy loading - model is loaded on first prediction request.
-    In production, you'd load from a model registry (MLflow, S3, etc.)
+    The model is loaded in the background at startup and swapped
+    atomically on reload (see app.models.model_store).
     """
-    global _model
+    model = model_store.current
     
-    if _model is None:
-        logger.info("Loading ensemble model (lazy initialization)...")
-        
-        try:
-            # In production, load from model registry
-            # For now, create a new instance (will need to be trained first)
-            _model = EnsembleModel(version="1.0.0", use_neural_net=False)
-            
-            # TODO: Load pre-trained weights
-            # _model.load("./models/ensemble_v1.0.0.pkl")
-            
-            logger.info("Ensemble model loaded successfully")
-            
-        except Exception as e:
-            logger.error(f"Failed to load model: {e}")
-            raise HTTPException(status_code=503, detail="Model not available")
-    
-    return _model
+    if model is None:
+        raise HTTPException(status_code=503, detail=f"Model not available ({model_store.status})")
+    
+    return model
 
 
 @router.post("/predict", response_model=PredictResponse)
@@ -64,109 +79,343 @@ async def predict(request: PredictRequest) -> PredictResponse:
     4. Extract feature importance
     5. Return prediction with explainability
     """
-    start_time = time.time()
-    
     try:
+        start_time = time.time()
         logger.info(f"Prediction request for buyer: {request.buyer_id}")
         
-        # Transform to feature vector
-        unified_profile = {
-            "gst": request.gst,
-            "banking": request.banking,
-            "alerts": request.alerts,
-            "scores": request.scores or {}
-        }
-        
-        features_df = transform_for_prediction(unified_profile)
-        logger.info(f"Extracted {features_df.shape[1]} features")
-        
-        # Get model (lazy load)
+        # Identical payloads scored by the same trained model return the
+        # stored response (rule-based fallback answers are never cached)
         model = get_model()
+        cache_key = None
+        if model.is_trained:
+            cache_key = prediction_cache.key_for(request.model_dump(mode="json"), _model_identity(model))
+            cached = await prediction_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Prediction served from cache for buyer: {request.buyer_id}")
+                return PredictResponse.model_validate_json(cached).model_copy(
+                    update={"prediction_time_ms": (time.time() - start_time) * 1000}
+                )
         
-        # TEMPORARY: Since model isn't trained yet, return mock prediction
-        # In production, replace with: probability = model.predict_proba(features_df)[0]
-        
-        if not model.is_trained:
-            logger.warning("Model not trained - returning rule-based fallback")
-            return _fallback_prediction(unified_profile, features_df, start_time)
-        
-        # Generate prediction
-        probability = model.predict_proba(features_df)[0]
-        
-        # Convert to percentage
-        default_probability = float(probability * 100)
-        
-        # Risk score (inverse of probability)
-        risk_score = int((1 - probability) * 100)
+        # CPU-bound work runs on the inference pool, off the event loop
+        if MICRO_BATCH_ENABLED:
+            response = await predict_batcher.submit(request)
+        else:
+            response = (await inference_pool.run(_score_requests, [request]))[0]
         
-        # Risk category
-        risk_category = _categorize_risk(probability)
+        if cache_key is not None and response.model_type != "fallback":
+            await prediction_cache.put(cache_key, response.model_dump_json().encode("utf-8"))
         
-        # Confidence interval (simple ±3% for now, can use bootstrap for better estimates)
-        confidence_interval = [
-            max(0, default_probability - 3),
-            min(100, default_probability + 3)
-        ]
-        
-        # Feature importance
-        importance_list = model.get_feature_importance()[:10]  # Top 10
-        top_features = [
-            FeatureImportance(
-                feature=feature,
-                importance=float(importance),
-                contribution="+" if importance > 0.5 else "-"
-            )
-            for feature, importance in importance_list
-        ]
-        
-        # Model contributions (for ensemble)
-        model_contributions = model.get_model_contributions(features_df)
-        model_predictions = [
-            ModelPrediction(
-                model_name="xgboost",
-                probability=float(model_contributions["xgboost"][0]),
-                weight=model.weights["xgboost"]
-            ),
-            ModelPrediction(
-                model_name="lightgbm",
-                probability=float(model_contributions["lightgbm"][0]),
-                weight=model.weights["lightgbm"]
-            )
-        ]
-        
-        # Calculate processing time
-        processing_time_ms = (time.time() - start_time) * 1000
-        
-        # Data completeness
-        data_completeness = (
-            (50 if request.gst.get("available", False) else 0) +
-            (50 if request.banking.get("available", False) else 0)
+        logger.info(
+            f"Prediction complete in {response.prediction_time_ms:.2f}ms. "
+            f"Default prob: {response.default_probability:.2f}%"
         )
         
-        response = PredictResponse(
-            default_probability=default_probability,
-            risk_score=risk_score,
-            risk_category=risk_category,
-            confidence=85.0,  # Can calculate based on data quality
-            confidence_interval=confidence_interval,
-            model_version=f"{model.model_name}_v{model.version}",
-            model_type="ensemble",
-            top_features=top_features,
-            model_predictions=model_predictions,
-            prediction_time_ms=processing_time_ms,
-            features_used=features_df.shape[1],
-            data_completeness=data_completeness
-        )
-        
-        logger.info(f"Prediction complete in {processing_time_ms:.2f}ms. Default prob: {default_probability:.2f}%")
-        
         return response
         
+    except HTTPException:
+        raise
+    except InferencePoolFull as e:
+        logger.warning(f"Prediction rejected: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Prediction error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/predict/batch", response_model=BatchPredictResponse)
+async def predict_batch(http_request: Request):
+    """
+    Generate credit default predictions for many buyers in one call
+    
+    Accepts either:
+    - A JSON array of PredictRequest objects (or {"requests": [...]})
+    - An NDJSON stream (Content-Type: application/x-ndjson), one request per line
+    
+    All buyers are transformed into a single feature matrix and each booster
+    runs once for the whole batch. NDJSON input gets an NDJSON response with
+    one PredictResponse per line, in request order.
+    """
+    content_type = http_request.headers.get("content-type", "").split(";")[0].strip().lower()
+    is_ndjson = content_type in NDJSON_MEDIA_TYPES
+    
+    if is_ndjson:
+        requests = await _parse_ndjson(http_request)
+    else:
+        requests = await _parse_json_batch(http_request)
+    
+    if not requests:
+        raise HTTPException(status_code=422, detail="Batch contains no requests")
+    
+    start_time = time.time()
+    
+    try:
+        logger.info(f"Batch prediction request for {len(requests)} buyers")
+        predictions = await inference_pool.run(_score_requests, requests)
+    except HTTPException:
+        raise
+    except InferencePoolFull as e:
+        logger.warning(f"Batch prediction rejected: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Batch prediction error: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    batch_time_ms = (time.time() - start_time) * 1000
+    logger.info(f"Batch prediction complete: {len(predictions)} buyers in {batch_time_ms:.2f}ms")
+    
+    if is_ndjson:
+        return StreamingResponse(
+            (prediction.model_dump_json() + "\n" for prediction in predictions),
+            media_type="application/x-ndjson"
+        )
+    
+    return BatchPredictResponse(
+        predictions=predictions,
+        count=len(predictions),
+        batch_time_ms=batch_time_ms
+    )
+
+
+async def _parse_ndjson(http_request: Request) -> List[PredictRequest]:
+    """Parse an NDJSON request body incrementally, enforcing MAX_BATCH_SIZE"""
+    requests = []
+    buffer = b""
+    
+    async for chunk in http_request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            _append_ndjson_line(requests, line)
+    
+    _append_ndjson_line(requests, buffer)
+    
+    return requests
+
+
+def _append_ndjson_line(requests: List[PredictRequest], line: bytes) -> None:
+    """Validate one NDJSON line and append it to the batch"""
+    line = line.strip()
+    if not line:
+        return
+    
+    if len(requests) >= MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds maximum size of {MAX_BATCH_SIZE} requests"
+        )
+    
+    try:
+        requests.append(PredictRequest.model_validate_json(line))
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Invalid request on line {len(requests) + 1}: {e.errors()}"
+        )
+
+
+async def _parse_json_batch(http_request: Request) -> List[PredictRequest]:
+    """Parse a JSON array (or BatchPredictRequest object) body"""
+    try:
+        payload = json.loads(await http_request.body())
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+    
+    if isinstance(payload, list):
+        payload = {"requests": payload}
+    elif not isinstance(payload, dict):
+        raise HTTPException(status_code=422, detail="Expected a JSON array or object")
+    
+    if not isinstance(payload.get("requests"), list):
+        raise HTTPException(status_code=422, detail='Expected "requests" to be a JSON array')
+    
+    if len(payload["requests"]) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds maximum size of {MAX_BATCH_SIZE} requests"
+        )
+    
+    try:
+        return BatchPredictRequest.model_validate(payload).requests
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+
+
+def _build_unified_profile(request: PredictRequest) -> Dict[str, Any]:
+    """Assemble the unified profile consumed by feature engineering"""
+    return {
+        "gst": request.gst,
+        "banking": request.banking,
+        "alerts": request.alerts,
+        "scores": request.scores or {},
+        "dataCompleteness": _data_completeness(request)
+    }
+
+
+def _data_completeness(request: PredictRequest) -> int:
+    """Share of data sources (GST, banking) available for the buyer"""
+    return (
+        (50 if request.gst.get("available", False) else 0) +
+        (50 if request.banking.get("available", False) else 0)
+    )
+
+
+def _score_requests(requests: List[PredictRequest]) -> List[PredictResponse]:
+    """
+    Score one or more buyers with a single pass through the ensemble
+    
+    Builds one feature matrix for all requests, then runs each base model
+    once for the whole batch (via EnsembleModel.score) instead of once
+    per buyer.
+    """
+    start_time = time.time()
+    
+    # Transform to feature matrix (one row per buyer, vectorized)
+    unified_profiles = [_build_unified_profile(request) for request in requests]
+    # Columns are in frozen schema order, so the matrix goes to the models as-is
+    features, _ = transform_batch_for_prediction(unified_profiles)
+    logger.info(f"Extracted {features.shape[1]} features for {len(requests)} buyers")
+    
+    # Model loaded at startup (503 until the first load completes)
+    model = get_model()
+    
+    if not model.is_trained:
+        logger.warning("Model not trained - returning rule-based fallback")
+        return [
+            _fallback_prediction(profile, features, start_time).model_copy(
+                update={"buyer_id": request.buyer_id}
+            )
+            for request, profile in zip(requests, unified_profiles)
+        ]
+    
+    # One inference pass per base model for the whole batch
+    result = model.score(features, top_k=TOP_FEATURES)
+    
+    # Live drift counters (cache hits and fallback predictions are not counted)
+    if drift_accumulator is not None:
+        drift_accumulator.update(features, result.probability)
+    
+    # Global importances, the same for every buyer not asking for an explanation
+    global_top_features = [
+        FeatureImportance(
+            feature=feature,
+            importance=float(importance),
+            contribution="+" if importance > 0.5 else "-"
+        )
+        for feature, importance in result.top_features
+    ]
+    top_features = [global_top_features] * len(requests)
+    
+    # One contribution pass over the rows that want one
+    explain_rows = [
+        i for i, request in enumerate(requests)
+        if (EXPLAIN_ENABLED if request.explain is None else request.explain)
+    ]
+    if explain_rows:
+        contributions = model.explain(features[explain_rows])[:, :-1]
+        for row_contributions, i in zip(contributions, explain_rows):
+            top_features[i] = _row_top_features(row_contributions)
+    
+    # Processing time is amortized over the batch
+    processing_time_ms = (time.time() - start_time) * 1000 / len(requests)
+    
+    return [
+        _build_response(
+            request,
+            model,
+            probability=float(result.probability[i]),
+            model_predictions=[
+                ModelPrediction(
+                    model_name=model_name,
+                    probability=float(model_probability[i]),
+                    weight=model.weights[model_name]
+                )
+                for model_name, model_probability in result.model_probabilities.items()
+            ],
+            top_features=top_features[i],
+            processing_time_ms=processing_time_ms,
+            features_used=features.shape[1]
+        )
+        for i, request in enumerate(requests)
+    ]
+
+
+def _row_top_features(row_contributions: np.ndarray) -> List[FeatureImportance]:
+    """
+    Largest contributions of one row as API feature importances
+    
+    Importance is the feature's share of the row's total absolute
+    contribution (0-1); the sign gives the direction of its effect.
+    """
+    total = float(np.abs(row_contributions).sum()) or 1.0
+    
+    return [
+        FeatureImportance(
+            feature=feature,
+            importance=abs(value) / total,
+            contribution="+" if value > 0 else "-"
+        )
+        for feature, value in top_feature_contributions(row_contributions, TOP_FEATURES)
+    ]
+
+
+# Single /predict requests are coalesced into _score_requests batches
+predict_batcher = MicroBatcher(
+    _score_requests,
+    runner=inference_pool.run,
+    name="predict",
+    max_batch_size=MICRO_BATCH_MAX_SIZE,
+    window_ms=MICRO_BATCH_WINDOW_MS
+)
+
+
+def _model_identity(model: EnsembleModel) -> str:
+    """Version plus training time: changes whenever a different model is served"""
+    return f"{model.version}:{model.metadata.get('trained_at')}"
+
+
+def _build_response(
+    request: PredictRequest,
+    model: EnsembleModel,
+    probability: float,
+    model_predictions: List[ModelPrediction],
+    top_features: List[FeatureImportance],
+    processing_time_ms: float,
+    features_used: int
+) -> PredictResponse:
+    """Assemble the API response for a single scored buyer"""
+    
+    # Convert to percentage
+    default_probability = float(probability * 100)
+    
+    # Risk score (inverse of probability)
+    risk_score = int((1 - probability) * 100)
+    
+    # Risk category
+    risk_category = _categorize_risk(probability)
+    
+    # Confidence interval (simple ±3% for now, can use bootstrap for better estimates)
+    confidence_interval = [
+        max(0, default_probability - 3),
+        min(100, default_probability + 3)
+    ]
+    
+    return PredictResponse(
+        buyer_id=request.buyer_id,
+        default_probability=default_probability,
+        risk_score=risk_score,
+        risk_category=risk_category,
+        confidence=85.0,  # Can calculate based on data quality
+        confidence_interval=confidence_interval,
+        model_version=f"{model.model_name}_v{model.version}",
+        model_type="ensemble",
+        top_features=top_features,
+        model_predictions=model_predictions,
+        prediction_time_ms=processing_time_ms,
+        features_used=features_used,
+        data_completeness=_data_completeness(request)
+    )
+
+
 def _categorize_risk(probability: float) -> str:
     """Categorize default probability into risk levels"""
     if probability >= 0.5:
@@ -181,7 +430,7 @@ def _categorize_risk(probability: float) -> str:
 
 def _fallback_prediction(
     unified_profile: Dict[str, Any],
-    features_df,
+    features,
     start_time: float
 ) -> PredictResponse:
     """
@@ -226,7 +475,7 @@ def _fallback_prediction(
         top_features=top_features,
         model_predictions=None,
         prediction_time_ms=processing_time_ms,
-        features_used=features_df.shape[1],
+        features_used=features.shape[1],
         data_completeness=50.0
     )
 
@@ -245,34 +494,47 @@ async def get_model_info():
             "weights": model.weights,
             "metadata": model.metadata
         },
-        "base_models": {
-            "xgboost": {
-                "name": model.xgboost.model_name,
-                "version": model.xgboost.version,
-                "is_trained": model.xgboost.is_trained
-            },
-            "lightgbm": {
-                "name": model.lightgbm.model_name,
-                "version": model.lightgbm.version,
-                "is_trained": model.lightgbm.is_trained
-            }
-        }
+        # Boosters of a loaded artifact are reported trained before their
+        # lazy native load
+        "base_models": model.booster_info()
     }
 
 
+@router.get("/drift")
+async def get_drift(hours: Optional[float] = None):
+    """
+    Live drift of recently scored requests against the training reference
+    
+    Computed from the in-process drift counters over the last `hours`
+    (default: DRIFT_WINDOW_HOURS).
+    """
+    if drift_accumulator is None or not drift_accumulator.enabled:
+        raise HTTPException(status_code=503, detail="Drift accumulator not enabled (no reference distributions)")
+    
+    return drift_accumulator.check_drift(hours * 3600 if hours else None)
+
+
 @router.post("/models/reload")
-async def reload_models():
-    """Reload models from disk (for hot-swapping new versions)"""
-    global _model
+async def reload_models(version: Optional[str] = None):
+    """
+    Reload models (for hot-swapping new versions)
     
+    The new model is loaded and warmed while the current one keeps
+    serving, then swapped in with a single reference assignment.
+    """
     try:
-        logger.info("Reloading models...")
-        _model = None  # Force reload on next request
-        
-        # Pre-load
-        get_model()
+        logger.info(f"Reloading models (version: {version or model_store.version})...")
+        model = await asyncio.to_thread(model_store.reload, version)
+        await prediction_cache.invalidate()
+        # Drift is measured against the new model's training reference
+        await asyncio.to_thread(reload_drift_reference)
         
-        return {"status": "success", "message": "Models reloaded"}
+        return {
+            "status": "success",
+            "message": "Models reloaded",
+            "version": model.version,
+            "is_trained": model.is_trained
+        }
         
     except Exception as e:
         logger.error(f"Failed to reload models: {e}")
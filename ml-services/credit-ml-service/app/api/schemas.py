@@ -33,6 +33,12 @@ class PredictRequest(BaseModel):
     # Scores
     scores: Optional[Dict[str, Any]] = Field(None, description="Composite scores")
     
+    # Explainability
+    explain: Optional[bool] = Field(
+        None,
+        description="Per-buyer feature contributions in top_features (default: PREDICT_EXPLAIN_ENABLED)"
+    )
+    
     class Config:
         json_schema_extra = {
             "example": {
@@ -83,6 +89,9 @@ class PredictResponse(BaseModel):
     Returns ML prediction with explainability
     """
     
+    # Buyer (echoed back so batch results can be matched to requests)
+    buyer_id: Optional[str] = Field(None, description="Buyer ID")
+    
     # Prediction results
     default_probability: float = Field(..., description="Probability of default (0-100%)")
     risk_score: int = Field(..., description="Risk score (0-100, inverse of probability)")
@@ -126,6 +135,23 @@ class PredictResponse(BaseModel):
         }
 
 
+class BatchPredictRequest(BaseModel):
+    """
+    Batch prediction request schema
+    
+    Wraps N single-buyer requests so they can be scored as one feature matrix.
+    The batch endpoint also accepts a bare JSON array or an NDJSON stream.
+    """
+    requests: List[PredictRequest] = Field(..., description="Buyers to score")
+
+
+class BatchPredictResponse(BaseModel):
+    """Batch prediction response schema"""
+    predictions: List[PredictResponse] = Field(..., description="Per-buyer predictions, in request order")
+    count: int = Field(..., description="Number of buyers scored")
+    batch_time_ms: float = Field(..., description="Processing time for the whole batch in milliseconds")
+
+
 class ModelInfo(BaseModel):
     """Model metadata"""
     model_name: str
@@ -1,9 +1,31 @@
 """Features package initialization"""
 
-from .engineering import FeatureEngineer, transform_for_prediction, feature_engineer
+from .engineering import (
+    FeatureEngineer,
+    transform_for_prediction,
+    transform_batch_for_prediction,
+    feature_engineer
+)
+from .schema import (
+    FeatureSpec,
+    FEATURES,
+    FEATURE_NAMES,
+    FEATURE_INDEX,
+    FEATURE_SCHEMA_VERSION,
+    N_FEATURES,
+    as_feature_matrix
+)
 
 __all__ = [
     'FeatureEngineer',
     'transform_for_prediction',
-    'feature_engineer'
+    'transform_batch_for_prediction',
+    'feature_engineer',
+    'FeatureSpec',
+    'FEATURES',
+    'FEATURE_NAMES',
+    'FEATURE_INDEX',
+    'FEATURE_SCHEMA_VERSION',
+    'N_FEATURES',
+    'as_feature_matrix'
 ]
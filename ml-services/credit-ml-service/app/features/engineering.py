@@ -8,27 +8,48 @@ Output: Feature vector (100+ normalized features)
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import logging
 
+from .schema import (
+    FEATURES,
+    FEATURE_NAMES,
+    FEATURE_INDEX,
+    FEATURE_DEFAULTS,
+    FEATURE_SCHEMA_VERSION,
+    GATED_SECTIONS,
+    SECTION_SLICES,
+    N_FEATURES,
+    feature_frame
+)
+
 logger = logging.getLogger(__name__)
 
 
+_FRESHNESS_VALUES = {'REAL_TIME': 1.0, 'RECENT': 0.5}
+
+
 class FeatureEngineer:
     """
     Feature engineering pipeline for credit scoring
     
-    Transforms 70+ raw signals into 100+ ML features:
+    Transforms 70+ raw signals into the fixed feature vector defined in
+    app.features.schema (schema column order, float32):
     - GST signals (50)
-    - Banking signals (20)
-    - Interaction features (20)
+    - Banking signals (22)
+    - Alert signals (5)
+    - Composite scores (5)
+    - Interaction features (7)
     - Missing indicators (5)
-    - Time-based features (5)
     """
     
     def __init__(self):
-        self.feature_names = None
-        logger.info("Feature Engineer initialized")
+        self.feature_names = list(FEATURE_NAMES)
+        self.schema_version = FEATURE_SCHEMA_VERSION
+        self._batch_plan = self._compile_batch_plan()
+        logger.info(
+            f"Feature Engineer initialized ({N_FEATURES} features, schema v{FEATURE_SCHEMA_VERSION})"
+        )
         
     def transform(self, unified_profile: Dict[str, Any]) -> pd.DataFrame:
         """
@@ -42,261 +63,253 @@ class FeatureEngineer:
                 - scores: {gst_score, banking_score, overall_score, ...}
         
         Returns:
-            DataFrame with single row containing all features
+            DataFrame with single row containing all features (schema order)
         """
-        features = {}
-        
-        # 1. GST Features (50)
-        features.update(self._extract_gst_features(unified_profile.get('gst', {})))
-        
-        # 2. Banking Features (20)
-        features.update(self._extract_banking_features(unified_profile.get('banking', {})))
-        
-        # 3. Alert Features (10)
-        features.update(self._extract_alert_features(unified_profile.get('alerts', {})))
-        
-        # 4. Composite Score Features (5)
-        features.update(self._extract_score_features(unified_profile.get('scores', {})))
-        
-        # 5. Interaction Features (20)
-        features.update(self._create_interaction_features(features))
-        
-        # 6. Missing Indicators (5)
-        features.update(self._create_missing_indicators(unified_profile))
-        
-        # Store feature names for later use
-        if self.feature_names is None:
-            self.feature_names = list(features.keys())
-            logger.info(f"Generated {len(self.feature_names)} features")
-        
-        return pd.DataFrame([features])
+        features, _ = self.transform_batch([unified_profile])
+        return feature_frame(features)
     
-    def _extract_gst_features(self, gst_data: Dict) -> Dict[str, float]:
-        """Extract 50 GST signals as features"""
-        features = {}
-        
-        if not gst_data.get('available', False):
-            # Fill with zeros if GST not available
-            return self._get_default_gst_features()
-        
-        signals = gst_data.get('signals', {})
-        
-        # Turnover features (10)
-        turnover = signals.get('turnover', {})
-        features['gst_overall_score'] = self._normalize(turnover.get('score', 0), 0, 100)
-        features['gst_cagr'] = self._normalize(turnover.get('cagr', 0), -50, 100)  # -50% to 100%
-        features['gst_mom_growth'] = self._normalize(turnover.get('momGrowth', 0), -50, 50)
-        features['gst_monthly_avg'] = self._normalize_log(turnover.get('monthlyAverage', 0))
-        features['gst_seasonality'] = turnover.get('seasonalityIndex', 0.5)
-        features['gst_hhi'] = turnover.get('revenueHHI', 0.5)
-        features['gst_avg_transaction'] = self._normalize_log(turnover.get('avgTransactionSize', 0))
-        features['gst_b2b_ratio'] = self._normalize(turnover.get('b2bVsB2cRatio', 50), 0, 100)
-        features['gst_export_pct'] = turnover.get('exportComponent', 0)
-        features['gst_interstate_pct'] = turnover.get('interstatePercentage', 0)
-        
-        # Compliance features (12)
-        compliance = signals.get('compliance', {})
-        features['gst_compliance_score'] = self._normalize(compliance.get('complianceScore', 0), 0, 100)
-        features['gst_filing_regularity'] = compliance.get('filingRegularity', 0)
-        features['gst_late_filing_count'] = self._normalize(compliance.get('lateFilingCount', 0), 0, 12)
-        features['gst_tax_timeliness'] = compliance.get('taxPaymentTimeliness', 0)
-        features['gst_outstanding_dues'] = self._normalize_log(compliance.get('outstandingDues', 0))
-        features['gst_penalty_count'] = self._normalize(compliance.get('penaltyCount', 0), 0, 5)
-        features['gst_notice_count'] = self._normalize(compliance.get('noticeCount', 0), 0, 5)
-        features['gst_refund_claims'] = self._normalize(compliance.get('refundClaimsCount', 0), 0, 10)
-        features['gst_itc_utilization'] = compliance.get('itcUtilizationRate', 0)
-        features['gst_itc_reversal_freq'] = self._normalize(compliance.get('itcReversalFrequency', 0), 0, 12)
-        features['gst_amendment_freq'] = self._normalize(compliance.get('amendmentFrequency', 0), 0, 12)
-        features['gst_consistency_score'] = compliance.get('complianceScore', 50) / 100  # Duplicate normalized
-        
-        # Network features (10)
-        network = signals.get('network', {})
-        features['gst_customer_count'] = self._normalize_log(network.get('customerCount', 0))
-        features['gst_supplier_count'] = self._normalize_log(network.get('supplierCount', 0))
-        features['gst_customer_hhi'] = network.get('customerConcentrationHHI', 0.5)
-        features['gst_supplier_hhi'] = network.get('supplierConcentrationHHI', 0.5)
-        features['gst_geographic_diversity'] = network.get('geographicDiversity', 0.5)
-        features['gst_top5_customer_pct'] = network.get('top5CustomersRevenue', 0.5)
-        features['gst_top5_supplier_pct'] = network.get('top5SuppliersSpend', 0.5)
-        features['gst_new_customer_rate'] = network.get('newCustomerRate', 0)
-        features['gst_customer_churn'] = network.get('customerChurnRate', 0)
-        features['gst_network_score'] = self._normalize(network.get('score', 0), 0, 100)
-        
-        # Fraud features (8)
-        fraud = signals.get('fraud', {})
-        features['gst_fraud_score'] = self._normalize(fraud.get('score', 100), 0, 100)  # Higher = safer
-        features['gst_circular_trading'] = 1 if fraud.get('hasCircularTrading', False) else 0
-        features['gst_fake_invoice'] = 1 if fraud.get('hasFakeInvoiceIndicators', False) else 0
-        features['gst_gstr_mismatch'] = fraud.get('gstr1Vs3bMismatch', 0) / 100  # Percentage
-        features['gst_itc_anomaly'] = 1 if fraud.get('itcReversalAnomalies', False) else 0
-        features['gst_dormant_periods'] = self._normalize(fraud.get('dormantPeriods', 0), 0, 12)
-        features['gst_activity_spikes'] = self._normalize(fraud.get('suddenActivitySpikes', 0), 0, 5)
-        features['gst_related_party_txn'] = self._normalize(fraud.get('relatedPartyTransactions', 0), 0, 100)
+    def transform_batch(
+        self,
+        unified_profiles: List[Dict[str, Any]]
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Transform many unified profiles into one feature matrix
         
-        # Working Capital features (6)
-        wc = signals.get('workingCapital', {})
-        features['gst_ccc_days'] = self._normalize(wc.get('cashConversionCycle', 60), 0, 180)
-        features['gst_dso_days'] = self._normalize(wc.get('dso', 45), 0, 120)
-        features['gst_dio_days'] = self._normalize(wc.get('dio', 60), 0, 150)
-        features['gst_dpo_days'] = self._normalize(wc.get('dpo', 45), 0, 120)
-        features['gst_wc_trend'] = wc.get('wcTrend', 0)  # -1 to 1
-        features['gst_wc_score'] = self._normalize(wc.get('score', 0), 0, 100)
+        Raw signals for every profile are gathered into a preallocated
+        matrix in a single pass, then the normalizations are applied
+        column-wise. Every feature has a fixed position from the schema,
+        so no per-row column alignment is needed.
         
-        # Additional features (4)
-        additional = signals.get('additional', {})
-        features['gst_business_age_years'] = self._normalize(additional.get('businessAge', 0), 0, 50)
-        features['gst_reg_type_pvt'] = 1 if 'Private' in additional.get('registrationType', '') else 0
-        features['gst_industry_benchmark'] = self._normalize(additional.get('industryBenchmarkScore', 50), 0, 100)
-        features['gst_peer_rank'] = additional.get('peerGroupRank', 50) / 100
+        Args:
+            unified_profiles: List of unified profile dictionaries
         
-        return features
+        Returns:
+            (float32 matrix of shape [n_profiles, N_FEATURES], column names)
+        """
+        plan = self._batch_plan
+        n_rows = len(unified_profiles)
+        
+        raw = np.empty((n_rows, plan["n_raw"]), dtype=np.float64)
+        available = {section: np.zeros(n_rows, dtype=bool) for section in GATED_SECTIONS}
+        completeness = np.empty(n_rows, dtype=np.float64)
+        
+        # 1. Single pass over profiles: gather raw signal values
+        for i, profile in enumerate(unified_profiles):
+            row = raw[i]
+            for section_key, columns, specs, gated in plan["sections"]:
+                section = profile.get(section_key, {})
+                if gated:
+                    is_available = bool(section.get('available', False))
+                    available[section_key][i] = is_available
+                    if not is_available:
+                        # Any finite value works, the section is reset to defaults below
+                        row[columns] = 0
+                        continue
+                    signals = section.get('signals', {})
+                else:
+                    signals = section
+                
+                offset = columns.start
+                groups = {}
+                for j, spec in enumerate(specs):
+                    if spec.group == '$section':
+                        source = section
+                    elif spec.group is None:
+                        source = signals
+                    else:
+                        source = groups.get(spec.group)
+                        if source is None:
+                            source = groups[spec.group] = signals.get(spec.group, {})
+                    row[offset + j] = self._preprocess_raw(
+                        source.get(spec.key, spec.raw_default), spec.transform
+                    )
+            
+            completeness[i] = profile.get('dataCompleteness', 0)
+        
+        # 2. Column-wise normalization
+        values = self._apply_batch_transforms(raw, plan)
+        
+        # Unavailable GST/banking sections fall back to schema defaults
+        for section_key in GATED_SECTIONS:
+            columns = SECTION_SLICES[section_key]
+            values[~available[section_key], columns] = FEATURE_DEFAULTS[columns]
+        
+        # 3. Write straight into the preallocated schema-layout output
+        features = np.empty((n_rows, N_FEATURES), dtype=np.float32)
+        features[:, :plan["n_raw"]] = values
+        features[:, plan["n_raw"]:] = self.compute_derived_features(
+            values,
+            has_gst=available['gst'],
+            has_banking=available['banking'],
+            data_completeness=completeness
+        )
+        
+        return features, list(FEATURE_NAMES)
     
-    def _extract_banking_features(self, banking_data: Dict) -> Dict[str, float]:
-        """Extract 20 banking signals as features"""
-        features = {}
-        
-        if not banking_data.get('available', False):
-            return self._get_default_banking_features()
-        
-        signals = banking_data.get('signals', {})
-        
-        # Cash flow features (6)
-        cash_flow = signals.get('cashFlow', {})
-        features['bank_monthly_income'] = self._normalize_log(cash_flow.get('monthlyIncome', 0))
-        features['bank_income_stability'] = 1 - cash_flow.get('incomeStabilityCV', 1)  # Lower CV = more stable
-        features['bank_monthly_expense'] = self._normalize_log(cash_flow.get('monthlyExpenses', 0))
-        features['bank_net_cash_flow'] = self._normalize_log(abs(cash_flow.get('netCashFlow', 0)))
-        features['bank_cash_trend'] = (cash_flow.get('cashFlowTrend', 0) + 1) / 2  # -1 to 1 → 0 to 1
-        features['bank_cash_volatility'] = 1 - min(cash_flow.get('cashFlowVolatility', 1), 1)
-        
-        # Spend pattern features (5)
-        spend = signals.get('spendPattern', {})
-        features['bank_emi_amount'] = self._normalize_log(spend.get('emiPayments', 0))
-        features['bank_rent_fixed'] = self._normalize_log(spend.get('rentAndFixedCosts', 0))
-        features['bank_discretionary'] = self._normalize_log(spend.get('discretionarySpend', 0))
-        features['bank_bounce_rate'] = spend.get('bounceRate', 0) / 100  # CRITICAL
-        features['bank_overdraft_usage'] = self._normalize(spend.get('overdraftUsage', 0), 0, 100000)
-        
-        # Savings features (4)
-        savings = signals.get('savings', {})
-        features['bank_savings_rate'] = savings.get('savingsRate', 0) / 100
-        features['bank_avg_balance'] = self._normalize_log(savings.get('averageBalance', 0))
-        features['bank_min_balance'] = self._normalize_log(savings.get('minimumBalance', 0))
-        features['bank_balance_trend'] = (savings.get('balanceTrend', 0) + 1) / 2
-        
-        # Banking stability features (3)
-        stability = signals.get('bankingStability', {})
-        features['bank_account_age_years'] = self._normalize(stability.get('accountAgeInMonths', 0) / 12, 0, 20)
-        features['bank_relationships'] = self._normalize(stability.get('bankingRelationships', 0), 0, 5)
-        features['bank_digital_activity'] = stability.get('digitalActivityRate', 0) / 100
-        
-        # Liquidity features (2)
-        liquidity = signals.get('liquidity', {})
-        features['bank_liquidity_buffer'] = self._normalize(liquidity.get('liquidityBuffer', 0), 0, 12)  # Months
-        features['bank_emergency_fund'] = self._normalize(liquidity.get('emergencyFundScore', 0), 0, 100)
+    @classmethod
+    def compute_derived_features(
+        cls,
+        values: np.ndarray,
+        has_gst: np.ndarray,
+        has_banking: np.ndarray,
+        data_completeness: np.ndarray
+    ) -> np.ndarray:
+        """
+        Compute interaction features and missing indicators
         
-        # Overall banking score
-        features['bank_overall_score'] = self._normalize(signals.get('overallScore', 0), 0, 100)
+        Shared with the synthetic data generator so training data carries
+        the same derived columns as serving.
         
-        # Data freshness (bonus feature)
-        freshness = banking_data.get('dataFreshness', 'STALE')
-        features['bank_data_fresh'] = 1 if freshness == 'REAL_TIME' else (0.5 if freshness == 'RECENT' else 0)
+        Args:
+            values: Matrix holding at least the source (non-derived) columns
+                in schema order
+            has_gst: Boolean per row, GST data available
+            has_banking: Boolean per row, banking data available
+            data_completeness: Data completeness per row (0-100)
         
-        return features
-    
-    def _extract_alert_features(self, alerts_data: Dict) -> Dict[str, float]:
-        """Extract alert-based features"""
-        return {
-            'alert_critical_count': min(alerts_data.get('criticalCount', 0), 10) / 10,
-            'alert_warning_count': min(alerts_data.get('warningCount', 0), 10) / 10,
-            'alert_has_emi_bounce': 1 if alerts_data.get('hasEMIBounce', False) else 0,
-           'alert_has_cash_drop': 1 if alerts_data.get('hasCashFlowDrop', False) else 0,
-            'alert_total_count': min(len(alerts_data.get('active', [])), 20) / 20,
-        }
-    
-    def _extract_score_features(self, scores_data: Dict) -> Dict[str, float]:
-        """Extract composite scores"""
-        return {
-            'score_gst': self._normalize(scores_data.get('gstScore', 0), 0, 100),
-            'score_banking': self._normalize(scores_data.get('bankingScore', 0), 0, 100),
-            'score_alert_penalty': self._normalize(scores_data.get('alertPenalty', 100), 0, 100),
-            'score_overall': self._normalize(scores_data.get('overallScore', 0), 0, 100),
-            'score_confidence': self._normalize(scores_data.get('confidence', 50), 0, 100),
-        }
+        Returns:
+            Matrix of shape [n_rows, 12] (interactions, then missing indicators)
+        """
+        has_alerts = values[:, FEATURE_INDEX['alert_total_count']] > 0
+        
+        return np.column_stack([
+            cls._batch_interactions(values, has_gst, has_banking),
+            has_gst,
+            has_banking,
+            has_gst & has_banking,
+            data_completeness / 100,
+            has_alerts,
+        ])
     
-    def _create_interaction_features(self, features: Dict[str, float]) -> Dict[str, float]:
-        """Create interaction features from existing ones"""
-        interactions = {}
-        
-        # GST × Banking interactions
-        gst_score = features.get('gst_overall_score', 0)
-        bank_score = features.get('bank_overall_score', 0)
-        
-        interactions['interaction_gst_bank'] = gst_score * bank_score
-        interactions['interaction_gst_bank_gap'] = abs(gst_score - bank_score)
-        
-        # Income × Turnover
-        gst_turnover = features.get('gst_monthly_avg', 0)
-        bank_income = features.get('bank_monthly_income', 0)
-        interactions['interaction_turnover_income'] = gst_turnover * bank_income
-        interactions['interaction_turnover_income_ratio'] = self._safe_divide(gst_turnover, bank_income)
-        
-        # Compliance × Stability
-        gst_compliance = features.get('gst_compliance_score', 0)
-        bank_stability = features.get('bank_account_age_years', 0)
-        interactions['interaction_compliance_stability'] = gst_compliance * bank_stability
-        
-        # Fraud × Bounce
-        gst_fraud = features.get('gst_fraud_score', 1)
-        bank_bounce = features.get('bank_bounce_rate', 0)
-        interactions['interaction_fraud_bounce'] = (1 - gst_fraud) * bank_bounce  # Both negative
-        
-        # Cash flow × Working capital
-        bank_cash_trend = features.get('bank_cash_trend', 0.5)
-        gst_wc_trend = features.get('gst_wc_trend', 0)
-        interactions['interaction_cash_wc_trend'] = bank_cash_trend * ((gst_wc_trend + 1) / 2)
+    @staticmethod
+    def _compile_batch_plan() -> Dict[str, Any]:
+        """Precompute section layout and per-transform index arrays"""
+        sections = []
+        transforms = []
+        for section_key, columns in SECTION_SLICES.items():
+            if section_key == 'derived':
+                continue
+            specs = FEATURES[columns]
+            sections.append((section_key, columns, specs, section_key in GATED_SECTIONS))
+            transforms.extend(spec.transform for spec in specs)
+        
+        # Group columns by transform kind so each kind is one array operation
+        by_kind: Dict[str, List[Tuple[int, tuple]]] = {}
+        for col, transform in enumerate(transforms):
+            by_kind.setdefault(transform[0], []).append((col, transform[1:]))
+        
+        ops = {}
+        for kind, entries in by_kind.items():
+            idx = np.array([col for col, _ in entries], dtype=np.intp)
+            if kind in ('contains',):
+                params = None  # Applied during raw extraction
+            else:
+                params = np.array([args for _, args in entries], dtype=np.float64).reshape(len(entries), -1)
+            ops[kind] = (idx, params)
         
-        return interactions
-    
-    def _create_missing_indicators(self, unified_profile: Dict) -> Dict[str, float]:
-        """Create binary indicators for missing data"""
         return {
-            'has_gst_data': 1 if unified_profile.get('gst', {}).get('available', False) else 0,
-            'has_banking_data': 1 if unified_profile.get('banking', {}).get('available', False) else 0,
-            'has_both_data': 1 if (unified_profile.get('gst', {}).get('available', False) and 
-                                   unified_profile.get('banking', {}).get('available', False)) else 0,
-            'data_completeness': unified_profile.get('dataCompleteness', 0) / 100,
-            'has_alerts': 1 if len(unified_profile.get('alerts', {}).get('active', [])) > 0 else 0,
+            "sections": sections,
+            "n_raw": len(transforms),
+            "ops": ops,
         }
     
-    def _get_default_gst_features(self) -> Dict[str, float]:
-        """Return zero features when GST not available"""
-        return {f'gst_{i}': 0 for i in range(50)}
+    @staticmethod
+    def _preprocess_raw(value: Any, transform: tuple) -> float:
+        """Convert non-numeric raw signals (flags, strings, lists) to floats"""
+        kind = transform[0]
+        if kind == 'flag':
+            return 1.0 if value else 0.0
+        if kind == 'contains':
+            return 1.0 if transform[1] in value else 0.0
+        if kind == 'len_cap':
+            return len(value)
+        if kind == 'freshness':
+            return _FRESHNESS_VALUES.get(value, 0.0)
+        return value
     
-    def _get_default_banking_features(self) -> Dict[str, float]:
-        """Return zero features when banking not available"""
-        return {f'bank_{i}': 0 for i in range(22)}
+    @classmethod
+    def _apply_batch_transforms(cls, raw: np.ndarray, plan: Dict[str, Any]) -> np.ndarray:
+        """Apply every normalization as one column-wise array operation per kind"""
+        out = raw.copy()
+        
+        for kind, (idx, params) in plan["ops"].items():
+            block = raw[:, idx]
+            
+            if kind == 'norm':
+                out[:, idx] = cls._normalize_array(block, params[:, 0], params[:, 1])
+            elif kind == 'months_norm':
+                out[:, idx] = cls._normalize_array(block / 12, params[:, 0], params[:, 1])
+            elif kind == 'log':
+                out[:, idx] = cls._normalize_log_array(block)
+            elif kind == 'log_abs':
+                out[:, idx] = cls._normalize_log_array(np.abs(block))
+            elif kind == 'scale':
+                out[:, idx] = block / params[:, 0]
+            elif kind in ('cap', 'len_cap'):
+                out[:, idx] = np.minimum(block, params[:, 0]) / params[:, 0]
+            elif kind == 'one_minus':
+                out[:, idx] = 1 - block
+            elif kind == 'one_minus_cap':
+                out[:, idx] = 1 - np.minimum(block, 1)
+            elif kind == 'trend':
+                out[:, idx] = (block + 1) / 2
+            # 'raw', 'flag', 'contains', 'freshness' are already final
+        
+        return out
     
     @staticmethod
-    def _normalize(value: float, min_val: float, max_val: float) -> float:
-        """Normalize value to 0-1 range"""
-        if max_val == min_val:
-            return 0.5
-        return max(0, min(1, (value - min_val) / (max_val - min_val)))
+    def _batch_interactions(
+        values: np.ndarray,
+        has_gst: np.ndarray,
+        has_banking: np.ndarray
+    ) -> np.ndarray:
+        """Create interaction features from existing ones (column-wise)"""
+        
+        def col(name: str, section_available: np.ndarray, missing_default: float) -> np.ndarray:
+            # Inputs from an unavailable section use a neutral fallback
+            return np.where(section_available, values[:, FEATURE_INDEX[name]], missing_default)
+        
+        gst_score = col('gst_overall_score', has_gst, 0)
+        bank_score = col('bank_overall_score', has_banking, 0)
+        gst_turnover = col('gst_monthly_avg', has_gst, 0)
+        bank_income = col('bank_monthly_income', has_banking, 0)
+        gst_compliance = col('gst_compliance_score', has_gst, 0)
+        bank_stability = col('bank_account_age_years', has_banking, 0)
+        gst_fraud = col('gst_fraud_score', has_gst, 1)
+        bank_bounce = col('bank_bounce_rate', has_banking, 0)
+        bank_cash_trend = col('bank_cash_trend', has_banking, 0.5)
+        gst_wc_trend = col('gst_wc_trend', has_gst, 0)
+        
+        # Income × Turnover ratio, capped at 10x (safe division)
+        ratio = np.divide(
+            gst_turnover, bank_income,
+            out=np.zeros_like(gst_turnover), where=bank_income != 0
+        )
+        ratio = np.where(bank_income != 0, np.minimum(10, ratio) / 10, 0)
+        
+        return np.column_stack([
+            gst_score * bank_score,                                # GST × Banking
+            np.abs(gst_score - bank_score),
+            gst_turnover * bank_income,                            # Income × Turnover
+            ratio,
+            gst_compliance * bank_stability,                       # Compliance × Stability
+            (1 - gst_fraud) * bank_bounce,                         # Fraud × Bounce
+            bank_cash_trend * ((gst_wc_trend + 1) / 2),            # Cash flow × Working capital
+        ])
     
     @staticmethod
-    def _normalize_log(value: float, base: float = 100000) -> float:
-        """Log-normalize value (useful for monetary amounts)"""
-        if value <= 0:
-            return 0
-        return min(1, np.log1p(value) / np.log1p(base))
+    def _normalize_array(values: np.ndarray, min_val: np.ndarray, max_val: np.ndarray) -> np.ndarray:
+        """Normalize columns to 0-1 range (bounds broadcast across rows)"""
+        span = max_val - min_val
+        scaled = np.divide(values - min_val, span, out=np.full_like(values, 0.5), where=span != 0)
+        return np.where(span != 0, np.clip(scaled, 0, 1), 0.5)
     
     @staticmethod
-    def _safe_divide(numerator: float, denominator: float) -> float:
-        """Safe division with zero handling"""
-        if denominator == 0:
-            return 0
-        return min(10, numerator / denominator) / 10  # Cap at 10x
+    def _normalize_log_array(values: np.ndarray, base: float = 100000) -> np.ndarray:
+        """Log-normalize columns (useful for monetary amounts)"""
+        positive = values > 0
+        logged = np.log1p(np.where(positive, values, 0)) / np.log1p(base)
+        return np.where(positive, np.minimum(1, logged), 0)
 
 
 # Singleton instance
@@ -314,3 +327,18 @@ def transform_for_prediction(unified_profile: Dict[str, Any]) -> pd.DataFrame:
         DataFrame with normalized feature vector
     """
     return feature_engineer.transform(unified_profile)
+
+
+def transform_batch_for_prediction(
+    unified_profiles: List[Dict[str, Any]]
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Batch entry point for feature transformation
+    
+    Args:
+        unified_profiles: List of outputs from UnifiedCreditIntelligenceService
+    
+    Returns:
+        (float32 feature matrix, column names)
+    """
+    return feature_engineer.transform_batch(unified_profiles)
@@ -0,0 +1,268 @@
+"""
+Credit Feature Schema
+
+Frozen, versioned definition of the credit model feature vector.
+
+Training (synthetic_data.py), feature engineering (engineering.py) and the
+models (XGBoostModel, LightGBMModel) all compile against this module, so the
+column set and column order never depend on which signals a profile happens
+to carry. Serving writes features straight into fixed array positions.
+
+Bump FEATURE_SCHEMA_VERSION whenever a feature is added, removed, reordered
+or its transform changes - models trained on another version refuse to load.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+
+FEATURE_SCHEMA_VERSION = "1.0.0"
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """
+    One column of the feature vector
+    
+    Attributes:
+        name: Feature (column) name
+        section: Unified profile section ('gst', 'banking', 'alerts', 'scores')
+            or 'derived' for features computed from other features
+        group: Signal group inside the section's signals dict. None reads the
+            key from the signals dict directly, '$section' from the section itself
+        key: Signal key to read
+        raw_default: Raw value used when the signal key is missing
+        transform: Normalization applied to the raw value, e.g. ('norm', 0, 100)
+        default: Final feature value used when the whole section is unavailable
+    """
+    name: str
+    section: str
+    group: Optional[str] = None
+    key: Optional[str] = None
+    raw_default: Any = 0
+    transform: Tuple = ('raw',)
+    default: float = 0.0
+
+
+# ============================================================================
+# Extraction specs
+# ============================================================================
+# Each entry is (feature name, signal group, signal key, raw default, transform).
+# Order matters: it is the column order of the feature vector.
+
+_GST_SPECS = (
+    # Turnover features (10)
+    ('gst_overall_score', 'turnover', 'score', 0, ('norm', 0, 100)),
+    ('gst_cagr', 'turnover', 'cagr', 0, ('norm', -50, 100)),
+    ('gst_mom_growth', 'turnover', 'momGrowth', 0, ('norm', -50, 50)),
+    ('gst_monthly_avg', 'turnover', 'monthlyAverage', 0, ('log',)),
+    ('gst_seasonality', 'turnover', 'seasonalityIndex', 0.5, ('raw',)),
+    ('gst_hhi', 'turnover', 'revenueHHI', 0.5, ('raw',)),
+    ('gst_avg_transaction', 'turnover', 'avgTransactionSize', 0, ('log',)),
+    ('gst_b2b_ratio', 'turnover', 'b2bVsB2cRatio', 50, ('norm', 0, 100)),
+    ('gst_export_pct', 'turnover', 'exportComponent', 0, ('raw',)),
+    ('gst_interstate_pct', 'turnover', 'interstatePercentage', 0, ('raw',)),
+    # Compliance features (12)
+    ('gst_compliance_score', 'compliance', 'complianceScore', 0, ('norm', 0, 100)),
+    ('gst_filing_regularity', 'compliance', 'filingRegularity', 0, ('raw',)),
+    ('gst_late_filing_count', 'compliance', 'lateFilingCount', 0, ('norm', 0, 12)),
+    ('gst_tax_timeliness', 'compliance', 'taxPaymentTimeliness', 0, ('raw',)),
+    ('gst_outstanding_dues', 'compliance', 'outstandingDues', 0, ('log',)),
+    ('gst_penalty_count', 'compliance', 'penaltyCount', 0, ('norm', 0, 5)),
+    ('gst_notice_count', 'compliance', 'noticeCount', 0, ('norm', 0, 5)),
+    ('gst_refund_claims', 'compliance', 'refundClaimsCount', 0, ('norm', 0, 10)),
+    ('gst_itc_utilization', 'compliance', 'itcUtilizationRate', 0, ('raw',)),
+    ('gst_itc_reversal_freq', 'compliance', 'itcReversalFrequency', 0, ('norm', 0, 12)),
+    ('gst_amendment_freq', 'compliance', 'amendmentFrequency', 0, ('norm', 0, 12)),
+    ('gst_consistency_score', 'compliance', 'complianceScore', 50, ('scale', 100)),
+    # Network features (10)
+    ('gst_customer_count', 'network', 'customerCount', 0, ('log',)),
+    ('gst_supplier_count', 'network', 'supplierCount', 0, ('log',)),
+    ('gst_customer_hhi', 'network', 'customerConcentrationHHI', 0.5, ('raw',)),
+    ('gst_supplier_hhi', 'network', 'supplierConcentrationHHI', 0.5, ('raw',)),
+    ('gst_geographic_diversity', 'network', 'geographicDiversity', 0.5, ('raw',)),
+    ('gst_top5_customer_pct', 'network', 'top5CustomersRevenue', 0.5, ('raw',)),
+    ('gst_top5_supplier_pct', 'network', 'top5SuppliersSpend', 0.5, ('raw',)),
+    ('gst_new_customer_rate', 'network', 'newCustomerRate', 0, ('raw',)),
+    ('gst_customer_churn', 'network', 'customerChurnRate', 0, ('raw',)),
+    ('gst_network_score', 'network', 'score', 0, ('norm', 0, 100)),
+    # Fraud features (8)
+    ('gst_fraud_score', 'fraud', 'score', 100, ('norm', 0, 100)),
+    ('gst_circular_trading', 'fraud', 'hasCircularTrading', False, ('flag',)),
+    ('gst_fake_invoice', 'fraud', 'hasFakeInvoiceIndicators', False, ('flag',)),
+    ('gst_gstr_mismatch', 'fraud', 'gstr1Vs3bMismatch', 0, ('scale', 100)),
+    ('gst_itc_anomaly', 'fraud', 'itcReversalAnomalies', False, ('flag',)),
+    ('gst_dormant_periods', 'fraud', 'dormantPeriods', 0, ('norm', 0, 12)),
+    ('gst_activity_spikes', 'fraud', 'suddenActivitySpikes', 0, ('norm', 0, 5)),
+    ('gst_related_party_txn', 'fraud', 'relatedPartyTransactions', 0, ('norm', 0, 100)),
+    # Working Capital features (6)
+    ('gst_ccc_days', 'workingCapital', 'cashConversionCycle', 60, ('norm', 0, 180)),
+    ('gst_dso_days', 'workingCapital', 'dso', 45, ('norm', 0, 120)),
+    ('gst_dio_days', 'workingCapital', 'dio', 60, ('norm', 0, 150)),
+    ('gst_dpo_days', 'workingCapital', 'dpo', 45, ('norm', 0, 120)),
+    ('gst_wc_trend', 'workingCapital', 'wcTrend', 0, ('raw',)),
+    ('gst_wc_score', 'workingCapital', 'score', 0, ('norm', 0, 100)),
+    # Additional features (4)
+    ('gst_business_age_years', 'additional', 'businessAge', 0, ('norm', 0, 50)),
+    ('gst_reg_type_pvt', 'additional', 'registrationType', '', ('contains', 'Private')),
+    ('gst_industry_benchmark', 'additional', 'industryBenchmarkScore', 50, ('norm', 0, 100)),
+    ('gst_peer_rank', 'additional', 'peerGroupRank', 50, ('scale', 100)),
+)
+
+_BANKING_SPECS = (
+    # Cash flow features (6)
+    ('bank_monthly_income', 'cashFlow', 'monthlyIncome', 0, ('log',)),
+    ('bank_income_stability', 'cashFlow', 'incomeStabilityCV', 1, ('one_minus',)),
+    ('bank_monthly_expense', 'cashFlow', 'monthlyExpenses', 0, ('log',)),
+    ('bank_net_cash_flow', 'cashFlow', 'netCashFlow', 0, ('log_abs',)),
+    ('bank_cash_trend', 'cashFlow', 'cashFlowTrend', 0, ('trend',)),
+    ('bank_cash_volatility', 'cashFlow', 'cashFlowVolatility', 1, ('one_minus_cap',)),
+    # Spend pattern features (5)
+    ('bank_emi_amount', 'spendPattern', 'emiPayments', 0, ('log',)),
+    ('bank_rent_fixed', 'spendPattern', 'rentAndFixedCosts', 0, ('log',)),
+    ('bank_discretionary', 'spendPattern', 'discretionarySpend', 0, ('log',)),
+    ('bank_bounce_rate', 'spendPattern', 'bounceRate', 0, ('scale', 100)),
+    ('bank_overdraft_usage', 'spendPattern', 'overdraftUsage', 0, ('norm', 0, 100000)),
+    # Savings features (4)
+    ('bank_savings_rate', 'savings', 'savingsRate', 0, ('scale', 100)),
+    ('bank_avg_balance', 'savings', 'averageBalance', 0, ('log',)),
+    ('bank_min_balance', 'savings', 'minimumBalance', 0, ('log',)),
+    ('bank_balance_trend', 'savings', 'balanceTrend', 0, ('trend',)),
+    # Banking stability features (3)
+    ('bank_account_age_years', 'bankingStability', 'accountAgeInMonths', 0, ('months_norm', 0, 20)),
+    ('bank_relationships', 'bankingStability', 'bankingRelationships', 0, ('norm', 0, 5)),
+    ('bank_digital_activity', 'bankingStability', 'digitalActivityRate', 0, ('scale', 100)),
+    # Liquidity features (2)
+    ('bank_liquidity_buffer', 'liquidity', 'liquidityBuffer', 0, ('norm', 0, 12)),
+    ('bank_emergency_fund', 'liquidity', 'emergencyFundScore', 0, ('norm', 0, 100)),
+    # Overall banking score
+    ('bank_overall_score', None, 'overallScore', 0, ('norm', 0, 100)),
+    # Data freshness (bonus feature)
+    ('bank_data_fresh', '$section', 'dataFreshness', 'STALE', ('freshness',)),
+)
+
+_ALERT_SPECS = (
+    ('alert_critical_count', '$section', 'criticalCount', 0, ('cap', 10)),
+    ('alert_warning_count', '$section', 'warningCount', 0, ('cap', 10)),
+    ('alert_has_emi_bounce', '$section', 'hasEMIBounce', False, ('flag',)),
+    ('alert_has_cash_drop', '$section', 'hasCashFlowDrop', False, ('flag',)),
+    ('alert_total_count', '$section', 'active', (), ('len_cap', 20)),
+)
+
+_SCORE_SPECS = (
+    ('score_gst', '$section', 'gstScore', 0, ('norm', 0, 100)),
+    ('score_banking', '$section', 'bankingScore', 0, ('norm', 0, 100)),
+    ('score_alert_penalty', '$section', 'alertPenalty', 100, ('norm', 0, 100)),
+    ('score_overall', '$section', 'overallScore', 0, ('norm', 0, 100)),
+    ('score_confidence', '$section', 'confidence', 50, ('norm', 0, 100)),
+)
+
+INTERACTION_FEATURES = (
+    'interaction_gst_bank',
+    'interaction_gst_bank_gap',
+    'interaction_turnover_income',
+    'interaction_turnover_income_ratio',
+    'interaction_compliance_stability',
+    'interaction_fraud_bounce',
+    'interaction_cash_wc_trend',
+)
+
+MISSING_INDICATOR_FEATURES = (
+    'has_gst_data',
+    'has_banking_data',
+    'has_both_data',
+    'data_completeness',
+    'has_alerts',
+)
+
+# Sections whose features are zero-filled (FeatureSpec.default) when the
+# profile marks them unavailable
+GATED_SECTIONS = ('gst', 'banking')
+
+
+def _section(section: str, specs: Tuple[tuple, ...]) -> Tuple[FeatureSpec, ...]:
+    return tuple(
+        FeatureSpec(name, section, group, key, raw_default, transform)
+        for name, group, key, raw_default, transform in specs
+    )
+
+
+FEATURES: Tuple[FeatureSpec, ...] = (
+    _section('gst', _GST_SPECS)
+    + _section('banking', _BANKING_SPECS)
+    + _section('alerts', _ALERT_SPECS)
+    + _section('scores', _SCORE_SPECS)
+    + tuple(FeatureSpec(name, 'derived') for name in INTERACTION_FEATURES)
+    + tuple(FeatureSpec(name, 'derived') for name in MISSING_INDICATOR_FEATURES)
+)
+
+FEATURE_NAMES: Tuple[str, ...] = tuple(spec.name for spec in FEATURES)
+FEATURE_INDEX: Dict[str, int] = {name: i for i, name in enumerate(FEATURE_NAMES)}
+N_FEATURES = len(FEATURES)
+
+# Value per column when its source is unavailable
+FEATURE_DEFAULTS = np.array([spec.default for spec in FEATURES], dtype=np.float32)
+FEATURE_DEFAULTS.setflags(write=False)
+
+# Contiguous column range of every section
+SECTION_SLICES: Dict[str, slice] = {}
+for _i, _spec in enumerate(FEATURES):
+    _current = SECTION_SLICES.get(_spec.section)
+    SECTION_SLICES[_spec.section] = slice(_current.start if _current else _i, _i + 1)
+del _i, _spec, _current
+
+if len(FEATURE_INDEX) != N_FEATURES:
+    raise RuntimeError("Duplicate feature names in credit feature schema")
+
+
+def empty_feature_matrix(n_rows: int) -> np.ndarray:
+    """Allocate an [n_rows, N_FEATURES] float32 matrix filled with defaults"""
+    return np.tile(FEATURE_DEFAULTS, (n_rows, 1))
+
+
+def as_feature_matrix(X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+    """
+    Coerce features to the schema layout (float32, schema column order)
+    
+    Arrays are trusted to already be in schema order and are only checked
+    for width. DataFrames are reordered by name; extra columns (labels,
+    ids) are dropped and missing columns raise.
+    
+    Args:
+        X: Feature DataFrame or array
+    
+    Returns:
+        C-contiguous float32 array of shape [n_rows, N_FEATURES]
+    """
+    if isinstance(X, pd.DataFrame):
+        if tuple(X.columns) != FEATURE_NAMES:
+            missing = [name for name in FEATURE_NAMES if name not in X.columns]
+            if missing:
+                raise ValueError(
+                    f"Features missing from schema v{FEATURE_SCHEMA_VERSION}: {missing}"
+                )
+            X = X.loc[:, list(FEATURE_NAMES)]
+        X = X.to_numpy(dtype=np.float32)
+    
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    if X.ndim != 2 or X.shape[1] != N_FEATURES:
+        raise ValueError(
+            f"Expected {N_FEATURES} features (schema v{FEATURE_SCHEMA_VERSION}), got shape {X.shape}"
+        )
+    
+    return X
+
+
+def check_schema_version(version: Optional[str], model_name: str) -> None:
+    """Raise if a model was trained against a different schema version"""
+    if version is not None and version != FEATURE_SCHEMA_VERSION:
+        raise ValueError(
+            f"{model_name} was trained on feature schema v{version}, "
+            f"service uses v{FEATURE_SCHEMA_VERSION}"
+        )
+
+
+def feature_frame(X: np.ndarray) -> pd.DataFrame:
+    """Wrap a schema-layout matrix in a DataFrame (no copy)"""
+    return pd.DataFrame(X, columns=list(FEATURE_NAMES), copy=False)
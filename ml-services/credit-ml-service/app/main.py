@@ -9,6 +9,9 @@ from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
+from app.models import model_store
+from app.utils.inference_pool import inference_pool
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,25 +36,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global model storage
-models = {
-    "xgboost": None,
-    "lightgbm": None,
-    "neural_net": None,
-    "ensemble": None
-}
-
 @app.on_event("startup")
 async def startup_event():
     """Load ML models on startup"""
     logger.info("Starting Credit ML Service...")
-    logger.info("Models will be loaded on first prediction (lazy loading)")
+    # Load in the background so the service starts accepting health checks immediately
+    logger.info(f"Loading models in background (source: {model_store.source})...")
+    model_store.start_background_load()
     logger.info("Service ready!")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down Credit ML Service...")
+    from app.api.predict import predict_batcher
+    await predict_batcher.stop()
+    inference_pool.shutdown(wait=False)
 
 @app.get("/")
 def root():
@@ -71,20 +71,21 @@ def root():
 @app.get("/health")
 def health_check():
     """Health check endpoint"""
+    store_status = model_store.get_status()
     return {
         "status": "healthy",
-        "models_loaded": {
-            "xgboost": models["xgboost"] is not None,
-            "lightgbm": models["lightgbm"] is not None,
-            "neural_net": models["neural_net"] is not None,
-            "ensemble": models["ensemble"] is not None
-        }
+        "model_status": store_status["status"],
+        "model_version": store_status["version"],
+        "models_loaded": store_status["models_loaded"]
     }
 
 @app.get("/metrics")
 def metrics():
-    """Prometheus metrics endpoint"""
+    """Prometheus metrics endpoint (drift gauges are refreshed from the live counters)"""
     from app.monitoring.prometheus_metrics import get_metrics
+    from app.mlops.drift_accumulator import drift_accumulator
+    if drift_accumulator is not None:
+        drift_accumulator.publish()
     return Response(content=get_metrics(), media_type="text/plain")
 
 # Import and include API routes
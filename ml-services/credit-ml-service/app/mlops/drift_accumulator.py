@@ -0,0 +1,527 @@
+"""
+Streaming Drift Accumulator
+
+Live drift monitoring from inside the service: every scored batch is
+binned against the reference histograms (the bin edges saved by
+DriftDetector.save_reference_distributions) and added to per-feature
+bin counters, so PSI, the ml_drift_psi_score gauge and should_retrain
+are available without exporting features.
+
+- Counters live in a ring of time buckets (DRIFT_BUCKET_SECONDS each,
+  DRIFT_WINDOW_HOURS in total). Memory is constant: buckets x features
+  x bins integers, whatever the traffic.
+- A window query sums the buckets inside it; the oldest bucket is
+  reset when the ring wraps around.
+- Binning is vectorized over the whole batch and all features (one
+  comparison per bin edge across all features, one bincount).
+  Values outside the reference range and missing values are not
+  counted, as with np.histogram in DriftDetector.
+- Model predictions are tracked as one more column when the reference
+  has a "predictions" distribution.
+
+Configuration:
+- DRIFT_ACCUMULATOR_ENABLED: turn the accumulator on/off (default true)
+- DRIFT_REFERENCE_PATH: reference distributions (default
+  {MODEL_DIR}/drift_reference.json, where the trainer writes it); re-read
+  and counts reset when /api/models/reload swaps in a model
+- DRIFT_BUCKET_SECONDS: bucket width (default 300)
+- DRIFT_WINDOW_HOURS: time covered by the ring (default 24)
+- DRIFT_MIN_SAMPLES: rows needed in a window before PSI is reported (default 100)
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.features.schema import FEATURE_INDEX
+from app.mlops.drift_detection import DriftDetector
+from app.monitoring.prometheus_metrics import update_drift_metric, record_drift_detection
+
+logger = logging.getLogger(__name__)
+
+PREDICTIONS_KEY = "predictions"
+
+
+class ReferenceBins:
+    """
+    Reference histogram edges of every tracked column, for binning whole
+    batches at once
+
+    Columns are the schema features with a reference distribution, in
+    schema order, then "predictions" if present. Features with fewer
+    bins are padded (inner edges +inf, expected counts 0), which leaves
+    their PSI unchanged.
+
+    Args:
+        reference: DriftDetector.reference_distributions
+    """
+
+    def __init__(self, reference: Dict[str, Dict[str, Any]]):
+        names = [
+            name for name in reference
+            if name == PREDICTIONS_KEY or name in FEATURE_INDEX
+        ]
+        names.sort(key=lambda name: FEATURE_INDEX.get(name, len(FEATURE_INDEX)))
+
+        n_bins = max((len(reference[name]["distribution"]) for name in names), default=1)
+        self.names: List[str] = names
+        self.columns = np.array([FEATURE_INDEX.get(name, -1) for name in names], dtype=np.int64)
+        self.low = np.empty(len(names))
+        self.high = np.empty(len(names))
+        self.inner_edges = np.full((len(names), max(n_bins - 1, 0)), np.inf)
+        self.expected = np.zeros((len(names), n_bins))
+
+        for i, name in enumerate(names):
+            edges = np.asarray(reference[name]["bins"], dtype=np.float64)
+            counts = np.asarray(reference[name]["distribution"], dtype=np.float64)
+            self.low[i], self.high[i] = edges[0], edges[-1]
+            self.inner_edges[i, :len(edges) - 2] = edges[1:-1]
+            self.expected[i, :len(counts)] = counts
+
+    @property
+    def n_tracked(self) -> int:
+        return len(self.names)
+
+    @property
+    def n_bins(self) -> int:
+        return self.expected.shape[1]
+
+    def flat_bins(self, features: np.ndarray, probabilities: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Bin of every (row, tracked column) as column * n_bins + bin
+
+        Returns:
+            int64 [n_rows, n_tracked]; -1 where the value is not counted
+            (missing, or outside the reference range)
+        """
+        has_predictions = self.columns < 0
+
+        values = np.empty((len(features), self.n_tracked), dtype=np.float64)
+        values[:, ~has_predictions] = features[:, self.columns[~has_predictions]]
+        values[:, has_predictions] = (
+            np.asarray(probabilities, dtype=np.float64)[:, None] if probabilities is not None else np.nan
+        )
+
+        # Bin index = number of inner edges <= value (np.histogram's bins;
+        # the last bin includes its right edge), one pass per edge
+        bins = np.zeros(values.shape, dtype=np.int64)
+        for edge in self.inner_edges.T:
+            bins += values >= edge
+        bins += np.arange(self.n_tracked) * self.n_bins
+
+        counted = (values >= self.low) & (values <= self.high)
+        bins[~counted] = -1
+        return bins
+
+    def counts(self, features: np.ndarray, probabilities: Optional[np.ndarray] = None) -> np.ndarray:
+        """Bin counts of a batch [n_tracked, n_bins]"""
+        flat = self.flat_bins(features, probabilities)
+        return np.bincount(
+            flat[flat >= 0], minlength=self.n_tracked * self.n_bins
+        ).reshape(self.n_tracked, self.n_bins)
+
+
+class DriftAccumulator:
+    """
+    Per-feature bin counters against reference edges, in rolling time buckets
+
+    Thread-safe: update() is called from inference threads, window
+    queries from request handlers and the metrics endpoint.
+
+    Args:
+        detector: DriftDetector holding the reference distributions
+        bucket_seconds: Width of one time bucket
+        window_seconds: Time covered by the ring (longest queryable window)
+        min_samples: Rows needed in a window before PSI is reported
+        clock: Time source (seconds), for tests and replay
+    """
+
+    def __init__(
+        self,
+        detector: DriftDetector,
+        bucket_seconds: float = 300,
+        window_seconds: float = 24 * 3600,
+        min_samples: int = 100,
+        clock: Callable[[], float] = time.time
+    ):
+        self.detector = detector
+        self.bucket_seconds = bucket_seconds
+        self.n_buckets = max(1, int(np.ceil(window_seconds / bucket_seconds)))
+        self.min_samples = min_samples
+        self.clock = clock
+
+        self.bins = ReferenceBins(detector.reference_distributions)
+        self.names = self.bins.names
+        self.expected = self.bins.expected
+        n_tracked, n_bins = self.expected.shape
+
+        self._counts = np.zeros((self.n_buckets, n_tracked, n_bins), dtype=np.int64)
+        self._rows = np.zeros(self.n_buckets, dtype=np.int64)
+        self._bucket_ids = np.full(self.n_buckets, -1, dtype=np.int64)
+        self._lock = threading.Lock()
+
+        logger.info(
+            f"DriftAccumulator tracking {n_tracked} columns x {n_bins} bins, "
+            f"{self.n_buckets} buckets of {bucket_seconds:g}s"
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return len(self.names) > 0
+
+    def update(
+        self,
+        features: np.ndarray,
+        probabilities: Optional[np.ndarray] = None,
+        timestamp: Optional[float] = None
+    ) -> None:
+        """
+        Add a scored batch to the current bucket
+
+        Args:
+            features: Feature matrix in schema order [n_rows, N_FEATURES]
+            probabilities: Model default probabilities [n_rows]
+            timestamp: Time of the batch (default: now)
+        """
+        if not self.enabled or len(features) == 0:
+            return
+
+        bins = self.bins
+
+        counts = bins.counts(features, probabilities)
+        bucket_id = int((self.clock() if timestamp is None else timestamp) // self.bucket_seconds)
+
+        with self._lock:
+            # Dropped if set_reference swapped the bins meanwhile
+            if bins is self.bins:
+                self._add(bucket_id, counts, len(features))
+
+    def update_rows(
+        self,
+        features: np.ndarray,
+        probabilities: Optional[np.ndarray],
+        timestamps: np.ndarray
+    ) -> None:
+        """
+        Add rows carrying their own timestamps (e.g. replayed decisions),
+        each into the bucket of its time
+
+        Args:
+            features: Feature matrix in schema order [n_rows, N_FEATURES]
+            probabilities: Model default probabilities [n_rows]
+            timestamps: Time of every row, in seconds [n_rows]
+        """
+        if not self.enabled or len(features) == 0:
+            return
+
+        bins = self.bins
+
+        flat = bins.flat_bins(features, probabilities)
+        bucket_ids = (np.asarray(timestamps, dtype=np.float64) // self.bucket_seconds).astype(np.int64)
+        cells = bins.n_tracked * bins.n_bins
+
+        # One bincount over (bucket, column, bin) for the whole batch
+        buckets, groups = np.unique(bucket_ids, return_inverse=True)
+        index = np.ravel(groups)[:, None] * cells + flat
+        counts = np.bincount(index[flat >= 0], minlength=len(buckets) * cells)
+        counts = counts.reshape(len(buckets), bins.n_tracked, bins.n_bins)
+        rows = np.bincount(np.ravel(groups), minlength=len(buckets))
+
+        with self._lock:
+            if bins is not self.bins:
+                return
+            for bucket_id, bucket_counts, bucket_rows in zip(buckets, counts, rows):
+                self._add(int(bucket_id), bucket_counts, int(bucket_rows))
+
+    def _add(self, bucket_id: int, counts: np.ndarray, rows: int) -> None:
+        """Add counts to a bucket, recycling its slot if it holds an older bucket (lock held)"""
+        slot = bucket_id % self.n_buckets
+        if self._bucket_ids[slot] != bucket_id:
+            if self._bucket_ids[slot] > bucket_id:
+                return  # Older than the ring
+            self._counts[slot] = 0
+            self._rows[slot] = 0
+            self._bucket_ids[slot] = bucket_id
+        self._counts[slot] += counts
+        self._rows[slot] += rows
+
+    def merge(self, other: 'DriftAccumulator') -> None:
+        """
+        Add another accumulator's buckets to this one (same reference and
+        bucket width; the rings may cover different spans)
+        """
+        bins = other.bins
+        self._check_compatible(bins.names, bins.low, bins.high, bins.inner_edges, other.bucket_seconds)
+
+        with other._lock:
+            used = other._bucket_ids >= 0
+            bucket_ids = other._bucket_ids[used]
+            counts = other._counts[used].copy()
+            rows = other._rows[used].copy()
+
+        with self._lock:
+            for i in np.argsort(bucket_ids):
+                self._add(int(bucket_ids[i]), counts[i], int(rows[i]))
+
+    def _check_compatible(
+        self,
+        names: List[str],
+        low: np.ndarray,
+        high: np.ndarray,
+        inner_edges: np.ndarray,
+        bucket_seconds: float
+    ) -> None:
+        same_reference = (
+            names == self.bins.names
+            and np.array_equal(low, self.bins.low)
+            and np.array_equal(high, self.bins.high)
+            and np.array_equal(inner_edges, self.bins.inner_edges)
+        )
+        if not same_reference:
+            raise ValueError("Counts were binned against a different reference")
+        if bucket_seconds != self.bucket_seconds:
+            raise ValueError(f"Bucket width {bucket_seconds:g}s differs from {self.bucket_seconds:g}s")
+
+    def window_counts(
+        self,
+        window_seconds: Optional[float] = None,
+        now: Optional[float] = None
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Bin counts and row count over the last window_seconds (default: whole ring)
+
+        Returns:
+            (counts [n_tracked, n_bins], rows)
+        """
+        now_id = int((self.clock() if now is None else now) // self.bucket_seconds)
+        n_window = self.n_buckets if window_seconds is None else min(
+            self.n_buckets, max(1, int(np.ceil(window_seconds / self.bucket_seconds)))
+        )
+
+        with self._lock:
+            in_window = (self._bucket_ids > now_id - n_window) & (self._bucket_ids <= now_id)
+            return self._counts[in_window].sum(axis=0), int(self._rows[in_window].sum())
+
+    def check_drift(self, window_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Drift of the last window_seconds against the reference
+
+        Same shape as DriftMonitor.check_drift: prediction_drift,
+        feature_drift (as DriftDetector.detect_multivariate_drift) and
+        should_retrain, plus the number of rows in the window.
+        """
+        bins = self.bins
+        counts, rows = self.window_counts(window_seconds)
+        if bins is not self.bins:
+            # Reference replaced in between: counts belong to the new bins
+            return self.check_drift(window_seconds)
+
+        result = {
+            "timestamp": datetime.now().isoformat(),
+            "window_seconds": window_seconds or self.n_buckets * self.bucket_seconds,
+            "n_samples": rows
+        }
+
+        if rows < self.min_samples:
+            result.update({"error": f"Not enough samples ({rows} < {self.min_samples})", "should_retrain": False})
+            return result
+
+        psi = self.detector.calculate_psi_batch(bins.expected, counts)
+        feature_results = [
+            {
+                "feature": name,
+                "psi": float(value),
+                "drifted": bool(value > self.detector.psi_threshold),
+                "threshold": self.detector.psi_threshold,
+                "severity": self.detector._categorize_psi(float(value))
+            }
+            for name, value in zip(bins.names, psi)
+        ]
+
+        prediction_results = [r for r in feature_results if r["feature"] == PREDICTIONS_KEY]
+        feature_results = [r for r in feature_results if r["feature"] != PREDICTIONS_KEY]
+        drifted = [r for r in feature_results if r["drifted"]]
+        psis = [r["psi"] for r in feature_results]
+        max_psi = max(psis) if psis else None
+
+        feature_drift = {
+            "timestamp": result["timestamp"],
+            "total_features": len(feature_results),
+            "drifted_features": len(drifted),
+            "drift_percentage": len(drifted) / len(feature_results) if feature_results else 0,
+            "average_psi": float(np.mean(psis)) if psis else None,
+            "max_psi": max_psi,
+            "critical_drift": max_psi > 0.25 if max_psi else False,
+            "feature_details": drifted,
+            "psi_by_feature": {r["feature"]: r["psi"] for r in feature_results}
+        }
+
+        if prediction_results:
+            prediction_drift = {k: v for k, v in prediction_results[0].items() if k != "feature"}
+        else:
+            prediction_drift = {"psi": None, "drifted": False, "error": "No reference distribution"}
+
+        result.update({
+            "prediction_drift": prediction_drift,
+            "feature_drift": feature_drift,
+            "should_retrain": self.detector.should_retrain(feature_drift)
+        })
+        return result
+
+    def should_retrain(self, window_seconds: Optional[float] = None) -> bool:
+        """Retraining recommendation for the last window_seconds"""
+        return self.check_drift(window_seconds)["should_retrain"]
+
+    def publish(self, window_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Set the drift gauges (PSI per feature, drift detected) from the window"""
+        if not self.enabled:
+            return None
+
+        result = self.check_drift(window_seconds)
+        if "feature_drift" not in result:
+            return result
+
+        for feature, psi in result["feature_drift"]["psi_by_feature"].items():
+            update_drift_metric(feature, psi)
+        if result["prediction_drift"].get("psi") is not None:
+            update_drift_metric(PREDICTIONS_KEY, result["prediction_drift"]["psi"])
+        record_drift_detection(result["should_retrain"])
+
+        return result
+
+    def save_state(self, path: str, **extra: float) -> None:
+        """
+        Write the counters (and extra scalars, e.g. a watermark) to a
+        compressed .npz, atomically: a crash leaves the previous file
+        """
+        with self._lock:
+            arrays = {
+                "names": np.asarray(self.bins.names),
+                "low": self.bins.low,
+                "high": self.bins.high,
+                "inner_edges": self.bins.inner_edges,
+                "bucket_seconds": np.float64(self.bucket_seconds),
+                "counts": self._counts.copy(),
+                "rows": self._rows.copy(),
+                "bucket_ids": self._bucket_ids.copy()
+            }
+        arrays.update({f"extra_{key}": np.float64(value) for key, value in extra.items()})
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+
+    def load_state(self, path: str) -> Optional[Dict[str, float]]:
+        """
+        Restore counters written by save_state
+
+        Buckets are placed by their time, so the ring may be longer or
+        shorter than when saved. State binned against another reference
+        or bucket width is ignored.
+
+        Returns:
+            The extra scalars saved with the state, or None if nothing
+            was restored
+        """
+        if not Path(path).exists():
+            return None
+
+        with np.load(path, allow_pickle=False) as archive:
+            try:
+                self._check_compatible(
+                    archive["names"].tolist(),
+                    archive["low"],
+                    archive["high"],
+                    archive["inner_edges"],
+                    float(archive["bucket_seconds"])
+                )
+            except ValueError as e:
+                logger.warning(f"Ignoring drift state {path}: {e}")
+                return None
+
+            bucket_ids, counts, rows = archive["bucket_ids"], archive["counts"], archive["rows"]
+            extra = {
+                key[len("extra_"):]: float(archive[key])
+                for key in archive.files if key.startswith("extra_")
+            }
+
+        with self._lock:
+            self._counts[:] = 0
+            self._rows[:] = 0
+            self._bucket_ids[:] = -1
+            for i in np.argsort(bucket_ids):
+                if bucket_ids[i] >= 0:
+                    self._add(int(bucket_ids[i]), counts[i], int(rows[i]))
+
+        logger.info(f"Restored drift state from {path} ({int(rows.sum())} rows)")
+        return extra
+
+    def reset(self) -> None:
+        """Drop all counts (e.g. after a model with new reference data is deployed)"""
+        with self._lock:
+            self._counts[:] = 0
+            self._rows[:] = 0
+            self._bucket_ids[:] = -1
+
+    def set_reference(self, detector: DriftDetector) -> None:
+        """
+        Compare against a new reference from now on, dropping all counts
+
+        Batches binned against the previous reference while this runs are
+        discarded rather than added to the new counters.
+        """
+        bins = ReferenceBins(detector.reference_distributions)
+        with self._lock:
+            self.detector = detector
+            self.bins = bins
+            self.names = bins.names
+            self.expected = bins.expected
+            self._counts = np.zeros((self.n_buckets, *bins.expected.shape), dtype=np.int64)
+            self._rows[:] = 0
+            self._bucket_ids[:] = -1
+
+        logger.info(f"DriftAccumulator reference replaced: tracking {bins.n_tracked} columns")
+
+
+def drift_reference_path() -> str:
+    """DRIFT_REFERENCE_PATH, by default the reference the trainer writes next to the models"""
+    return os.getenv("DRIFT_REFERENCE_PATH") or str(
+        Path(os.getenv("MODEL_DIR", "./models")) / "drift_reference.json"
+    )
+
+
+def _create_accumulator() -> Optional[DriftAccumulator]:
+    if os.getenv("DRIFT_ACCUMULATOR_ENABLED", "true").lower() != "true":
+        return None
+
+    # Created even without reference data, so a model reload can supply it
+    return DriftAccumulator(
+        DriftDetector(reference_data_path=drift_reference_path()),
+        bucket_seconds=float(os.getenv("DRIFT_BUCKET_SECONDS", "300")),
+        window_seconds=float(os.getenv("DRIFT_WINDOW_HOURS", "24")) * 3600,
+        min_samples=int(os.getenv("DRIFT_MIN_SAMPLES", "100"))
+    )
+
+
+def reload_drift_reference() -> None:
+    """
+    Re-read the reference after a model swap and restart the counts
+
+    The reference describes the training data and predictions of the
+    model being served, so counts against the previous one are dropped.
+    """
+    if drift_accumulator is not None:
+        drift_accumulator.set_reference(DriftDetector(reference_data_path=drift_reference_path()))
+
+
+# Fed by the predict path; None when disabled (tracks nothing until
+# reference data is available, see enabled)
+drift_accumulator = _create_accumulator()
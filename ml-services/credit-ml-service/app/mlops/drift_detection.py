@@ -6,6 +6,7 @@ and other statistical metrics.
 
 Features:
 - Feature drift detection (PSI)
+- Quantile-sketch references (quantile-binned PSI, KS, Wasserstein)
 - Prediction drift detection
 - Automated alerting
 - Drift visualization
@@ -19,6 +20,16 @@ from datetime import datetime, timedelta
 import json
 from pathlib import Path
 
+from app.mlops.quantile_sketch import (
+    FeatureSketches,
+    KLLSketch,
+    bin_counts,
+    ks_statistic,
+    quantile_bins,
+    wasserstein_distance,
+    wasserstein_error_bound
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,6 +57,7 @@ class DriftDetector:
         """
         self.psi_threshold = psi_threshold
         self.reference_distributions = {}
+        self.reference_sketches: Dict[str, KLLSketch] = {}
         
         if reference_data_path:
             self.load_reference_distributions(reference_data_path)
@@ -86,6 +98,34 @@ class DriftDetector:
         
         return float(psi)
         
+    def calculate_psi_batch(
+        self,
+        expected_dists: np.ndarray,
+        actual_dists: np.ndarray,
+        epsilon: float = 1e-10
+    ) -> np.ndarray:
+        """
+        Calculate PSI for many features at once (same formula as calculate_psi)
+        
+        Args:
+            expected_dists: Expected bin counts [n_features, n_bins]
+            actual_dists: Actual bin counts [n_features, n_bins]
+            epsilon: Small value to avoid division by zero
+        
+        Returns:
+            PSI per feature [n_features]
+        """
+        expected_dists = np.asarray(expected_dists, dtype=np.float64)
+        actual_dists = np.asarray(actual_dists, dtype=np.float64)
+        
+        expected_pct = expected_dists / (expected_dists.sum(axis=1, keepdims=True) + epsilon)
+        actual_pct = actual_dists / (actual_dists.sum(axis=1, keepdims=True) + epsilon)
+        
+        expected_pct = np.clip(expected_pct, epsilon, 1)
+        actual_pct = np.clip(actual_pct, epsilon, 1)
+        
+        return np.sum((actual_pct - expected_pct) * np.log(actual_pct / expected_pct), axis=1)
+        
     def detect_feature_drift(
         self,
         feature_name: str,
@@ -179,20 +219,47 @@ class DriftDetector:
         """
         Detect drift across multiple features
         
+        All columns with a reference are binned at once against their
+        reference edges (see histograms) and scored with one
+        calculate_psi_batch call; per column this matches
+        detect_feature_drift.
+        
         Args:
             features: DataFrame with current features
             
         Returns:
             Dictionary with overall drift metrics
         """
+        names = [name for name in features.columns if name in self.reference_distributions]
+        psi_by_feature = {}
+        if names:
+            references = [self.reference_distributions[name] for name in names]
+            actual_dists = histograms(
+                features[names].to_numpy(dtype=np.float64),
+                [reference.get("bins") for reference in references]
+            )
+            expected_dists = np.zeros(actual_dists.shape)
+            for i, reference in enumerate(references):
+                distribution = reference.get("distribution")
+                expected_dists[i, :len(distribution)] = distribution
+            psi_by_feature = dict(zip(names, self.calculate_psi_batch(expected_dists, actual_dists)))
+        
         results = []
         drifted_features = []
         
         for feature_name in features.columns:
-            result = self.detect_feature_drift(
-                feature_name,
-                features[feature_name].values
-            )
+            if feature_name not in psi_by_feature:
+                # No reference: same warning and result as detect_feature_drift
+                result = self.detect_feature_drift(feature_name, features[feature_name].values)
+            else:
+                psi = float(psi_by_feature[feature_name])
+                result = {
+                    "feature": feature_name,
+                    "psi": psi,
+                    "drifted": psi > self.psi_threshold,
+                    "threshold": self.psi_threshold,
+                    "severity": self._categorize_psi(psi)
+                }
             
             if result.get("drifted"):
                 drifted_features.append(result)
@@ -229,48 +296,158 @@ class DriftDetector:
             features: Training features
             predictions: Training predictions
             save_path: Path to save distributions
-            n_bins: Number of bins for histograms
+            n_bins: Number of quantile bins per feature
+        """
+        sketches = FeatureSketches().update(features)
+        if predictions is not None:
+            sketches.update_column("predictions", predictions)
+            
+        self.save_reference_sketches(sketches, save_path, n_bins)
+        
+    def save_reference_sketches(
+        self,
+        sketches: FeatureSketches,
+        save_path: str = "./drift_reference.json",
+        n_bins: int = 10
+    ) -> None:
+        """
+        Save reference distributions from quantile sketches
+        
+        The sketches can be built in one streaming pass over the training
+        data (FeatureSketches.update per chunk, merge across workers).
+        Each feature gets bins at its reference quantiles (so PSI bins
+        are equally populated even for skewed features), the expected
+        count per bin, summary statistics and the encoded sketch.
+        
+        Args:
+            sketches: Sketches of the training features (and "predictions")
+            save_path: Path to save distributions
+            n_bins: Number of quantile bins per feature
         """
         self.reference_distributions = {}
+        self.reference_sketches = {}
         
-        # Save feature distributions
-        for feature_name in features.columns:
-            values = features[feature_name].values
-            
-            # Calculate histogram
-            hist, bins = np.histogram(values, bins=n_bins)
+        for feature_name in sketches:
+            sketch = sketches[feature_name]
+            if not sketch.n:
+                continue
+                
+            bins = quantile_bins(sketch, n_bins)
             
             self.reference_distributions[feature_name] = {
-                "distribution": hist.tolist(),
+                "distribution": np.rint(bin_counts(sketch, bins)).astype(int).tolist(),
                 "bins": bins.tolist(),
-                "mean": float(np.mean(values)),
-                "std": float(np.std(values)),
-                "min": float(np.min(values)),
-                "max": float(np.max(values))
-            }
-            
-        # Save prediction distribution
-        if predictions is not None:
-            hist, bins = np.histogram(predictions, bins=n_bins)
-            self.reference_distributions["predictions"] = {
-                "distribution": hist.tolist(),
-                "bins": bins.tolist(),
-                "mean": float(np.mean(predictions)),
-                "std": float(np.std(predictions))
+                "mean": sketch.mean,
+                "std": sketch.std,
+                "min": sketch.min,
+                "max": sketch.max,
+                "sketch": sketch.encode()
             }
+            self.reference_sketches[feature_name] = sketch
             
+        n_samples = max((sketches[name].n for name in sketches), default=0)
+        
         # Save to file
         Path(save_path).parent.mkdir(parents=True, exist_ok=True)
         with open(save_path, 'w') as f:
             json.dump({
                 "created_at": datetime.now().isoformat(),
-                "n_samples": len(features),
-                "n_features": len(features.columns),
+                "n_samples": n_samples,
+                "n_features": len([name for name in sketches if name != "predictions"]),
                 "distributions": self.reference_distributions
-            }, f, indent=2)
+            }, f, separators=(",", ":"))
             
         logger.info(f"Reference distributions saved to: {save_path}")
         
+    def reference_sketch(self, feature_name: str) -> Optional[KLLSketch]:
+        """Reference sketch of a feature (None for files saved without sketches)"""
+        if feature_name not in self.reference_sketches:
+            encoded = self.reference_distributions.get(feature_name, {}).get("sketch")
+            if encoded is None:
+                return None
+            self.reference_sketches[feature_name] = KLLSketch.decode(encoded)
+            
+        return self.reference_sketches[feature_name]
+        
+    def compare_sketch(
+        self,
+        feature_name: str,
+        current: KLLSketch
+    ) -> Dict:
+        """
+        Drift of a feature from its current sketch (no raw values needed)
+        
+        Args:
+            feature_name: Name of the feature (or "predictions")
+            current: Sketch of the current values
+            
+        Returns:
+            Dictionary with PSI (over the reference quantile bins), KS
+            statistic and the tail-trimmed Wasserstein distance with its
+            error bound (both in feature units)
+        """
+        reference = self.reference_sketch(feature_name)
+        if reference is None or not current.n:
+            return {
+                "feature": feature_name,
+                "psi": None,
+                "drifted": False,
+                "error": "No reference sketch" if reference is None else "No current data"
+            }
+            
+        bins = np.asarray(self.reference_distributions[feature_name]["bins"])
+        psi = self.calculate_psi(bin_counts(reference, bins), bin_counts(current, bins))
+        
+        return {
+            "feature": feature_name,
+            "psi": psi,
+            "ks_statistic": ks_statistic(reference, current),
+            "wasserstein_distance": wasserstein_distance(reference, current),
+            "wasserstein_error": wasserstein_error_bound(reference, current),
+            "drifted": psi > self.psi_threshold,
+            "threshold": self.psi_threshold,
+            "severity": self._categorize_psi(psi)
+        }
+        
+    def detect_sketch_drift(
+        self,
+        current: FeatureSketches
+    ) -> Dict:
+        """
+        Detect drift across features from current sketches
+        
+        Args:
+            current: Sketches of current features (e.g. merged from workers)
+            
+        Returns:
+            Same summary as detect_multivariate_drift, plus the largest KS
+            statistic and per-feature results
+        """
+        results = [
+            self.compare_sketch(feature_name, current[feature_name])
+            for feature_name in current
+            if feature_name != "predictions"
+        ]
+        drifted_features = [r for r in results if r.get("drifted")]
+        
+        valid_psis = [r["psi"] for r in results if r["psi"] is not None]
+        avg_psi = np.mean(valid_psis) if valid_psis else None
+        max_psi = np.max(valid_psis) if valid_psis else None
+        valid_ks = [r["ks_statistic"] for r in results if r["psi"] is not None]
+        
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "total_features": len(results),
+            "drifted_features": len(drifted_features),
+            "drift_percentage": len(drifted_features) / len(results) if results else 0,
+            "average_psi": avg_psi,
+            "max_psi": max_psi,
+            "max_ks_statistic": max(valid_ks) if valid_ks else None,
+            "critical_drift": max_psi > 0.25 if max_psi else False,
+            "feature_details": drifted_features,
+            "results": results
+        }
+        
     def load_reference_distributions(self, path: str) -> None:
         """
         Load reference distributions from file
@@ -283,6 +460,7 @@ class DriftDetector:
                 data = json.load(f)
                 
             self.reference_distributions = data.get("distributions", {})
+            self.reference_sketches = {}
             logger.info(f"Loaded {len(self.reference_distributions)} reference distributions")
             
         except FileNotFoundError:
@@ -370,3 +548,42 @@ class DriftDetector:
         drift_percentage = drift_results.get('drift_percentage', 0)
         
         return critical_drift or drift_percentage > 0.2
+
+
+def histograms(values: np.ndarray, edges: List[np.ndarray]) -> np.ndarray:
+    """
+    np.histogram of every column at once
+    
+    Edges are laid out as a 2-D array (inner edges padded with +inf, so
+    columns with fewer bins get empty trailing bins, which leave PSI
+    unchanged). The bin of each value is the number of inner edges <= it,
+    counted with one comparison per edge across all columns, then one
+    bincount gives every histogram. As with np.histogram, the last bin
+    includes its right edge, and missing values and values outside the
+    edges are not counted.
+    
+    Args:
+        values: [n_rows, n_columns]
+        edges: Ascending bin edges per column
+    
+    Returns:
+        Counts [n_columns, max_bins]
+    """
+    edges = [np.asarray(column_edges, dtype=np.float64) for column_edges in edges]
+    n_columns = len(edges)
+    n_bins = max(len(column_edges) - 1 for column_edges in edges)
+    
+    inner_edges = np.full((n_columns, max(n_bins - 1, 0)), np.inf)
+    low = np.empty(n_columns)
+    high = np.empty(n_columns)
+    for i, column_edges in enumerate(edges):
+        inner_edges[i, :len(column_edges) - 2] = column_edges[1:-1]
+        low[i], high[i] = column_edges[0], column_edges[-1]
+    
+    bins = np.zeros(values.shape, dtype=np.int64)
+    for edge in inner_edges.T:
+        bins += values >= edge
+    bins += np.arange(n_columns) * n_bins
+    
+    counted = (values >= low) & (values <= high)
+    return np.bincount(bins[counted], minlength=n_columns * n_bins).reshape(n_columns, n_bins)
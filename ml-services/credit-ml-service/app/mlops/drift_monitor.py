@@ -3,18 +3,85 @@ Drift Monitoring Service
 
 Automated drift monitoring with alerting.
 
+Recent decisions are fetched page by page and each page is folded into
+a DriftAccumulator as it arrives, so memory stays bounded by the page
+size rather than the size of the window:
+
+- The window is split into time slices fetched concurrently (up to
+  DRIFT_FETCH_CONCURRENCY at once) over one pooled httpx.AsyncClient;
+  each slice follows its cursor sequentially.
+- Failed requests (connection errors, timeouts, 429 and 5xx) are retried
+  with exponential backoff and jitter, honouring Retry-After. Other
+  errors, and retries running out, fail the run with FetchError instead
+  of silently returning no data.
+
+Page contract of the decisions API:
+    GET {api_url}/credit-decisions/recent?from=<iso>&to=<iso>&limit=<n>[&cursor=<c>]
+    -> {"predictions": [p, ...], "features": [{name: value, ...}, ...],
+        "timestamps": [t, ...] (optional; epoch seconds or ISO-8601, UTC
+                                if no offset is given),
+        "next_cursor": "<c>" | null}
+
+Daemon mode (--daemon) keeps running on a schedule (DriftMonitorDaemon):
+
+- The detector and reference bins are built once and stay in memory;
+  the reference file is only reloaded when it changes on disk (counts
+  then restart, as they were binned against the old edges).
+- Each cycle fetches only the decisions since the watermark (the end of
+  the last fully processed range, trailing now by a lag for late
+  writes) into a staging accumulator, merged in only once the whole
+  range is fetched, so a failed cycle is retried without double counts.
+- One ring of time-bucketed counters serves every window (1h, 24h, 7d
+  by default): a window query sums its buckets.
+- Counters and watermark are saved atomically after each cycle, so a
+  restart resumes where it stopped.
+- Results go to the Prometheus gauges (per window, plus the legacy
+  ml_drift_psi_score / ml_drift_detected from the alert window), served
+  on DRIFT_DAEMON_METRICS_PORT. Alerts fire when the alert window starts
+  recommending retraining, not on every cycle.
+
+For tests, pass an httpx transport (httpx.MockTransport, or
+httpx.ASGITransport around a stub app) instead of a live API.
+
+Configuration:
+- DRIFT_FETCH_PAGE_SIZE: rows per page (default 5000)
+- DRIFT_FETCH_CONCURRENCY: slices fetched at once (default 4)
+- DRIFT_FETCH_MAX_RETRIES: retries per page (default 4)
+- DRIFT_FETCH_TIMEOUT_SECONDS: per-request timeout (default 30)
+- DRIFT_DAEMON_INTERVAL_SECONDS: time between daemon cycles (default 300)
+- DRIFT_DAEMON_WINDOWS: windows checked by the daemon (default 1h,24h,7d)
+- DRIFT_DAEMON_ALERT_WINDOW: window driving alerts and legacy gauges (default 24h)
+- DRIFT_DAEMON_BUCKET_SECONDS: counter bucket width (default 300)
+- DRIFT_DAEMON_LAG_SECONDS: how far the watermark trails now (default 60)
+- DRIFT_DAEMON_BACKFILL_HOURS: history fetched on a fresh start (default 24)
+- DRIFT_DAEMON_STATE_PATH: counters and watermark (default ./drift_state/drift_monitor.npz)
+- DRIFT_DAEMON_METRICS_PORT: Prometheus port, 0 to disable (default 9109)
+
 Usage:
     python -m app.mlops.drift_monitor --hours 24
+    python -m app.mlops.drift_monitor --daemon --interval 300 --windows 1h,24h,7d
 """
 
 import argparse
 import logging
-from datetime import datetime, timedelta
+import math
+import os
+import random
+import signal
+import time
+from datetime import datetime, timedelta, timezone
 import httpx
 import asyncio
 from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
+import numpy as np
+import pandas as pd
+
+from app.features.schema import FEATURE_NAMES
+from app.mlops.drift_accumulator import DriftAccumulator, drift_reference_path
 from app.mlops.drift_detection import DriftDetector
+from app.monitoring.prometheus_metrics import record_drift_watermark, record_window_drift
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,14 +89,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+RECENT_DECISIONS_PATH = "/credit-decisions/recent"
+
+# Responses worth retrying; other errors fail immediately
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Shortest time slice worth a separate request
+MIN_SLICE_SECONDS = 60
+
+WINDOW_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+
+class FetchError(Exception):
+    """Raised when recent decisions cannot be fetched"""
+
+
+def _epoch_seconds(timestamp: Any) -> float:
+    """Epoch seconds of an API timestamp (number or ISO-8601; naive times are UTC)"""
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    
+    parsed = datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
 
 class DriftMonitor:
     """
     Automated drift monitoring service
     
     Features:
-    - Fetch recent predictions from API
-    - Calculate drift metrics
+    - Fetch recent predictions from API (paginated, concurrent, retried)
+    - Calculate drift metrics incrementally
     - Send alerts if drift detected
     - Log results
     """
@@ -38,7 +130,12 @@ class DriftMonitor:
         self,
         api_url: str = "http://localhost:3000",
         reference_data_path: str = "./drift_reference.json",
-        psi_threshold: float = 0.1
+        psi_threshold: float = 0.1,
+        page_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
     ):
         """
         Initialize drift monitor
@@ -47,36 +144,232 @@ class DriftMonitor:
             api_url: URL of NestJS API
             reference_data_path: Path to reference distributions
             psi_threshold: PSI threshold for drift
+            page_size: Rows per page (default DRIFT_FETCH_PAGE_SIZE)
+            concurrency: Slices fetched at once (default DRIFT_FETCH_CONCURRENCY)
+            max_retries: Retries per page (default DRIFT_FETCH_MAX_RETRIES)
+            timeout_seconds: Per-request timeout (default DRIFT_FETCH_TIMEOUT_SECONDS)
+            transport: httpx transport replacing the network (tests, stubs)
         """
         self.api_url = api_url
+        self.reference_data_path = reference_data_path
         self.detector = DriftDetector(
             psi_threshold=psi_threshold,
             reference_data_path=reference_data_path
         )
         
+        self.page_size = page_size or int(os.getenv("DRIFT_FETCH_PAGE_SIZE", "5000"))
+        self.concurrency = concurrency or int(os.getenv("DRIFT_FETCH_CONCURRENCY", "4"))
+        self.max_retries = (
+            max_retries if max_retries is not None
+            else int(os.getenv("DRIFT_FETCH_MAX_RETRIES", "4"))
+        )
+        self.timeout_seconds = timeout_seconds or float(os.getenv("DRIFT_FETCH_TIMEOUT_SECONDS", "30"))
+        self.backoff_seconds = 0.5
+        self.max_backoff_seconds = 30.0
+        self.transport = transport
+        
+    def _client(self) -> httpx.AsyncClient:
+        """Client with one connection per concurrent slice, shared by all requests"""
+        return httpx.AsyncClient(
+            base_url=self.api_url,
+            timeout=httpx.Timeout(self.timeout_seconds, connect=min(self.timeout_seconds, 5.0)),
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency
+            ),
+            transport=self.transport
+        )
+        
+    async def _get_page(self, client: httpx.AsyncClient, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET one page, retrying transient failures with exponential backoff"""
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                response = await client.get(RECENT_DECISIONS_PATH, params=params)
+                if response.status_code not in RETRYABLE_STATUS:
+                    response.raise_for_status()
+                    page = response.json()
+                    if not isinstance(page, dict):
+                        raise FetchError(
+                            f"Invalid page from decisions API: expected a JSON object, got {type(page).__name__}"
+                        )
+                    return page
+                error = f"HTTP {response.status_code}"
+                retry_after = response.headers.get("retry-after")
+            except httpx.TransportError as e:
+                error = f"{type(e).__name__}: {e}"
+            except httpx.HTTPStatusError as e:
+                raise FetchError(f"Decisions API rejected {params}: HTTP {e.response.status_code}") from e
+            except ValueError as e:
+                raise FetchError(f"Invalid page from decisions API: {e}") from e
+                
+            if attempt == self.max_retries:
+                raise FetchError(f"Decisions API failed after {attempt + 1} attempts: {error}")
+                
+            delay = min(self.max_backoff_seconds, self.backoff_seconds * 2 ** attempt)
+            delay *= 0.5 + random.random() / 2
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+                
+            logger.warning(f"Decisions API {error}, retrying in {delay:.1f}s (attempt {attempt + 1})")
+            await asyncio.sleep(delay)
+            
+    async def iter_pages(
+        self,
+        client: httpx.AsyncClient,
+        start: datetime,
+        end: datetime
+    ) -> AsyncIterator[Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]]:
+        """
+        Pages of decisions in [start, end), following the cursor
+        
+        Yields:
+            (features [n, N_FEATURES] float32 in schema order, missing
+            values as NaN; predictions [n]; decision times [n] in epoch
+            seconds, or None if the API does not send them)
+        """
+        params = {"from": start.isoformat(), "to": end.isoformat(), "limit": self.page_size}
+        
+        while True:
+            page = await self._get_page(client, params)
+            yield self._page_arrays(page)
+            
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return
+            params = {**params, "cursor": cursor}
+            
+    @staticmethod
+    def _page_arrays(page: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        predictions = page.get("predictions") or []
+        features = page.get("features") or []
+        timestamps = page.get("timestamps")
+        if len(predictions) != len(features):
+            raise FetchError(f"Page has {len(predictions)} predictions but {len(features)} feature rows")
+        if timestamps is not None and len(timestamps) != len(predictions):
+            raise FetchError(f"Page has {len(predictions)} predictions but {len(timestamps)} timestamps")
+            
+        X = (
+            pd.DataFrame.from_records(features)
+            .reindex(columns=list(FEATURE_NAMES))
+            .to_numpy(dtype=np.float32, na_value=np.nan)
+        )
+        
+        times = None
+        if timestamps is not None:
+            try:
+                times = np.array([_epoch_seconds(t) for t in timestamps], dtype=np.float64)
+            except (TypeError, ValueError) as e:
+                raise FetchError(f"Invalid timestamp in page: {e}") from e
+                
+        return X, np.asarray(predictions, dtype=np.float64), times
+        
+    def _slices(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        """Split [start, end) into time slices (a few per concurrent fetch, at least a minute each)"""
+        n_slices = max(1, min(
+            self.concurrency * 4,
+            math.ceil((end - start).total_seconds() / MIN_SLICE_SECONDS)
+        ))
+        step = (end - start) / n_slices
+        return [(start + i * step, start + (i + 1) * step) for i in range(n_slices)]
+        
+    @staticmethod
+    def _last_hours(hours: int) -> Tuple[datetime, datetime]:
+        end = datetime.now(timezone.utc)
+        return end - timedelta(hours=hours), end
+        
+    async def stream_into(self, accumulator: DriftAccumulator, hours: int = 24) -> int:
+        """
+        Fetch the last `hours` of decisions into a drift accumulator
+        
+        Returns:
+            Number of decisions fetched
+        """
+        return await self.stream_range_into(accumulator, *self._last_hours(hours))
+        
+    async def stream_range_into(
+        self,
+        accumulator: DriftAccumulator,
+        start: datetime,
+        end: datetime,
+        timestamped: bool = False
+    ) -> int:
+        """
+        Fetch the decisions in [start, end) into a drift accumulator
+        
+        Args:
+            accumulator: Accumulator receiving the pages
+            start: Start of the range
+            end: End of the range
+            timestamped: Put every decision in the bucket of its own time
+                (the middle of its slice when the API sends no
+                timestamps) instead of the accumulator's current bucket
+            
+        Returns:
+            Number of decisions fetched
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def fetch_slice(client: httpx.AsyncClient, start: datetime, end: datetime) -> int:
+            rows = 0
+            middle = (start + (end - start) / 2).timestamp()
+            async with semaphore:
+                async for features, predictions, times in self.iter_pages(client, start, end):
+                    if not timestamped:
+                        accumulator.update(features, predictions)
+                    else:
+                        if times is None:
+                            times = np.full(len(predictions), middle)
+                        accumulator.update_rows(features, predictions, times)
+                    rows += len(predictions)
+            return rows
+            
+        async with self._client() as client:
+            tasks = [
+                asyncio.create_task(fetch_slice(client, slice_start, slice_end))
+                for slice_start, slice_end in self._slices(start, end)
+            ]
+            try:
+                counts = await asyncio.gather(*tasks)
+            except BaseException:
+                # One slice failed: stop the others before the client closes
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+                
+        return sum(counts)
+        
     async def fetch_recent_predictions(self, hours: int = 24) -> dict:
         """
-        Fetch recent predictions from API
+        Fetch recent predictions from API into memory
+        
+        For small windows and ad-hoc analysis; run_monitoring streams
+        pages into an accumulator instead.
         
         Args:
             hours: Number of hours to look back
             
         Returns:
-            Dictionary with predictions and features
+            Dictionary with predictions and features (schema-order rows)
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.api_url}/credit-decisions/recent",
-                    params={"hours": hours},
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                return response.json()
-        except Exception as e:
-            logger.error(f"Failed to fetch predictions: {e}")
-            return {"predictions": [], "features": []}
-            
+        features: List[np.ndarray] = []
+        predictions: List[np.ndarray] = []
+        
+        async with self._client() as client:
+            for start, end in self._slices(*self._last_hours(hours)):
+                async for page_features, page_predictions, _ in self.iter_pages(client, start, end):
+                    features.append(page_features)
+                    predictions.append(page_predictions)
+                    
+        return {
+            "predictions": np.concatenate(predictions).tolist() if predictions else [],
+            "features": pd.DataFrame(
+                np.concatenate(features) if features else np.empty((0, len(FEATURE_NAMES))),
+                columns=list(FEATURE_NAMES)
+            ).to_dict(orient="records")
+        }
+        
     def check_drift(self, data: dict) -> dict:
         """
         Check for drift in predictions and features
@@ -87,9 +380,6 @@ class DriftMonitor:
         Returns:
             Drift detection results
         """
-        import pandas as pd
-        import numpy as np
-        
         predictions = data.get("predictions", [])
         features_list = data.get("features", [])
         
@@ -117,6 +407,39 @@ class DriftMonitor:
             "should_retrain": self.detector.should_retrain(feature_drift)
         }
         
+    async def check_drift_streaming(self, hours: int = 24) -> dict:
+        """
+        Check drift over the last `hours`, fetched page by page
+        
+        Args:
+            hours: Hours of data to check
+            
+        Returns:
+            Drift detection results (same keys as check_drift)
+        """
+        run_started = datetime.now().timestamp()
+        window_seconds = hours * 3600
+        
+        # One bucket covering the whole window: every page counts
+        accumulator = DriftAccumulator(
+            self.detector,
+            bucket_seconds=window_seconds,
+            window_seconds=window_seconds,
+            min_samples=1,
+            clock=lambda: run_started
+        )
+        if not accumulator.enabled:
+            return {"timestamp": datetime.now().isoformat(), "error": "No reference distributions"}
+            
+        rows = await self.stream_into(accumulator, hours)
+        logger.info(f"Fetched {rows} decisions from the last {hours} hours")
+        
+        if not rows:
+            logger.warning("No data to check for drift")
+            return {"timestamp": datetime.now().isoformat(), "error": "No data available"}
+            
+        return accumulator.check_drift()
+        
     def send_alert(self, drift_results: dict) -> None:
         """
         Send alert if drift detected
@@ -125,6 +448,7 @@ class DriftMonitor:
             drift_results: Drift detection results
         """
         # Generate report
+        os.makedirs("./drift_reports", exist_ok=True)
         report = self.detector.generate_drift_report(
             drift_results["feature_drift"],
             save_path=f"./drift_reports/drift_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
@@ -138,30 +462,238 @@ class DriftMonitor:
             # TODO: Implement Slack webhook
             # self.send_slack_notification(report)
             
-    async def run_monitoring(self, hours: int = 24) -> None:
+    async def run_monitoring(self, hours: int = 24) -> Dict[str, Any]:
         """
         Run drift monitoring
         
         Args:
             hours: Hours of data to check
+            
+        Returns:
+            Drift results, or {"timestamp", "error", "should_retrain"}
+            if the fetch failed
         """
         logger.info(f"Starting drift monitoring (last {hours} hours)...")
         
-        # Fetch recent data
-        data = await self.fetch_recent_predictions(hours)
-        
-        # Check drift
-        drift_results = self.check_drift(data)
-        
+        # Fetch recent data and check drift page by page
+        try:
+            drift_results = await self.check_drift_streaming(hours)
+        except FetchError as e:
+            logger.error(f"Drift monitoring failed: {e}")
+            return {"timestamp": datetime.now().isoformat(), "error": str(e), "should_retrain": False}
+            
         # Send alert if needed
         if drift_results.get("should_retrain"):
             self.send_alert(drift_results)
+        elif "error" in drift_results:
+            logger.warning(f"Drift not checked: {drift_results['error']}")
         else:
             logger.info("✓ No significant drift detected")
             
         return drift_results
 
 
+def parse_window(text: str) -> float:
+    """Window length in seconds, e.g. "15m", "1h" or "7d" """
+    text = text.strip().lower()
+    if len(text) < 2 or text[-1] not in WINDOW_UNITS:
+        raise ValueError(f"Invalid window {text!r} (expected a number followed by m, h or d)")
+    return float(text[:-1]) * WINDOW_UNITS[text[-1]]
+
+
+class DriftMonitorDaemon:
+    """
+    Long-running drift monitoring over several rolling windows
+    
+    Args:
+        monitor: DriftMonitor used for fetching (and holding the detector)
+        windows: Window labels, e.g. ["1h", "24h", "7d"]
+        alert_window: Window driving alerts and the legacy drift gauges
+        interval_seconds: Time between cycles
+        bucket_seconds: Counter bucket width (resolution of the windows)
+        lag_seconds: How far the watermark trails now, for late writes
+        backfill_hours: History fetched when there is no saved state
+        state_path: Where counters and watermark are saved
+        min_samples: Rows a window needs before PSI is reported
+        clock: Time source (seconds), for tests
+    """
+    
+    def __init__(
+        self,
+        monitor: DriftMonitor,
+        windows: List[str],
+        alert_window: str = "24h",
+        interval_seconds: float = 300,
+        bucket_seconds: float = 300,
+        lag_seconds: float = 60,
+        backfill_hours: float = 24,
+        state_path: str = "./drift_state/drift_monitor.npz",
+        min_samples: int = 100,
+        clock: Callable[[], float] = time.time
+    ):
+        self.monitor = monitor
+        self.windows = {label.strip(): parse_window(label) for label in windows if label.strip()}
+        alert_window = alert_window.strip()
+        self.alert_window = alert_window if alert_window in self.windows else max(
+            self.windows, key=self.windows.get
+        )
+        self.interval_seconds = interval_seconds
+        self.bucket_seconds = bucket_seconds
+        self.lag_seconds = lag_seconds
+        self.backfill_hours = backfill_hours
+        self.state_path = state_path
+        self.min_samples = min_samples
+        self.clock = clock
+        
+        self.watermark = 0.0
+        self.retrain_recommended = False
+        self._reference_mtime = self._reference_file_mtime()
+        self.accumulator = self._new_accumulator(max(self.windows.values()))
+        
+        state = self.accumulator.load_state(state_path)
+        if state and "watermark" in state:
+            self.watermark = state["watermark"]
+            logger.info(f"Resuming drift monitoring from {datetime.fromtimestamp(self.watermark, tz=timezone.utc).isoformat()}")
+        else:
+            self.watermark = self.clock() - backfill_hours * 3600
+            
+    def _reference_file_mtime(self) -> Optional[float]:
+        path = Path(self.monitor.reference_data_path)
+        return path.stat().st_mtime if path.exists() else None
+        
+    def _new_accumulator(self, window_seconds: float) -> DriftAccumulator:
+        # Windows end at the watermark: later decisions are not counted yet
+        return DriftAccumulator(
+            self.monitor.detector,
+            bucket_seconds=self.bucket_seconds,
+            window_seconds=window_seconds,
+            min_samples=self.min_samples,
+            clock=lambda: self.watermark
+        )
+        
+    def _reload_reference_if_changed(self) -> None:
+        mtime = self._reference_file_mtime()
+        if mtime == self._reference_mtime:
+            return
+            
+        logger.info("Reference distributions changed, reloading and restarting counts")
+        self.monitor.detector = DriftDetector(
+            psi_threshold=self.monitor.detector.psi_threshold,
+            reference_data_path=self.monitor.reference_data_path
+        )
+        self.accumulator = self._new_accumulator(max(self.windows.values()))
+        self._reference_mtime = mtime
+        
+    async def run_cycle(self) -> Dict[str, Any]:
+        """
+        Fetch decisions since the watermark, then check every window
+        
+        Returns:
+            {"timestamp", "watermark", "fetched", "windows": {label:
+            drift results}}, plus "error" if the fetch failed (windows
+            are then checked on the counts so far)
+        """
+        self._reload_reference_if_changed()
+        result = {"timestamp": datetime.now(timezone.utc).isoformat(), "fetched": 0}
+        
+        if not self.accumulator.enabled:
+            result["error"] = "No reference distributions"
+            return result
+            
+        end = self.clock() - self.lag_seconds
+        if end > self.watermark:
+            # Stage the range so a failure part-way leaves the counters untouched
+            staging = DriftAccumulator(
+                self.monitor.detector,
+                bucket_seconds=self.bucket_seconds,
+                window_seconds=end - self.watermark + self.bucket_seconds
+            )
+            try:
+                result["fetched"] = await self.monitor.stream_range_into(
+                    staging,
+                    datetime.fromtimestamp(self.watermark, tz=timezone.utc),
+                    datetime.fromtimestamp(end, tz=timezone.utc),
+                    timestamped=True
+                )
+            except FetchError as e:
+                logger.error(f"Drift monitoring fetch failed, retrying next cycle: {e}")
+                result["error"] = str(e)
+            else:
+                self.accumulator.merge(staging)
+                self.watermark = end
+                self.accumulator.save_state(self.state_path, watermark=self.watermark)
+                
+        result["watermark"] = datetime.fromtimestamp(self.watermark, tz=timezone.utc).isoformat()
+        result["windows"] = {
+            label: self.accumulator.check_drift(seconds)
+            for label, seconds in self.windows.items()
+        }
+        self.publish(result["windows"])
+        self._alert(result["windows"][self.alert_window])
+        return result
+        
+    def publish(self, windows: Dict[str, Dict[str, Any]]) -> None:
+        """Set the per-window gauges, and the legacy gauges from the alert window"""
+        record_drift_watermark(self.watermark)
+        
+        for label, drift_results in windows.items():
+            psi_by_feature = dict(drift_results.get("feature_drift", {}).get("psi_by_feature", {}))
+            prediction_psi = drift_results.get("prediction_drift", {}).get("psi")
+            if prediction_psi is not None:
+                psi_by_feature["predictions"] = prediction_psi
+            record_window_drift(label, psi_by_feature, drift_results["n_samples"], drift_results["should_retrain"])
+            
+        self.accumulator.publish(self.windows[self.alert_window])
+        
+    def _alert(self, drift_results: Dict[str, Any]) -> None:
+        """Alert when the window starts recommending retraining"""
+        should_retrain = bool(drift_results.get("should_retrain"))
+        if should_retrain and not self.retrain_recommended:
+            self.monitor.send_alert(drift_results)
+        elif self.retrain_recommended and not should_retrain:
+            logger.info(f"✓ Drift over the last {self.alert_window} back within thresholds")
+        self.retrain_recommended = should_retrain
+        
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """
+        Run cycles every interval_seconds until `stop` is set (or
+        SIGINT/SIGTERM is received)
+        """
+        stop = stop or asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Not on the main thread, or not supported on this platform
+                
+        logger.info(
+            f"Drift monitor daemon started: windows {', '.join(self.windows)}, "
+            f"every {self.interval_seconds:g}s"
+        )
+        
+        while not stop.is_set():
+            started = time.monotonic()
+            result = await self.run_cycle()
+            logger.info(
+                f"Drift cycle: {result['fetched']} new decisions, "
+                f"watermark {result.get('watermark')}, " + ", ".join(
+                    f"{label}: n={window['n_samples']} retrain={window['should_retrain']}"
+                    for label, window in result.get("windows", {}).items()
+                )
+            )
+            
+            try:
+                await asyncio.wait_for(
+                    stop.wait(),
+                    timeout=max(0.0, self.interval_seconds - (time.monotonic() - started))
+                )
+            except asyncio.TimeoutError:
+                pass
+                
+        logger.info("Drift monitor daemon stopped")
+
+
 async def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description="Monitor model drift")
@@ -180,17 +712,80 @@ async def main():
     parser.add_argument(
         "--reference-data",
         type=str,
-        default="./drift_reference.json",
+        default=drift_reference_path(),
         help="Path to reference distributions"
     )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=None,
+        help="Decisions per page (default: DRIFT_FETCH_PAGE_SIZE or 5000)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Time slices fetched at once (default: DRIFT_FETCH_CONCURRENCY or 4)"
+    )
+    
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running, checking new decisions every --interval seconds"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=float(os.getenv("DRIFT_DAEMON_INTERVAL_SECONDS", "300")),
+        help="Seconds between daemon cycles"
+    )
+    parser.add_argument(
+        "--windows",
+        type=str,
+        default=os.getenv("DRIFT_DAEMON_WINDOWS", "1h,24h,7d"),
+        help="Comma-separated windows checked by the daemon"
+    )
+    parser.add_argument(
+        "--state-path",
+        type=str,
+        default=os.getenv("DRIFT_DAEMON_STATE_PATH", "./drift_state/drift_monitor.npz"),
+        help="Daemon counters and watermark, for resuming after a restart"
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=int(os.getenv("DRIFT_DAEMON_METRICS_PORT", "9109")),
+        help="Port of the daemon's Prometheus endpoint (0 to disable)"
+    )
     
     args = parser.parse_args()
     
     monitor = DriftMonitor(
         api_url=args.api_url,
-        reference_data_path=args.reference_data
+        reference_data_path=args.reference_data,
+        page_size=args.page_size,
+        concurrency=args.concurrency
     )
     
+    if args.daemon:
+        if args.metrics_port:
+            from prometheus_client import start_http_server
+            start_http_server(args.metrics_port)
+            
+        daemon = DriftMonitorDaemon(
+            monitor,
+            windows=args.windows.split(","),
+            alert_window=os.getenv("DRIFT_DAEMON_ALERT_WINDOW", "24h"),
+            interval_seconds=args.interval,
+            bucket_seconds=float(os.getenv("DRIFT_DAEMON_BUCKET_SECONDS", "300")),
+            lag_seconds=float(os.getenv("DRIFT_DAEMON_LAG_SECONDS", "60")),
+            backfill_hours=float(os.getenv("DRIFT_DAEMON_BACKFILL_HOURS", "24")),
+            state_path=args.state_path,
+            min_samples=int(os.getenv("DRIFT_MIN_SAMPLES", "100"))
+        )
+        await daemon.run()
+        return None
+        
     results = await monitor.run_monitoring(hours=args.hours)
     
     logger.info("Drift monitoring complete")
@@ -0,0 +1,360 @@
+"""
+Quantile Sketches
+
+Mergeable KLL quantile sketches (Karnin, Lang, Liberty 2016) for
+reference and production feature distributions.
+
+- Built in one streaming pass: each chunk is appended to the lowest
+  level, and full levels are compacted (sorted, every other item
+  promoted with double weight). Memory is about 3k items per sketch
+  whatever the row count; rank error is around 1.7/k (1% at k=200).
+- Sketches built on different chunks or workers merge level by level.
+- Drift statistics come straight from two sketches: quantile-binned
+  counts for PSI (bins at the reference quantiles, so skewed monetary
+  features get equally populated bins), the Kolmogorov-Smirnov
+  statistic and a tail-trimmed 1-Wasserstein distance with its error
+  bound.
+- Serialized as a compact binary record (float32 items, zlib, base64)
+  that fits in a JSON field.
+
+Missing and infinite values are not counted.
+"""
+
+import base64
+import struct
+import zlib
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from app.features.schema import FEATURE_NAMES
+
+# Capacity ratio between adjacent levels
+_DECAY = 2.0 / 3.0
+
+# Rank error of a sketch is about this / k (see KLLSketch.rank_error)
+_RANK_ERROR_FACTOR = 1.7
+
+# Share of each tail left out of the Wasserstein distance
+WASSERSTEIN_TRIM = 0.01
+
+_MAGIC = b"KLL1"
+_HEADER = struct.Struct("<4sIqddddH")
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch of one numeric column
+
+    Args:
+        k: Capacity of the top level; accuracy grows with k
+        seed: Seed of the compaction coin flips
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = 0):
+        self.k = k
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+        self._sorted: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return self.n
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.n if self.n else float("nan")
+
+    @property
+    def std(self) -> float:
+        if not self.n:
+            return float("nan")
+        return float(np.sqrt(max(self.sum_sq / self.n - self.mean ** 2, 0.0)))
+
+    @property
+    def rank_error(self) -> float:
+        """Approximate error of cdf() and of the levels hit by quantile() (about 1.7/k)"""
+        return _RANK_ERROR_FACTOR / self.k
+
+    @property
+    def n_items(self) -> int:
+        """Items retained (memory footprint)"""
+        return sum(len(items) for items in self._levels)
+
+    def update(self, values: Union[np.ndarray, Sequence[float]]) -> 'KLLSketch':
+        """Add a batch of values"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return self
+
+        self.n += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.sum += float(values.sum())
+        self.sum_sq += float(np.dot(values, values))
+
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """Add another sketch's data to this one"""
+        if not other.n:
+            return self
+
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sum += other.sum
+        self.sum_sq += other.sum_sq
+
+        for level, items in enumerate(other._levels):
+            if level == len(self._levels):
+                self._levels.append(np.empty(0))
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self._compress()
+        return self
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - 1 - level
+        return max(2, int(np.ceil(self.k * _DECAY ** depth)))
+
+    def _compress(self) -> None:
+        """Compact every level over capacity into the next (weight is preserved)"""
+        self._sorted = None
+
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+
+                items = np.sort(items)
+                odd = len(items) % 2
+                offset = int(self._rng.integers(2))
+                self._levels[level + 1] = np.concatenate(
+                    [self._levels[level + 1], items[odd + offset::2]]
+                )
+                self._levels[level] = items[:odd]
+            level += 1
+
+    def _weighted(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(sorted items, cumulative weights)"""
+        if self._sorted is None:
+            items = np.concatenate(self._levels)
+            weights = np.concatenate([
+                np.full(len(level_items), 2.0 ** level)
+                for level, level_items in enumerate(self._levels)
+            ])
+            order = np.argsort(items, kind="stable")
+            self._sorted = (items[order], np.cumsum(weights[order]))
+        return self._sorted
+
+    def rank(self, x: Union[float, np.ndarray], inclusive: bool = True) -> np.ndarray:
+        """Estimated number of values <= x (< x when not inclusive)"""
+        items, cumulative = self._weighted()
+        if not len(items):
+            return np.zeros(np.shape(x))
+
+        idx = np.searchsorted(items, x, side="right" if inclusive else "left")
+        return np.where(idx > 0, cumulative[np.maximum(idx - 1, 0)], 0.0)
+
+    def cdf(self, x: Union[float, np.ndarray], inclusive: bool = True) -> np.ndarray:
+        """Estimated share of values <= x (< x when not inclusive)"""
+        return self.rank(x, inclusive) / max(self.n, 1)
+
+    def quantile(self, q: Union[float, np.ndarray]) -> np.ndarray:
+        """Estimated q-quantiles; 0 and 1 give the exact min and max"""
+        if not self.n:
+            raise ValueError("Quantile of an empty sketch")
+
+        q = np.asarray(q, dtype=np.float64)
+        items, cumulative = self._weighted()
+        idx = np.minimum(np.searchsorted(cumulative, q * self.n, side="left"), len(items) - 1)
+        values = items[idx]
+        return np.where(q <= 0, self.min, np.where(q >= 1, self.max, values))
+
+    def to_bytes(self) -> bytes:
+        """Compact binary form: header, level sizes, float32 items, zlib-compressed"""
+        sizes = [len(items) for items in self._levels]
+        header = _HEADER.pack(
+            _MAGIC, self.k, self.n, self.min, self.max, self.sum, self.sum_sq, len(sizes)
+        )
+        body = struct.pack(f"<{len(sizes)}I", *sizes) + np.concatenate(self._levels).astype("<f4").tobytes()
+        return zlib.compress(header + body)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'KLLSketch':
+        data = zlib.decompress(data)
+        magic, k, n, min_value, max_value, total, total_sq, n_levels = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a KLL sketch")
+
+        offset = _HEADER.size
+        sizes = struct.unpack_from(f"<{n_levels}I", data, offset)
+        offset += 4 * n_levels
+        items = np.frombuffer(data, dtype="<f4", offset=offset).astype(np.float64)
+
+        sketch = cls(k=k)
+        sketch.n, sketch.min, sketch.max, sketch.sum, sketch.sum_sq = n, min_value, max_value, total, total_sq
+        sketch._levels = np.split(items, np.cumsum(sizes)[:-1])
+        return sketch
+
+    def encode(self) -> str:
+        """to_bytes as base64 text, for JSON"""
+        return base64.b64encode(self.to_bytes()).decode("ascii")
+
+    @classmethod
+    def decode(cls, text: str) -> 'KLLSketch':
+        return cls.from_bytes(base64.b64decode(text))
+
+
+class FeatureSketches:
+    """
+    One KLL sketch per column, updated from feature chunks
+
+    Args:
+        k: Sketch accuracy parameter
+        seed: Seed of the compaction coin flips
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = 0):
+        self.k = k
+        self.seed = seed
+        self.sketches: Dict[str, KLLSketch] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sketches
+
+    def __getitem__(self, name: str) -> KLLSketch:
+        return self.sketches[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.sketches)
+
+    def update(self, features: Union[pd.DataFrame, np.ndarray]) -> 'FeatureSketches':
+        """
+        Add a chunk of rows
+
+        Args:
+            features: DataFrame (one sketch per column) or matrix in
+                schema column order
+        """
+        if isinstance(features, pd.DataFrame):
+            for name in features.columns:
+                self.update_column(name, features[name].to_numpy(dtype=np.float64, na_value=np.nan))
+        else:
+            for j, name in enumerate(FEATURE_NAMES):
+                self.update_column(name, features[:, j])
+        return self
+
+    def update_column(self, name: str, values: np.ndarray) -> 'FeatureSketches':
+        if name not in self.sketches:
+            self.sketches[name] = KLLSketch(self.k, self.seed)
+        self.sketches[name].update(values)
+        return self
+
+    def merge(self, other: 'FeatureSketches') -> 'FeatureSketches':
+        """Add another set's data (e.g. built by another worker) to this one"""
+        for name, sketch in other.sketches.items():
+            if name not in self.sketches:
+                self.sketches[name] = KLLSketch(self.k, self.seed)
+            self.sketches[name].merge(sketch)
+        return self
+
+    def encode(self) -> Dict[str, str]:
+        return {name: sketch.encode() for name, sketch in self.sketches.items()}
+
+    @classmethod
+    def decode(cls, encoded: Dict[str, str]) -> 'FeatureSketches':
+        sketches = cls()
+        sketches.sketches = {name: KLLSketch.decode(text) for name, text in encoded.items()}
+        return sketches
+
+
+def quantile_bins(reference: KLLSketch, n_bins: int = 10) -> np.ndarray:
+    """
+    Bin edges at the reference quantiles (np.histogram convention)
+
+    Tied quantiles collapse into one edge; a two-valued column (e.g. a
+    flag) still gets two bins.
+    """
+    edges = np.unique(reference.quantile(np.linspace(0, 1, n_bins + 1)))
+
+    if len(edges) == 1:
+        return np.array([edges[0] - 0.5, edges[0] + 0.5])
+    if len(edges) == 2:
+        return np.array([edges[0], (edges[0] + edges[1]) / 2, edges[1]])
+    return edges
+
+
+def bin_counts(sketch: KLLSketch, edges: np.ndarray) -> np.ndarray:
+    """
+    Estimated counts per bin [e_i, e_i+1), the last bin closed, like
+    np.histogram; values outside the edges are not counted
+    """
+    below = sketch.rank(edges, inclusive=False)
+    below[-1] = sketch.rank(edges[-1], inclusive=True)
+    return np.diff(below)
+
+
+def _union_grid(a: KLLSketch, b: KLLSketch) -> np.ndarray:
+    return np.unique(np.concatenate([a._weighted()[0], b._weighted()[0], [a.min, a.max, b.min, b.max]]))
+
+
+def ks_statistic(reference: KLLSketch, current: KLLSketch) -> float:
+    """Kolmogorov-Smirnov statistic: largest gap between the two CDFs"""
+    grid = _union_grid(reference, current)
+    return float(np.max(np.abs(reference.cdf(grid) - current.cdf(grid))))
+
+
+def _trimmed_levels(trim: float, n_points: int) -> np.ndarray:
+    """Midpoints of n_points equal steps over the quantile levels [trim, 1 - trim]"""
+    return trim + (1 - 2 * trim) * (np.arange(n_points) + 0.5) / n_points
+
+
+def wasserstein_distance(
+    reference: KLLSketch,
+    current: KLLSketch,
+    trim: float = WASSERSTEIN_TRIM,
+    n_points: int = 1000
+) -> float:
+    """
+    Tail-trimmed 1-Wasserstein (earth mover's) distance, in feature units
+
+    Integral of |Q_reference(u) - Q_current(u)| over quantile levels u in
+    [trim, 1 - trim], on a common grid of n_points levels. Untrimmed,
+    heavy-tailed features put most of the distance in the extreme tail,
+    where the sketches hold a few heavily weighted items, so the estimate
+    had no useful accuracy; trimmed, its error is within
+    wasserstein_error_bound.
+    """
+    levels = _trimmed_levels(trim, n_points)
+    gaps = np.abs(reference.quantile(levels) - current.quantile(levels))
+    return float(np.mean(gaps) * (1 - 2 * trim))
+
+
+def wasserstein_error_bound(
+    reference: KLLSketch,
+    current: KLLSketch,
+    trim: float = WASSERSTEIN_TRIM
+) -> float:
+    """
+    Approximate bound on the error of wasserstein_distance (feature units)
+
+    Each sketch's quantiles are off by up to its rank error in level,
+    which moves the integral by at most rank_error times the sketch's
+    spread over [trim, 1 - trim]. Drifts smaller than this are not
+    resolved by the sketches.
+    """
+    return float(sum(
+        sketch.rank_error * (sketch.quantile(1 - trim) - sketch.quantile(trim))
+        for sketch in (reference, current)
+    ))
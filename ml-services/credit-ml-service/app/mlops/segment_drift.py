@@ -0,0 +1,333 @@
+"""
+Segmented Drift Detection
+
+Drift per segment (tenant, industry, company size, or combinations)
+against per-segment reference distributions, so drift inside one large
+tenant is not averaged away by the others.
+
+- Every value is binned once against the global reference edges
+  (ReferenceBins), whatever the number of segmentations.
+- Segment keys are turned into group indices (pd.factorize per column,
+  combined codes, np.unique inverse), then one bincount over
+  segment x feature x bin fills a [segments, features, bins] count
+  tensor.
+- PSI for all (segment, feature) pairs is one vectorized call.
+- Results are ranked, worst segment first.
+
+Reference counts are stored per segmentation in a compressed .npz next
+to the global reference (segment keys, count tensor, rows per segment).
+
+Not wired into the service. The training datasets (schema features
+and labels) carry no segment columns, so the trainer cannot build
+per-segment references. Live traffic does carry one: PredictRequest.tenant_id
+comes with every /api/predict call. Counting per tenant in the service
+would also need per-tenant references fitted from a baseline window of
+that traffic, and counters bounded in the number of tenants; that is out
+of scope here, and the in-service DriftAccumulator stays global. Callers
+holding segment columns and a baseline (e.g. tenant decision exports)
+use it directly:
+
+    segment_drift = SegmentDriftDetector(DriftDetector(reference_data_path=path))
+    segment_drift.fit_reference(X_baseline, baseline_segments, baseline_probabilities)
+    results = segment_drift.detect(X_recent, recent_segments, recent_probabilities)
+    print(SegmentDriftDetector.report(results))
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.mlops.drift_accumulator import PREDICTIONS_KEY, ReferenceBins
+from app.mlops.drift_detection import DriftDetector
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEGMENTATIONS: Tuple[Tuple[str, ...], ...] = (
+    ("tenant_id",),
+    ("industry",),
+    ("company_size",),
+)
+
+# Separates column values in combined segment keys (escaped with a
+# backslash inside values)
+KEY_SEPARATOR = "|"
+
+
+@dataclass
+class SegmentCounts:
+    """Bin counts of every segment of one segmentation"""
+    keys: np.ndarray          # Segment keys, sorted (str [n_segments])
+    counts: np.ndarray        # int64 [n_segments, n_tracked, n_bins]
+    rows: np.ndarray          # int64 [n_segments]
+
+
+def segmentation_name(columns: Sequence[str]) -> str:
+    return "+".join(columns)
+
+
+def segment_groups(segments: pd.DataFrame, columns: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Group index of every row by the combination of `columns`
+
+    Keys of combined columns are "value|value", with "|" and "\\" escaped
+    inside values so distinct combinations never share a key. Missing
+    values (None or NaN) form one segment, keyed "nan".
+
+    Returns:
+        (sorted segment keys [n_segments], group index per row [n_rows])
+    """
+    codes = np.zeros(len(segments), dtype=np.int64)
+    uniques = []
+    for column in columns:
+        column_codes, column_uniques = pd.factorize(segments[column], use_na_sentinel=False)
+        codes = codes * len(column_uniques) + column_codes
+        column_uniques = np.asarray(column_uniques, dtype=str)
+        if len(columns) > 1:
+            column_uniques = np.char.replace(column_uniques, "\\", "\\\\")
+            column_uniques = np.char.replace(column_uniques, KEY_SEPARATOR, "\\" + KEY_SEPARATOR)
+        uniques.append(column_uniques)
+
+    combined, inverse = np.unique(codes, return_inverse=True)
+
+    # Decode the combined codes back into "value|value" keys (one per segment)
+    parts = []
+    for column_uniques in reversed(uniques):
+        parts.append(column_uniques[combined % len(column_uniques)])
+        combined = combined // len(column_uniques)
+    keys = parts[-1]
+    for part in reversed(parts[:-1]):
+        keys = np.char.add(np.char.add(keys, KEY_SEPARATOR), part)
+
+    # Sort by key so reference and current segments can be matched by search
+    order = np.argsort(keys, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return keys[order], rank[np.ravel(inverse)]
+
+
+class SegmentDriftDetector:
+    """
+    Per-segment PSI against per-segment references
+
+    Args:
+        detector: DriftDetector with the global reference (its bin edges
+            are shared by all segments)
+        segmentations: Column combinations to segment by
+        min_samples: Rows a segment needs, in reference and current data,
+            before its drift is reported
+    """
+
+    def __init__(
+        self,
+        detector: DriftDetector,
+        segmentations: Sequence[Sequence[str]] = DEFAULT_SEGMENTATIONS,
+        min_samples: int = 100
+    ):
+        self.detector = detector
+        self.segmentations = [tuple(columns) for columns in segmentations]
+        self.min_samples = min_samples
+        self.bins = ReferenceBins(detector.reference_distributions)
+        if all(name == PREDICTIONS_KEY for name in self.bins.names):
+            raise ValueError("Segment drift needs reference distributions of the features")
+        self.reference: Dict[str, SegmentCounts] = {}
+
+    def count(
+        self,
+        features: np.ndarray,
+        segments: pd.DataFrame,
+        probabilities: Optional[np.ndarray] = None
+    ) -> Dict[str, SegmentCounts]:
+        """
+        Count tensors of every segmentation, in one binning pass
+
+        Args:
+            features: Feature matrix in schema order [n_rows, N_FEATURES]
+            segments: Segment columns of the same rows
+            probabilities: Model default probabilities [n_rows]
+        """
+        if len(segments) != len(features):
+            raise ValueError(f"Got {len(segments)} segment rows for {len(features)} feature rows")
+
+        flat = self.bins.flat_bins(features, probabilities)
+        counted = flat >= 0
+        cells = self.bins.n_tracked * self.bins.n_bins
+
+        result = {}
+        for columns in self.segmentations:
+            keys, groups = segment_groups(segments, columns)
+            index = groups[:, None] * cells + flat
+            counts = np.bincount(index[counted], minlength=len(keys) * cells)
+            result[segmentation_name(columns)] = SegmentCounts(
+                keys=keys,
+                counts=counts.reshape(len(keys), self.bins.n_tracked, self.bins.n_bins),
+                rows=np.bincount(groups, minlength=len(keys))
+            )
+        return result
+
+    def fit_reference(
+        self,
+        features: np.ndarray,
+        segments: pd.DataFrame,
+        probabilities: Optional[np.ndarray] = None
+    ) -> None:
+        """Set per-segment references from baseline rows (e.g. training data)"""
+        self.reference = self.count(features, segments, probabilities)
+        logger.info(
+            "Segment references: " +
+            ", ".join(f"{name}={len(counts.keys)}" for name, counts in self.reference.items())
+        )
+
+    def detect(
+        self,
+        features: np.ndarray,
+        segments: pd.DataFrame,
+        probabilities: Optional[np.ndarray] = None,
+        top_features: int = 3
+    ) -> Dict[str, Any]:
+        """
+        Drift of every segment against its reference, worst first
+
+        Args:
+            features: Current feature matrix in schema order
+            segments: Segment columns of the same rows
+            probabilities: Model default probabilities
+            top_features: Most drifted features listed per segment
+
+        Returns:
+            {"timestamp", "segmentations": {name: [segment results ranked
+            by max PSI]}, "skipped": {name: segments without enough data
+            or without a reference}}
+        """
+        current = self.count(features, segments, probabilities)
+        result = {"timestamp": datetime.now().isoformat(), "segmentations": {}, "skipped": {}}
+
+        for name, counts in current.items():
+            ranked, skipped = self._compare(name, counts, top_features)
+            result["segmentations"][name] = ranked
+            result["skipped"][name] = skipped
+
+        return result
+
+    def _compare(
+        self,
+        name: str,
+        current: SegmentCounts,
+        top_features: int
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        reference = self.reference.get(name)
+        if reference is None or not len(reference.keys):
+            return [], current.keys.tolist()
+
+        # Reference row of every current segment
+        position = np.minimum(np.searchsorted(reference.keys, current.keys), len(reference.keys) - 1)
+        matched = reference.keys[position] == current.keys
+        usable = (
+            matched
+            & (current.rows >= self.min_samples)
+            & (reference.rows[position] >= self.min_samples)
+        )
+        skipped = current.keys[~usable].tolist()
+        if not usable.any():
+            return [], skipped
+
+        expected = reference.counts[position[usable]]
+        actual = current.counts[usable]
+        n_segments, n_tracked, n_bins = actual.shape
+
+        psi = self.detector.calculate_psi_batch(
+            expected.reshape(-1, n_bins), actual.reshape(-1, n_bins)
+        ).reshape(n_segments, n_tracked)
+
+        is_feature = np.array([feature != PREDICTIONS_KEY for feature in self.bins.names])
+        feature_psi = psi[:, is_feature]
+        feature_names = np.asarray(self.bins.names)[is_feature]
+        prediction_psi = psi[:, ~is_feature][:, 0] if (~is_feature).any() else None
+
+        max_psi = feature_psi.max(axis=1)
+        drifted = (feature_psi > self.detector.psi_threshold).sum(axis=1)
+        worst = np.argsort(-feature_psi, axis=1)[:, :top_features]
+
+        ranked = []
+        for i in np.argsort(-max_psi, kind="stable"):
+            drift_percentage = float(drifted[i]) / feature_psi.shape[1]
+            summary = {
+                "critical_drift": bool(max_psi[i] > 0.25),
+                "drift_percentage": drift_percentage
+            }
+            ranked.append({
+                "segment": str(current.keys[usable][i]),
+                "n_samples": int(current.rows[usable][i]),
+                "reference_samples": int(reference.rows[position[usable]][i]),
+                "max_psi": float(max_psi[i]),
+                "average_psi": float(feature_psi[i].mean()),
+                "drifted_features": int(drifted[i]),
+                "drift_percentage": drift_percentage,
+                "prediction_psi": float(prediction_psi[i]) if prediction_psi is not None else None,
+                "severity": self.detector._categorize_psi(float(max_psi[i])),
+                "should_retrain": self.detector.should_retrain(summary),
+                "top_features": [
+                    {"feature": str(feature_names[j]), "psi": float(feature_psi[i, j])}
+                    for j in worst[i]
+                ]
+            })
+
+        return ranked, skipped
+
+    def save_reference(self, path: str) -> None:
+        """Save per-segment references as a compressed .npz"""
+        arrays = {
+            "names": np.asarray(self.bins.names),
+            "segmentations": np.asarray(list(self.reference))
+        }
+        for i, counts in enumerate(self.reference.values()):
+            arrays[f"keys_{i}"] = counts.keys
+            arrays[f"counts_{i}"] = counts.counts
+            arrays[f"rows_{i}"] = counts.rows
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+
+        logger.info(f"Segment references saved to: {path}")
+
+    def load_reference(self, path: str) -> None:
+        """Load per-segment references written by save_reference"""
+        with np.load(path, allow_pickle=False) as archive:
+            if archive["names"].tolist() != self.bins.names:
+                raise ValueError(f"{path} was built against a different global reference")
+
+            self.reference = {
+                str(name): SegmentCounts(
+                    keys=archive[f"keys_{i}"],
+                    counts=archive[f"counts_{i}"],
+                    rows=archive[f"rows_{i}"]
+                )
+                for i, name in enumerate(archive["segmentations"])
+            }
+
+        logger.info(f"Loaded segment references for {list(self.reference)}")
+
+    @staticmethod
+    def report(results: Dict[str, Any], limit: int = 10) -> str:
+        """Worst segments of each segmentation as text"""
+        lines = ["=" * 80, "SEGMENT DRIFT REPORT", "=" * 80, f"Timestamp: {results['timestamp']}"]
+
+        for name, ranked in results["segmentations"].items():
+            lines.append(f"\n{name}: {len(ranked)} segments checked, "
+                         f"{len(results['skipped'][name])} skipped")
+            lines.append("-" * 80)
+            for segment in ranked[:limit]:
+                worst = ", ".join(f"{f['feature']}={f['psi']:.3f}" for f in segment["top_features"])
+                lines.append(
+                    f"  {segment['segment']}: max PSI={segment['max_psi']:.4f} "
+                    f"({segment['severity']}, {segment['drifted_features']} features, "
+                    f"n={segment['n_samples']}) - {worst}"
+                )
+
+        lines.append("=" * 80)
+        return "\n".join(lines)
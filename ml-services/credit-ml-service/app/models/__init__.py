@@ -3,11 +3,17 @@
 from .base_model import BaseModel
 from .xgboost_model import XGBoostModel
 from .lightgbm_model import LightGBMModel
-from .ensemble import EnsembleModel
+from .nn_model import NeuralNetModel
+from .ensemble import EnsembleModel, EnsembleScore
+from .model_store import ModelStore, model_store
 
 __all__ = [
     'BaseModel',
     'XGBoostModel',
     'LightGBMModel',
-    'EnsembleModel'
+    'NeuralNetModel',
+    'EnsembleModel',
+    'EnsembleScore',
+    'ModelStore',
+    'model_store'
 ]
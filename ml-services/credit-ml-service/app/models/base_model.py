@@ -6,13 +6,50 @@ This ensures consistency and makes it easy to add new models.
 """
 
 from abc import ABC, abstractmethod
+import hashlib
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import joblib
 import json
+import os
 from pathlib import Path
 
+from app.features.schema import FEATURE_NAMES, check_schema_version
+
+# Training-set metrics are computed on a random subsample of this many rows
+TRAIN_METRICS_MAX_ROWS = int(os.getenv("TRAIN_METRICS_MAX_ROWS", "50000"))
+
+
+def subsample(X: Any, y: np.ndarray, max_rows: Optional[int]) -> Tuple[Any, np.ndarray]:
+    """
+    Random subsample of at most max_rows rows, in original order
+    
+    The seed is fixed, so equal-length inputs always yield the same rows.
+    """
+    y = np.asarray(y)
+    if max_rows is None or len(y) <= max_rows:
+        return X, y
+    
+    rows = np.sort(np.random.default_rng(0).choice(len(y), max_rows, replace=False))
+    X = X.iloc[rows] if isinstance(X, pd.DataFrame) else X[rows]
+    return X, y[rows]
+
+
+def data_fingerprint(*arrays: np.ndarray) -> str:
+    """
+    Content hash of training arrays (shape, dtype and values)
+    
+    Rows are hashed in blocks, so memory-mapped inputs are not copied whole.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.asarray(array)
+        digest.update(f"{array.shape}{array.dtype.str}".encode())
+        for start in range(0, len(array), 65536):
+            digest.update(np.ascontiguousarray(array[start:start + 65536]).tobytes())
+    return digest.hexdigest()
+
 
 class BaseModel(ABC):
     """
@@ -25,8 +62,15 @@ class BaseModel(ABC):
     - save(): Persist model to disk
     - load(): Load model from disk
     - get_feature_importance(): Return feature contributions
+    
+    Models that can be stored in an artifact directory (see
+    EnsembleModel.save) also implement _save_native_model and
+    _load_native_model and set native_extension.
     """
     
+    # File extension of the model's native (non-pickle) format, e.g. ".ubj"
+    native_extension: str = None
+    
     def __init__(self, model_name: str, version: str = "1.0.0"):
         self.model_name = model_name
         self.version = version
@@ -40,6 +84,15 @@ class BaseModel(ABC):
             "train_samples": 0,
             "train_metrics": {}
         }
+        
+        # Boosters periodically save progress here and resume from it
+        # (see _checkpoint_path); disabled when unset
+        self.checkpoint_dir: Optional[str] = os.getenv("TRAINING_CHECKPOINT_DIR") or None
+        self.checkpoint_interval = int(os.getenv("TRAINING_CHECKPOINT_INTERVAL", "50"))
+        
+        # Probabilities from the last evaluate() per split ("train", "val");
+        # not saved with the model
+        self.eval_predictions: Dict[str, np.ndarray] = {}
     
     @abstractmethod
     def train(
@@ -145,37 +198,132 @@ class BaseModel(ABC):
             with open(metadata_path, 'r') as f:
                 self.metadata = json.load(f)
         
+        # Refuse models compiled against a different feature layout
+        check_schema_version(self.metadata.get("feature_schema_version"), self.model_name)
+        self.feature_names = list(FEATURE_NAMES)
+        
+        return self
+    
+    def save_native(self, path: str) -> None:
+        """
+        Save the fitted model in its library's native format
+        
+        Metadata is not written; the caller stores it (e.g. in a manifest).
+        """
+        if not self.is_trained:
+            raise ValueError(f"{self.model_name} not trained yet")
+        
+        self._save_native_model(path)
+    
+    def load_native(self, path: str, metadata: Dict[str, Any] = None) -> 'BaseModel':
+        """
+        Load a model written by save_native
+        
+        Args:
+            path: Native model file
+            metadata: Metadata saved alongside the model (optional)
+        
+        Returns:
+            Self (for chaining)
+        """
+        self._load_native_model(path)
+        self.is_trained = True
+        
+        if metadata is not None:
+            self.metadata = metadata
+        
+        check_schema_version(self.metadata.get("feature_schema_version"), self.model_name)
+        self.feature_names = list(FEATURE_NAMES)
+        
         return self
     
-    def validate(self, X_test: pd.DataFrame, y_test: np.ndarray) -> Dict[str, float]:
+    def _save_native_model(self, path: str) -> None:
+        raise NotImplementedError(f"{self.model_name} has no native model format")
+    
+    def _load_native_model(self, path: str) -> None:
+        raise NotImplementedError(f"{self.model_name} has no native model format")
+    
+    def _checkpoint_path(self, data_key: str) -> Optional[Path]:
+        """
+        Training checkpoint file, or None when checkpointing is disabled
+        
+        The name includes a hash of the hyperparameters and of `data_key`
+        (a fingerprint of the training data), so a run only resumes from a
+        checkpoint of the same configuration on the same data.
+        """
+        if not self.checkpoint_dir:
+            return None
+        
+        # n_estimators is left out: it is the cap, not part of the trees built so far
+        params = {name: value for name, value in self.params.items() if name != "n_estimators"}
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+        digest.update(data_key.encode())
+        
+        return Path(self.checkpoint_dir) / (
+            f"{self.model_name}_v{self.version}_{digest.hexdigest()}.checkpoint{self.native_extension}"
+        )
+    
+    def validate(
+        self,
+        X_test: pd.DataFrame,
+        y_test: np.ndarray,
+        max_rows: Optional[int] = None
+    ) -> Dict[str, float]:
         """
         Validate model on test set
         
         Args:
             X_test: Test features
             y_test: Test labels
+            max_rows: Evaluate a random subsample of at most this many rows
+                (fixed seed), e.g. for training-set metrics
         
         Returns:
             Dictionary with performance metrics
         """
+        X_test, y_test = subsample(X_test, y_test, max_rows)
+        return self.compute_metrics(y_test, self.predict_proba(X_test))
+    
+    def evaluate(
+        self,
+        split: str,
+        X: pd.DataFrame,
+        y: np.ndarray,
+        max_rows: Optional[int] = None
+    ) -> Dict[str, float]:
+        """
+        validate() that keeps the probabilities in eval_predictions[split]
+        
+        Used for the training-time metric passes, so the ensemble can
+        build its own metrics from its members' predictions.
+        """
+        X, y = subsample(X, y, max_rows)
+        self.eval_predictions[split] = self.predict_proba(X)
+        return self.compute_metrics(y, self.eval_predictions[split])
+    
+    @staticmethod
+    def compute_metrics(y_true: np.ndarray, y_proba: np.ndarray) -> Dict[str, float]:
+        """Performance metrics from labels and default probabilities"""
         from sklearn.metrics import (
             roc_auc_score, precision_score, recall_score,
             f1_score, accuracy_score, confusion_matrix
         )
         
-        y_pred = self.predict(X_test)
-        y_proba = self.predict_proba(X_test)
+        # Labels use the models' 0.5 decision threshold
+        y_true = np.asarray(y_true)
+        y_pred = (y_proba > 0.5).astype(int)
         
         metrics = {
-            "auc": roc_auc_score(y_test, y_proba),
-            "accuracy": accuracy_score(y_test, y_pred),
-            "precision": precision_score(y_test, y_pred, zero_division=0),
-            "recall": recall_score(y_test, y_pred, zero_division=0),
-            "f1_score": f1_score(y_test, y_pred, zero_division=0)
+            "auc": roc_auc_score(y_true, y_proba),
+            "accuracy": accuracy_score(y_true, y_pred),
+            "precision": precision_score(y_true, y_pred, zero_division=0),
+            "recall": recall_score(y_true, y_pred, zero_division=0),
+            "f1_score": f1_score(y_true, y_pred, zero_division=0)
         }
         
         # Confusion matrix
-        tn, fp, fn, tp = confusion_matrix(y_test, y_pred).ravel()
+        tn, fp, fn, tp = confusion_matrix(y_true, y_pred).ravel()
         metrics["true_negatives"] = int(tn)
         metrics["false_positives"] = int(fp)
         metrics["false_negatives"] = int(fn)
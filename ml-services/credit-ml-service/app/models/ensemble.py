@@ -9,15 +9,87 @@ Strategy: Stacking with optimized weights
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import json
 import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
 
-from .base_model import BaseModel
+from .base_model import BaseModel, TRAIN_METRICS_MAX_ROWS, subsample
 from .xgboost_model import XGBoostModel
 from .lightgbm_model import LightGBMModel
+from .nn_model import NeuralNetModel
+from .streaming import RowChunks
+from .fused_ensemble import FusedEnsemble
+from .tree_compiler import check_parity, parity_probe
+from .weight_optimizer import evaluate_candidates, optimize_simplex
+from app.features.schema import (
+    FEATURE_NAMES,
+    FEATURE_SCHEMA_VERSION,
+    as_feature_matrix,
+    check_schema_version
+)
 
 logger = logging.getLogger(__name__)
 
+# Inference backend for the base boosters:
+# - native: XGBoost / LightGBM predict_proba
+# - flat: compiled NumPy forests (app.models.tree_compiler)
+# - auto: flat for batches up to FLAT_BACKEND_MAX_ROWS, native above
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "auto").lower()
+FLAT_BACKEND_MAX_ROWS = int(os.getenv("FLAT_BACKEND_MAX_ROWS", "64"))
+
+# Base models train concurrently on threads (XGBoost, LightGBM and BLAS
+# release the GIL), splitting TRAINING_N_JOBS threads between them
+TRAINING_PARALLEL = os.getenv("TRAINING_PARALLEL", "true").lower() == "true"
+TRAINING_N_JOBS = int(os.getenv("TRAINING_N_JOBS", "0")) or os.cpu_count() or 1
+
+# Artifact directory layout written by EnsembleModel.save:
+#   ensemble_v{version}/
+#     manifest.json     format version, weights, metadata, importances
+#     xgboost.ubj       native booster files (no pickle)
+#     lightgbm.txt
+#     fused/*.npy       compiled forest, loaded memory-mapped
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+# Serializes lazy loading of native boosters (kept off the model so it stays picklable)
+_NATIVE_LOAD_LOCK = threading.Lock()
+
+
+@dataclass
+class EnsembleScore:
+    """Result of EnsembleModel.score (arrays have one entry per row)"""
+    probability: np.ndarray                     # Blended default probability
+    model_probabilities: Dict[str, np.ndarray]  # Each base model's own probability
+    contributions: Dict[str, np.ndarray]        # Weighted share of each model in `probability`
+    top_features: List[Tuple[str, float]]       # Global top-k feature importances
+    feature_contributions: Optional[np.ndarray] = None  # [n_rows, n_features] when explained
+    
+    def top_contributions(self, row: int, top_k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Features with the largest absolute contribution for one row
+        
+        Returns:
+            (feature_name, contribution) tuples, largest |contribution| first;
+            positive values push the prediction towards default
+        """
+        if self.feature_contributions is None:
+            raise ValueError("Score was computed without explanations")
+        
+        return top_feature_contributions(self.feature_contributions[row], top_k)
+
+
+def top_feature_contributions(row_contributions: np.ndarray, top_k: int = 10) -> List[Tuple[str, float]]:
+    """(feature_name, contribution) of one row's largest |contributions|, largest first"""
+    top_indices = np.argsort(-np.abs(row_contributions), kind="stable")[:top_k]
+    return [(FEATURE_NAMES[i], float(row_contributions[i])) for i in top_indices]
+
 
 class EnsembleModel(BaseModel):
     """
@@ -55,7 +127,12 @@ class EnsembleModel(BaseModel):
         # Initialize base models
         self.xgboost = XGBoostModel(version=version)
         self.lightgbm = LightGBMModel(version=version)
-        self.neural_net = None  # Implement later if needed
+        self.neural_net = NeuralNetModel(version=version) if use_neural_net else None
+        
+        self.backend = MODEL_BACKEND
+        self._fused = None  # Compiled lazily on first flat-backend call
+        self._importance = None  # Aggregated importances, computed once per trained model
+        self._native_pending = None  # (artifact dir, components) not loaded yet
         
         logger.info(f"Ensemble model initialized with weights: {self.weights}")
     
@@ -70,41 +147,183 @@ class EnsembleModel(BaseModel):
         
         logger.info(f"Training ensemble on {len(X_train)} samples...")
         
-        self.feature_names = list(X_train.columns)
-        
-        # Train XGBoost
-        logger.info("Training XGBoost...")
-        xgb_metrics = self.xgboost.train(X_train, y_train, X_val, y_val)
+        # Convert once to the schema layout; base models receive arrays
+        X_train = as_feature_matrix(X_train)
+        if X_val is not None:
+            X_val = as_feature_matrix(X_val)
+        self._reset_for_training()
+        started = time.perf_counter()
+        
+        if self.use_neural_net and self.neural_net is None:
+            self.neural_net = NeuralNetModel(version=self.version)
+        components = self._components()
+        
+        # Train base models (concurrently unless TRAINING_PARALLEL=false)
+        timings = {}
+        model_metrics = self._train_components(
+            components,
+            lambda model: model.train(X_train, y_train, X_val, y_val),
+            timings
+        )
         
-        # Train LightGBM
-        logger.info("Training LightGBM...")
-        lgb_metrics = self.lightgbm.train(X_train, y_train, X_val, y_val)
+        _, y_train_eval = subsample(X_train, y_train, TRAIN_METRICS_MAX_ROWS)
+        y_val = y_val if X_val is not None else None
+        return self._finish_training(components, model_metrics, y_train_eval, y_val, timings, started)
+    
+    def train_streaming(
+        self,
+        chunks: RowChunks,
+        X_val: pd.DataFrame = None,
+        y_val: np.ndarray = None
+    ) -> Dict[str, Any]:
+        """
+        Train the boosters out of core from row chunks on disk
         
-        # TODO: Train Neural Net if enabled
+        See XGBoostModel.train_streaming / LightGBMModel.train_streaming.
+        The neural net has no streaming mode.
+        """
         if self.use_neural_net:
-            logger.warning("Neural Net not implemented yet")
+            raise ValueError("Streaming training is not supported with the neural net member")
+        
+        logger.info(f"Training ensemble on {chunks.n_rows} streamed samples...")
+        
+        if X_val is not None:
+            X_val = as_feature_matrix(X_val)
+        self._reset_for_training()
+        started = time.perf_counter()
+        
+        components = self._components()
+        timings = {}
+        model_metrics = self._train_components(
+            components,
+            lambda model: model.train_streaming(chunks, X_val, y_val),
+            timings
+        )
+        
+        # Boosters computed training metrics on the leading rows
+        y_train_eval = chunks.labels[:TRAIN_METRICS_MAX_ROWS]
+        y_val = y_val if X_val is not None else None
+        return self._finish_training(components, model_metrics, y_train_eval, y_val, timings, started)
+    
+    def _reset_for_training(self) -> None:
+        self.feature_names = list(FEATURE_NAMES)
+        self.metadata["feature_schema_version"] = FEATURE_SCHEMA_VERSION
+        self._fused = None
+        self._native_pending = None
+    
+    def _finish_training(
+        self,
+        components: Dict[str, BaseModel],
+        model_metrics: Dict[str, Dict[str, Any]],
+        y_train_eval: np.ndarray,
+        y_val: Optional[np.ndarray],
+        timings: Dict[str, float],
+        started: float
+    ) -> Dict[str, Any]:
+        """
+        Importances, ensemble metrics and timings once the base models are trained
         
+        y_val is None when there was no validation set.
+        """
+        timings["base_models"] = time.perf_counter() - started
         self.is_trained = True
         
-        # Evaluate ensemble performance
-        train_metrics = self.validate(X_train, y_train)
+        phase_start = time.perf_counter()
+        self._importance = self._aggregate_feature_importance()
+        timings["feature_importance"] = time.perf_counter() - phase_start
+        
+        # Evaluate ensemble performance from the base models' metric passes
+        # (same rows, no second inference run)
+        phase_start = time.perf_counter()
+        train_metrics = self._metrics_from_components(components, "train", y_train_eval)
         self.metadata["train_metrics"] = train_metrics
         
         logger.info(f"Ensemble training complete. Train AUC: {train_metrics['auc']:.4f}")
         
-        if X_val is not None and y_val is not None:
-            val_metrics = self.validate(X_val, y_val)
+        if y_val is not None:
+            val_metrics = self._metrics_from_components(components, "val", y_val)
             self.metadata["val_metrics"] = val_metrics
             logger.info(f"Ensemble validation AUC: {val_metrics['auc']:.4f}")
         
+        # The predictions are not needed past training
+        for model in components.values():
+            model.eval_predictions = {}
+        timings["ensemble_metrics"] = time.perf_counter() - phase_start
+        timings["total"] = time.perf_counter() - started
+        
         # Store individual model performance
-        self.metadata["model_metrics"] = {
-            "xgboost": xgb_metrics,
-            "lightgbm": lgb_metrics
-        }
+        self.metadata["model_metrics"] = model_metrics
+        self.metadata["training_seconds"] = {name: round(t, 3) for name, t in timings.items()}
+        
+        logger.info(
+            "Ensemble training time: " +
+            ", ".join(f"{name} {t:.2f}s" for name, t in timings.items())
+        )
         
         return self.metadata
     
+    def _train_components(
+        self,
+        components: Dict[str, BaseModel],
+        fit: Callable[[BaseModel], Dict[str, Any]],
+        timings: Dict[str, float]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Train the base models with fit(model), recording each one's wall time in timings
+        
+        In parallel mode each model gets an equal share of TRAINING_N_JOBS
+        threads (boosters via n_jobs, the neural net via its BLAS pool), so
+        the models do not oversubscribe the CPU.
+        """
+        def train_one(name: str, n_jobs: Optional[int]) -> Dict[str, Any]:
+            logger.info(f"Training {name}" + (f" ({n_jobs} threads)..." if n_jobs else "..."))
+            start = time.perf_counter()
+            metrics = self._train_with_threads(components[name], n_jobs, fit)
+            timings[name] = time.perf_counter() - start
+            return metrics
+        
+        # Sequential when there are fewer threads than models to share them
+        if not TRAINING_PARALLEL or not 1 < len(components) <= TRAINING_N_JOBS:
+            return {name: train_one(name, None) for name in components}
+        
+        n_jobs = max(1, TRAINING_N_JOBS // len(components))
+        with ThreadPoolExecutor(max_workers=len(components), thread_name_prefix="train") as pool:
+            futures = {name: pool.submit(train_one, name, n_jobs) for name in components}
+            return {name: future.result() for name, future in futures.items()}
+    
+    @staticmethod
+    def _train_with_threads(
+        model: BaseModel,
+        n_jobs: Optional[int],
+        fit: Callable[[BaseModel], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Run fit(model) limited to n_jobs threads (None: the model's own setting)"""
+        if n_jobs is None:
+            return fit(model)
+        
+        if isinstance(model, NeuralNetModel):
+            # Imported lazily: comes with scikit-learn, only needed here
+            from threadpoolctl import threadpool_limits
+            with threadpool_limits(limits=n_jobs, user_api="blas"):
+                return fit(model)
+        
+        params = model.params
+        model.params = {**params, "n_jobs": n_jobs}
+        try:
+            return fit(model)
+        finally:
+            model.params = params
+    
+    def _metrics_from_components(
+        self,
+        components: Dict[str, BaseModel],
+        split: str,
+        y_true: np.ndarray
+    ) -> Dict[str, float]:
+        """Ensemble metrics from the base models' eval_predictions[split]"""
+        probabilities = {name: model.eval_predictions[split] for name, model in components.items()}
+        return self.compute_metrics(y_true, self._blend(probabilities)["ensemble"])
+    
     def predict(self, X: pd.DataFrame) -> np.ndarray:
         """Generate ensemble predictions"""
         probas = self.predict_proba(X)
@@ -115,32 +334,95 @@ class EnsembleModel(BaseModel):
         if not self.is_trained:
             raise ValueError("Ensemble not trained yet")
         
-        # Get predictions from each model
-        xgb_proba = self.xgboost.predict_proba(X)
-        lgb_proba = self.lightgbm.predict_proba(X)
+        return self._blend(self._model_probabilities(as_feature_matrix(X)))["ensemble"]
+    
+    def score(self, X: pd.DataFrame, top_k: int = 10, explain: bool = False) -> EnsembleScore:
+        """
+        Score rows with each base model run exactly once
+        
+        Args:
+            X: Features (schema layout)
+            top_k: Number of global feature importances to return
+            explain: Also compute per-row feature contributions (see explain)
+        
+        Returns:
+            EnsembleScore with blended probability, per-model probabilities
+            and contributions, and the top-k features
+        """
+        if not self.is_trained:
+            raise ValueError("Ensemble not trained yet")
+        
+        X = as_feature_matrix(X)
+        model_probabilities = self._model_probabilities(X)
+        contributions = self._blend(model_probabilities)
         
-        # Weighted average
-        ensemble_proba = (
-            xgb_proba * self.weights["xgboost"] +
-            lgb_proba * self.weights["lightgbm"]
+        return EnsembleScore(
+            probability=contributions.pop("ensemble"),
+            model_probabilities=model_probabilities,
+            contributions=contributions,
+            top_features=self.get_feature_importance()[:top_k],
+            feature_contributions=self.explain(X)[:, :-1] if explain else None
         )
+    
+    def explain(self, X: pd.DataFrame, exact: bool = False) -> np.ndarray:
+        """
+        Per-row feature contributions for the whole batch
+        
+        By default from the compiled forest: path attributions (as
+        XGBoost's approx_contribs) for both boosters in one traversal,
+        without loading the native boosters. With exact=True, or when no
+        compiled forest is available, each booster's native TreeSHAP
+        (XGBoost pred_contribs, LightGBM pred_contrib) runs once over all
+        rows. Either way the boosters' results are combined with the
+        ensemble weights.
+        
+        The neural net, if any, is not explained: contributions cover the
+        boosters' weighted share of the prediction only.
+        
+        Returns:
+            float64 array [n_rows, n_features + 1] in weighted log-odds
+            units, bias last; positive values push towards default
+        """
+        if not self.is_trained:
+            raise ValueError("Ensemble not trained yet")
         
-        # Add neural net if available
-        if self.use_neural_net and self.neural_net:
-            nn_proba = self.neural_net.predict_proba(X)
-            ensemble_proba += nn_proba * self.weights["neural_net"]
+        X = as_feature_matrix(X)
         
-        return ensemble_proba
+        if not exact and self.backend != "native":
+            if self._fused is None:
+                self.compile_backend()
+            if self._fused and self._fused.forest.node_values:
+                weights = np.array([self.weights[name] for name in self._fused.model_names])
+                return np.einsum(
+                    "rgf,g->rf", self._fused.forest.predict_contributions(X), weights
+                )
+        
+        self._ensure_native()
+        explanation = np.zeros((X.shape[0], X.shape[1] + 1), dtype=np.float64)
+        for name, model in self._boosters().items():
+            explanation += self.weights[name] * model.predict_contributions(X)
+        
+        return explanation
     
     def get_feature_importance(self) -> List[Tuple[str, float]]:
         """
         Get aggregated feature importance from all models
         
-        Averages importance scores across models
+        Averages importance scores across models. Computed once per
+        trained model (importances are global, they do not depend on X).
         """
         if not self.is_trained:
             raise ValueError("Ensemble not trained yet")
         
+        if self._importance is None:
+            self._importance = self._aggregate_feature_importance()
+        
+        return self._importance
+    
+    def _aggregate_feature_importance(self) -> List[Tuple[str, float]]:
+        """Weighted average of the base models' importances, sorted descending"""
+        self._ensure_native()
+        
         # Get importance from each model
         xgb_importance = dict(self.xgboost.get_feature_importance())
         lgb_importance = dict(self.lightgbm.get_feature_importance())
@@ -173,61 +455,316 @@ class EnsembleModel(BaseModel):
         if not self.is_trained:
             raise ValueError("Ensemble not trained yet")
         
-        xgb_proba = self.xgboost.predict_proba(X)
-        lgb_proba = self.lightgbm.predict_proba(X)
+        return self._blend(self._model_probabilities(as_feature_matrix(X)))
+    
+    def compile_backend(self) -> bool:
+        """
+        Compile both boosters into one FusedEnsemble for the fast backend
+        
+        Each compiled model is checked against its native library on a
+        probe set; on any mismatch the ensemble stays on native inference.
+        
+        Returns:
+            True if the flat backend is available
+        """
+        if not self.is_trained:
+            raise ValueError("Ensemble not trained yet")
+        
+        self._ensure_native()
+        
+        try:
+            fused = FusedEnsemble.from_forests({
+                "xgboost": self.xgboost.compile_forest(),
+                "lightgbm": self.lightgbm.compile_forest()
+            })
+            
+            probe = parity_probe(len(FEATURE_NAMES))
+            for group, name in enumerate(fused.model_names):
+                native_proba = getattr(self, name).predict_proba(probe)
+                matches, max_diff = check_parity(fused.forest, native_proba, probe, group=group)
+                if not matches:
+                    raise ValueError(f"compiled {name} differs from native by {max_diff:.2e}")
+            
+        except Exception as e:
+            logger.error(f"Flat backend unavailable, using native inference: {e}")
+            self._fused = False
+            return False
+        
+        self._fused = fused
+        logger.info(f"Compiled fused forest: {fused.forest.n_trees} trees")
+        return True
+    
+    def _model_probabilities(self, X: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Default probability from each base model, each run exactly once
+        
+        On the flat backend a single pass over the fused forest scores
+        both boosters.
+        """
+        use_flat = self.backend == "flat" or (
+            self.backend == "auto" and len(X) <= FLAT_BACKEND_MAX_ROWS
+        )
+        
+        if use_flat and self._fused is None:
+            self.compile_backend()
+        
+        if use_flat and self._fused:
+            probas = self._fused.predict_proba(X)
+            model_probabilities = {
+                name: probas[:, i] for i, name in enumerate(self._fused.model_names)
+            }
+        else:
+            self._ensure_native()
+            model_probabilities = {
+                "xgboost": self.xgboost.predict_proba(X),
+                "lightgbm": self.lightgbm.predict_proba(X)
+            }
+        
+        # Add neural net if available
+        if self.use_neural_net and self.neural_net:
+            model_probabilities["neural_net"] = self.neural_net.predict_proba(X)
+        
+        return model_probabilities
+    
+    def _blend(self, model_probabilities: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Weighted contribution per model, plus their sum as the ensemble probability"""
+        contributions = {
+            name: proba * self.weights[name] for name, proba in model_probabilities.items()
+        }
+        contributions["ensemble"] = sum(contributions.values())
+        return contributions
+    
+    def save(self, model_dir: str) -> str:
+        """
+        Save ensemble to disk as an artifact directory
+        
+        Boosters are stored in their native formats and the compiled
+        forest as .npy arrays (see ARTIFACT_FORMAT_VERSION for the layout),
+        so loading needs no unpickling and the forest can be memory-mapped.
+        The directory is written aside and renamed into place.
         
+        Args:
+            model_dir: Directory to save model
+        
+        Returns:
+            Path to the artifact directory
+        """
+        if not self.is_trained:
+            raise ValueError(f"{self.model_name} not trained yet")
+        
+        self._ensure_native()
+        if self._fused is None:
+            self.compile_backend()
+        
+        artifact_dir = Path(model_dir) / f"{self.model_name}_v{self.version}"
+        staging_dir = artifact_dir.with_name(f".{artifact_dir.name}.tmp")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        staging_dir.mkdir(parents=True)
+        
+        components = {}
+        for name, model in self._components().items():
+            file_name = f"{name}{model.native_extension}"
+            model.save_native(str(staging_dir / file_name))
+            components[name] = {"file": file_name, "metadata": model.metadata}
+        
+        # Only a parity-checked forest is saved; without one, loading
+        # falls back to compiling (or native inference)
+        if self._fused:
+            self._fused.save(str(staging_dir / "fused"))
+        
+        manifest = {
+            "format_version": ARTIFACT_FORMAT_VERSION,
+            "model_name": self.model_name,
+            "version": self.version,
+            "weights": self.weights,
+            "use_neural_net": self.use_neural_net,
+            "components": components,
+            "fused": "fused" if self._fused else None,
+            "feature_importance": [
+                [feature, float(importance)] for feature, importance in self.get_feature_importance()
+            ],
+            "metadata": self.metadata
+        }
+        with open(staging_dir / MANIFEST_FILE, 'w') as f:
+            json.dump(manifest, f, indent=2, default=str)
+        
+        # Swap directories so readers never see a partially written artifact
+        previous_dir = artifact_dir.with_name(f".{artifact_dir.name}.old")
+        shutil.rmtree(previous_dir, ignore_errors=True)
+        if artifact_dir.exists():
+            artifact_dir.rename(previous_dir)
+        staging_dir.rename(artifact_dir)
+        shutil.rmtree(previous_dir, ignore_errors=True)
+        
+        logger.info(f"Ensemble v{self.version} saved to {artifact_dir}")
+        
+        return str(artifact_dir)
+    
+    def load(self, model_path: str) -> 'EnsembleModel':
+        """
+        Load ensemble from an artifact directory written by save()
+        
+        The compiled forest is memory-mapped and serves immediately; the
+        native boosters are only loaded on first use (large batches,
+        recompiling, re-saving).
+        
+        Args:
+            model_path: Artifact directory
+        
+        Returns:
+            Self (for chaining)
+        """
+        artifact_dir = Path(model_path)
+        with open(artifact_dir / MANIFEST_FILE, 'r') as f:
+            manifest = json.load(f)
+        
+        if manifest["format_version"] > ARTIFACT_FORMAT_VERSION:
+            raise ValueError(
+                f"Artifact format v{manifest['format_version']} is newer than "
+                f"supported (v{ARTIFACT_FORMAT_VERSION})"
+            )
+        
+        self.metadata = manifest["metadata"]
+        check_schema_version(self.metadata.get("feature_schema_version"), self.model_name)
+        
+        self.weights = manifest["weights"]
+        self.use_neural_net = manifest["use_neural_net"]
+        self.feature_names = list(FEATURE_NAMES)
+        self._importance = [tuple(item) for item in manifest["feature_importance"]]
+        self._native_pending = (artifact_dir, manifest["components"])
+        
+        # The neural net is plain NumPy arrays: always loaded right away
+        self.neural_net = None
+        if "neural_net" in manifest["components"]:
+            component = manifest["components"]["neural_net"]
+            self.neural_net = NeuralNetModel(version=self.version).load_native(
+                str(artifact_dir / component["file"]), component["metadata"]
+            )
+        
+        if manifest["fused"]:
+            self._fused = FusedEnsemble.load(str(artifact_dir / manifest["fused"]))
+        else:
+            self._fused = None
+            self._ensure_native()
+        
+        self.is_trained = True
+        
+        logger.info(f"Ensemble v{self.version} loaded from {artifact_dir}")
+        
+        return self
+    
+    def _components(self) -> Dict[str, BaseModel]:
+        """Base models stored in the artifact, by name"""
+        components = self._boosters()
+        if self.use_neural_net and self.neural_net is not None:
+            components["neural_net"] = self.neural_net
+        return components
+    
+    def _boosters(self) -> Dict[str, BaseModel]:
+        """Tree models (compiled into the fused forest, loaded lazily), by name"""
+        return {"xgboost": self.xgboost, "lightgbm": self.lightgbm}
+    
+    def _ensure_native(self) -> None:
+        """Load the native boosters of a loaded artifact if not done yet"""
+        if self._native_pending is None:
+            return
+        
+        with _NATIVE_LOAD_LOCK:
+            if self._native_pending is None:
+                return
+            
+            artifact_dir, components = self._native_pending
+            for name, model in self._boosters().items():
+                component = components[name]
+                model.load_native(str(artifact_dir / component["file"]), component["metadata"])
+            
+            self._native_pending = None
+            logger.info(f"Native boosters loaded from {artifact_dir}")
+    
+    def booster_info(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Name, version and state of each booster, by name
+        
+        Does not force the lazy native load: boosters still pending in a
+        loaded artifact are trained (the compiled forest serves them), with
+        native_loaded False until first native use.
+        """
+        pending = self._native_pending is not None
         return {
-            "xgboost": xgb_proba * self.weights["xgboost"],
-            "lightgbm": lgb_proba * self.weights["lightgbm"],
-            "ensemble": self.predict_proba(X)
+            name: {
+                "name": model.model_name,
+                "version": model.version,
+                "is_trained": model.is_trained or pending,
+                "native_loaded": model.is_trained and not pending
+            }
+            for name, model in self._boosters().items()
         }
     
     def optimize_weights(
         self,
         X_val: pd.DataFrame,
         y_val: np.ndarray,
-        metric: str = "auc"
+        metric: str = "auc",
+        method: str = "grid"
     ) -> Dict[str, float]:
         """
         Optimize ensemble weights using validation set
         
-        Uses grid search to find best weight combination.
-        Note: This is a simple implementation. Could use scipy.optimize instead.
-        """
-        from sklearn.metrics import roc_auc_score
-        
-        logger.info("Optimizing ensemble weights...")
-        
-        best_weights = self.weights.copy()
-        best_score = 0
-        
-        # Grid search over weight combinations
-        for xgb_weight in np.arange(0.2, 0.7, 0.1):
-            for lgb_weight in np.arange(0.2, 0.7, 0.1):
-                if xgb_weight + lgb_weight > 1.0:
-                    continue
-                
-                # Set weights
-                temp_weights = {
-                    "xgboost": xgb_weight,
-                    "lightgbm": lgb_weight,
-                    "neural_net": 1.0 - xgb_weight - lgb_weight
-                }
-                
-                # Calculate ensemble prediction
-                ensemble_proba = (
-                    self.xgboost.predict_proba(X_val) * temp_weights["xgboost"] +
-                    self.lightgbm.predict_proba(X_val) * temp_weights["lightgbm"]
-                )
-                
-                # Evaluate
-                score = roc_auc_score(y_val, ensemble_proba)
-                
-                if score > best_score:
-                    best_score = score
-                    best_weights = temp_weights
-        
-        logger.info(f"Optimized weights: {best_weights} (AUC: {best_score:.4f})")
-        
-        self.weights = best_weights
-        return best_weights
+        Each base model predicts the validation set once; every candidate
+        is then scored from those probabilities (see weight_optimizer).
+        
+        Args:
+            X_val: Validation features
+            y_val: Validation labels
+            metric: Only "auc" is supported
+            method: "grid" (0.2-0.6 per booster in steps of 0.1, the neural
+                net taking the remainder) or "simplex" (grid, then a
+                continuous Nelder-Mead search from the best grid point)
+        
+        Returns:
+            Optimized weights (also applied to the ensemble)
+        """
+        if metric != "auc":
+            raise ValueError(f"Unsupported metric: {metric}")
+        if method not in ("grid", "simplex"):
+            raise ValueError(f"Unknown optimization method: {method}")
+        
+        self._ensure_native()
+        logger.info(f"Optimizing ensemble weights ({method})...")
+        
+        # Native inference, once per base model
+        X_val = as_feature_matrix(X_val)
+        model_names = ["xgboost", "lightgbm"]
+        probabilities = [self.xgboost.predict_proba(X_val), self.lightgbm.predict_proba(X_val)]
+        if self.use_neural_net and self.neural_net:
+            model_names.append("neural_net")
+            probabilities.append(self.neural_net.predict_proba(X_val))
+        probabilities = np.column_stack(probabilities)
+        
+        # Grid over booster weights; the remainder goes to the neural net
+        grid = np.arange(0.2, 0.7, 0.1)
+        candidates = np.array([
+            (xgb_weight, lgb_weight, 1.0 - xgb_weight - lgb_weight)
+            for xgb_weight in grid
+            for lgb_weight in grid
+            if xgb_weight + lgb_weight <= 1.0
+        ])[:, :len(model_names)]
+        
+        scores = evaluate_candidates(probabilities, y_val, candidates)
+        best = int(np.argmax(scores))  # First best, like the sequential grid
+        best_weights, best_score = candidates[best], float(scores[best])
+        
+        if method == "simplex":
+            best_weights, best_score = optimize_simplex(probabilities, y_val, best_weights)
+        
+        # Weights of the models actually blended sum to 1, so the ensemble
+        # output stays a probability
+        best_weights = best_weights / best_weights.sum()
+        optimized = {name: 0.0 for name in self.weights}
+        optimized.update({name: float(w) for name, w in zip(model_names, best_weights)})
+        
+        logger.info(f"Optimized weights: {optimized} (AUC: {best_score:.4f})")
+        
+        self.weights = optimized
+        self._importance = None  # Aggregated importances are weight-dependent
+        return optimized
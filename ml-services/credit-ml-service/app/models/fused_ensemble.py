@@ -0,0 +1,66 @@
+"""
+Fused Ensemble
+
+XGBoost and LightGBM trees merged into one compiled forest, so a single
+traversal yields every base model's probability.
+
+Each base model is one output group of the forest. Its link (sigmoid
+scale) is folded into the leaf values; the ensemble weights apply after
+the sigmoid, because the ensemble averages probabilities, not margins.
+Blending is left to EnsembleModel, which also weighs in the neural net.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .tree_compiler import FlatForest, concatenate_forests
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FusedEnsemble:
+    """Several tree models compiled into one forest, one output group each"""
+
+    forest: FlatForest           # One output group per model, in model_names order
+    model_names: Tuple[str, ...]
+
+    @classmethod
+    def from_forests(cls, forests: Dict[str, FlatForest]) -> 'FusedEnsemble':
+        """
+        Fuse single-group forests into one artifact
+
+        Args:
+            forests: Compiled forest per model name
+        """
+        model_names = tuple(forests)
+        return cls(
+            forest=concatenate_forests([forests[name] for name in model_names]),
+            model_names=model_names
+        )
+
+    def save(self, directory: str) -> None:
+        """Write the forest arrays plus fused.json (model names)"""
+        self.forest.save(directory)
+        with open(Path(directory) / "fused.json", 'w') as f:
+            json.dump({"model_names": list(self.model_names)}, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: Optional[str] = "r") -> 'FusedEnsemble':
+        """Load an ensemble written by save(), memory-mapping the forest by default"""
+        with open(Path(directory) / "fused.json", 'r') as f:
+            header = json.load(f)
+
+        return cls(
+            forest=FlatForest.load(directory, mmap_mode=mmap_mode),
+            model_names=tuple(header["model_names"])
+        )
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Probability per model, float64 [n_rows, n_models]"""
+        return self.forest.predict_proba(X)
@@ -13,11 +13,16 @@ Best for:
 import lightgbm as lgb
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from pathlib import Path
+import os
 import logging
 
-from .base_model import BaseModel
+from .base_model import BaseModel, TRAIN_METRICS_MAX_ROWS, data_fingerprint
+from .streaming import ChunkSequence, RowChunks, peak_rss_mb, reset_peak_rss
+from .tree_compiler import FlatForest, compile_lightgbm
+from app.features.schema import FEATURE_NAMES, FEATURE_SCHEMA_VERSION, as_feature_matrix
 
 logger = logging.getLogger(__name__)
 
@@ -30,12 +35,21 @@ class LightGBMModel(BaseModel):
     - Faster training
     - Lower memory usage
     - Native categorical support
+    
+    LGBMClassifier is only used for fitting; predictions, importances and
+    the saved model all go through the underlying Booster, which is also
+    what a model loaded from LightGBM's text format provides.
     """
     
+    # LightGBM's text model format
+    native_extension = ".txt"
+    
     def __init__(
         self,
         version: str = "1.0.0",
-        hyperparameters: Dict[str, Any] = None
+        hyperparameters: Dict[str, Any] = None,
+        early_stopping_rounds: int = 30,
+        early_stopping_min_delta: float = 1e-4
     ):
         super().__init__(model_name="lightgbm", version=version)
         
@@ -50,13 +64,21 @@ class LightGBMModel(BaseModel):
             "reg_alpha": 0.1,                  # L1 regularization
             "reg_lambda": 0.1,                 # L2 regularization
             "objective": "binary",
-            "metric": "auc",
+            "metric": ["binary_logloss", "auc"],  # Logloss (first) drives early stopping
             "random_state": 42,
             "n_jobs": -1,
             "verbose": -1,
         }
         
+        # Stop when validation logloss has not improved by min_delta for this
+        # many rounds (only when a validation set is given; n_estimators is
+        # the cap). AUC only measures ranking and peaks within a few trees,
+        # long before the probabilities reach the risk thresholds.
+        self.early_stopping_rounds = early_stopping_rounds
+        self.early_stopping_min_delta = early_stopping_min_delta
+        
         self.model = lgb.LGBMClassifier(**self.params)
+        self.booster: lgb.Booster = None  # Set once trained or loaded
         logger.info(f"LightGBM model initialized with params: {self.params}")
     
     def train(
@@ -70,35 +92,159 @@ class LightGBMModel(BaseModel):
         
         logger.info(f"Training LightGBM on {len(X_train)} samples...")
         
-        self.feature_names = list(X_train.columns)
+        # Compile against the frozen feature schema (fixed column order)
+        X_train = as_feature_matrix(X_train)
+        self.feature_names = list(FEATURE_NAMES)
         
         # Prepare evaluation set
         eval_set = None
         if X_val is not None and y_val is not None:
+            X_val = as_feature_matrix(X_val)
             eval_set = [(X_val, y_val)]
         
+        n_estimators, checkpoint, resume_from = self._resume_state(
+            data_fingerprint(X_train, y_train)
+        )
+        
+        self.model = lgb.LGBMClassifier(**{**self.params, "n_estimators": n_estimators})
+        
         # Train model
         self.model.fit(
             X_train,
             y_train,
             eval_set=eval_set,
-            eval_metric='auc',
+            callbacks=self._callbacks(eval_set is not None, checkpoint),
+            init_model=resume_from,
         )
         
+        if checkpoint is not None:
+            checkpoint.unlink(missing_ok=True)
+        
+        self.booster = self.model.booster_
+        return self._finish_training(len(X_train), X_train, y_train, X_val, y_val)
+    
+    def train_streaming(
+        self,
+        chunks: RowChunks,
+        X_val: pd.DataFrame = None,
+        y_val: np.ndarray = None
+    ) -> Dict[str, Any]:
+        """
+        Train out of core from row chunks on disk (see app.models.streaming)
+        
+        The training Dataset is built from a Sequence: bin boundaries from
+        a row sample, then rows binned chunk by chunk, so the raw matrix is
+        never materialized. The validation set is small and held in memory.
+        Early stopping and checkpoints work as in train().
+        
+        The fitted Booster is also what `model` holds (the legacy pickle
+        format stores it instead of an LGBMClassifier). Peak resident
+        memory of the run is stored as metadata["peak_rss_mb"].
+        """
+        logger.info(
+            f"Training LightGBM on {chunks.n_rows} samples streamed in "
+            f"{chunks.n_chunks} chunks of {chunks.chunk_rows} rows..."
+        )
+        reset_peak_rss()
+        self.feature_names = list(FEATURE_NAMES)
+        
+        params = {name: value for name, value in self.params.items() if name != "n_estimators"}
+        train_set = lgb.Dataset(
+            ChunkSequence(chunks),
+            label=chunks.labels,
+            params=params,
+            free_raw_data=True
+        )
+        
+        valid_sets = []
+        if X_val is not None and y_val is not None:
+            X_val = as_feature_matrix(X_val)
+            valid_sets = [lgb.Dataset(X_val, label=y_val, reference=train_set)]
+        
+        n_estimators, checkpoint, resume_from = self._resume_state(chunks.fingerprint())
+        
+        self.booster = lgb.train(
+            params,
+            train_set,
+            num_boost_round=n_estimators,
+            valid_sets=valid_sets,
+            callbacks=self._callbacks(bool(valid_sets), checkpoint),
+            init_model=resume_from
+        )
+        self.model = self.booster
+        del train_set
+        
+        if checkpoint is not None:
+            checkpoint.unlink(missing_ok=True)
+        
+        X_head, y_head = chunks.head(TRAIN_METRICS_MAX_ROWS)
+        self._finish_training(chunks.n_rows, X_head, y_head, X_val, y_val)
+        
+        self.metadata["peak_rss_mb"] = round(peak_rss_mb(), 1)
+        logger.info(f"Peak resident memory: {self.metadata['peak_rss_mb']:.0f} MB")
+        
+        return self.metadata
+    
+    def _resume_state(self, data_key: str) -> Tuple[int, Optional[Path], Optional[str]]:
+        """Rounds left to train, checkpoint path and the model file to resume from, if any"""
+        n_estimators = self.params.get("n_estimators", 100)
+        checkpoint = self._checkpoint_path(data_key)
+        resume_from = None
+        
+        # Resume from a checkpoint of an interrupted run, if any
+        if checkpoint is not None and checkpoint.exists():
+            resume_from = str(checkpoint)
+            completed = lgb.Booster(model_file=resume_from).current_iteration()
+            n_estimators = max(n_estimators - completed, 0)
+            logger.info(f"Resuming from checkpoint {checkpoint} ({completed} rounds done)")
+        
+        return n_estimators, checkpoint, resume_from
+    
+    def _callbacks(self, has_validation: bool, checkpoint: Optional[Path]) -> List:
+        """Early stopping (needs a validation set) and checkpointing callbacks"""
+        callbacks = []
+        if has_validation and self.early_stopping_rounds:
+            callbacks.append(lgb.early_stopping(
+                self.early_stopping_rounds,
+                first_metric_only=True,
+                verbose=False,
+                min_delta=self.early_stopping_min_delta
+            ))
+        if checkpoint is not None:
+            callbacks.append(_checkpoint_callback(checkpoint, self.checkpoint_interval))
+        return callbacks
+    
+    def _finish_training(
+        self,
+        n_samples: int,
+        X_train: np.ndarray,
+        y_train: np.ndarray,
+        X_val: np.ndarray = None,
+        y_val: np.ndarray = None
+    ) -> Dict[str, Any]:
+        """Record metadata and train/validation metrics of the fitted booster"""
         self.is_trained = True
         self.metadata["trained_at"] = datetime.now().isoformat()
-        self.metadata["train_samples"] = len(X_train)
+        self.metadata["train_samples"] = n_samples
         self.metadata["n_features"] = X_train.shape[1]
+        self.metadata["feature_schema_version"] = FEATURE_SCHEMA_VERSION
+        self.metadata["best_iteration"] = self.booster.best_iteration or None
+        self.metadata["n_trees"] = self.booster.best_iteration or self.booster.current_iteration()
+        
+        logger.info(
+            f"Fitted {self.metadata['n_trees']} trees "
+            f"(best iteration: {self.metadata['best_iteration']})"
+        )
         
-        # Training metrics
-        train_metrics = self.validate(X_train, y_train)
+        # Training-set metrics on a subsample (a full pass is a second inference run)
+        train_metrics = self.evaluate("train", X_train, y_train, max_rows=TRAIN_METRICS_MAX_ROWS)
         self.metadata["train_metrics"] = train_metrics
         
         logger.info(f"Training complete. Train AUC: {train_metrics['auc']:.4f}")
         
         # Validation metrics
         if X_val is not None and y_val is not None:
-            val_metrics = self.validate(X_val, y_val)
+            val_metrics = self.evaluate("val", X_val, y_val)
             self.metadata["val_metrics"] = val_metrics
             logger.info(f"Validation AUC: {val_metrics['auc']:.4f}")
         
@@ -109,23 +255,63 @@ class LightGBMModel(BaseModel):
         if not self.is_trained:
             raise ValueError("Model not trained yet")
         
-        return self.model.predict(X)
+        # Same decision rule as LGBMClassifier.predict (argmax of [1 - p, p])
+        return (self.predict_proba(X) > 0.5).astype(int)
     
     def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
         """Generate probability estimates"""
         if not self.is_trained:
             raise ValueError("Model not trained yet")
         
-        # Return probability of default (class 1)
-        probas = self.model.predict_proba(X)
-        return probas[:, 1]
+        # Binary objective: the booster returns the probability of default
+        # (class 1), up to the best iteration when early stopping was used
+        return self.booster.predict(as_feature_matrix(X))
+    
+    def predict_contributions(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Per-row feature contributions (exact TreeSHAP, native implementation)
+        
+        Returns:
+            float64 array [n_rows, n_features + 1] in log-odds units; the
+            last column is the bias, and each row sums to the raw margin
+        """
+        if not self.is_trained:
+            raise ValueError("Model not trained yet")
+        
+        return self.booster.predict(as_feature_matrix(X), pred_contrib=True)
+    
+    def compile_forest(self) -> FlatForest:
+        """Compile the trained booster into flat arrays (see tree_compiler)"""
+        if not self.is_trained:
+            raise ValueError("Model not trained yet")
+        
+        # Like predict_proba, compiles up to the best iteration
+        return compile_lightgbm(self.booster)
+    
+    def load(self, model_path: str) -> 'LightGBMModel':
+        """Load a pickled LGBMClassifier or Booster (legacy format)"""
+        super().load(model_path)
+        # Streamed training pickles the Booster itself
+        self.booster = getattr(self.model, "booster_", self.model)
+        return self
+    
+    def _save_native_model(self, path: str) -> None:
+        # Saves up to the best iteration when early stopping was used
+        self.booster.save_model(path)
+    
+    def _load_native_model(self, path: str) -> None:
+        # As after streamed training, `model` is the Booster itself, so
+        # save() and pickling round-trip through load()
+        self.booster = lgb.Booster(model_file=path)
+        self.model = self.booster
     
     def get_feature_importance(self) -> List[Tuple[str, float]]:
         """Get feature importance from LightGBM"""
         if not self.is_trained:
             raise ValueError("Model not trained yet")
         
-        importance = self.model.feature_importances_
+        # Split counts, like LGBMClassifier.feature_importances_
+        importance = self.booster.feature_importance(importance_type="split")
         
         feature_importance = sorted(
             zip(self.feature_names, importance),
@@ -134,3 +320,17 @@ class LightGBMModel(BaseModel):
         )
         
         return feature_importance
+
+
+def _checkpoint_callback(path: Path, interval: int):
+    """Callback saving the booster every `interval` rounds, replacing the previous checkpoint"""
+    interval = max(1, interval)
+    
+    def _callback(env: lgb.callback.CallbackEnv) -> None:
+        if (env.iteration + 1) % interval == 0:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            partial = path.with_name(f".{path.name}")
+            env.model.save_model(str(partial), num_iteration=-1)
+            os.replace(partial, path)
+    
+    return _callback
@@ -0,0 +1,191 @@
+"""
+Model Store
+
+Holds the ensemble used for serving and swaps it atomically on reload.
+
+A new model is always built and warmed off to the side; requests keep
+using the current model until the single reference is replaced, so a
+reload or version promotion never leaves the service without a model.
+
+Sources:
+- disk: artifact directory {MODEL_DIR}/ensemble_v{MODEL_VERSION}/ (default)
+- mlflow: registered model MLFLOW_MODEL_NAME at stage MLFLOW_MODEL_STAGE
+"""
+
+import os
+import threading
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from .ensemble import EnsembleModel, MANIFEST_FILE
+from app.features.schema import empty_feature_matrix
+
+logger = logging.getLogger(__name__)
+
+
+class ModelStore:
+    """
+    Serving-side owner of the current ensemble
+
+    Readers only dereference `current`; all loading happens on a
+    background thread or in reload(), which is serialized by a lock.
+    """
+
+    def __init__(
+        self,
+        model_dir: Optional[str] = None,
+        version: Optional[str] = None,
+        source: Optional[str] = None
+    ):
+        self.model_dir = model_dir or os.getenv("MODEL_DIR", "./models")
+        self.version = version or os.getenv("MODEL_VERSION", "1.0.0")
+        self.source = (source or os.getenv("MODEL_SOURCE", "disk")).lower()
+        self.mlflow_model_name = os.getenv("MLFLOW_MODEL_NAME", "ensemble_credit_scoring")
+        self.mlflow_model_stage = os.getenv("MLFLOW_MODEL_STAGE", "Production")
+
+        self._model: Optional[EnsembleModel] = None
+        self._reload_lock = threading.Lock()
+        self._loader: Optional[threading.Thread] = None
+
+        self.status = "not_loaded"
+        self.loaded_at: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def current(self) -> Optional[EnsembleModel]:
+        """Model currently serving requests (None until the first load attempt completes)"""
+        return self._model
+
+    def start_background_load(self) -> threading.Thread:
+        """Load the configured model on a daemon thread (used at startup)"""
+        self._loader = threading.Thread(
+            target=self._background_load,
+            name="model-loader",
+            daemon=True
+        )
+        self._loader.start()
+        return self._loader
+
+    def reload(self, version: Optional[str] = None) -> EnsembleModel:
+        """
+        Build, warm and swap in a model
+
+        The current model keeps serving until the new one is ready. On
+        failure the current model is left in place and the error is raised;
+        if no model has loaded yet, an untrained ensemble (rule-based
+        fallback) is installed first.
+
+        Args:
+            version: Model version to load (defaults to the configured one)
+
+        Returns:
+            The model now serving requests
+        """
+        with self._reload_lock:
+            target_version = version or self.version
+            previous_status = self.status
+            self.status = "loading" if self._model is None else "reloading"
+
+            try:
+                model = self._build_model(target_version)
+                self._warm(model)
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                if self._model is not None:
+                    self.status = previous_status
+                else:
+                    # Nothing has loaded yet: serve the rule-based fallback
+                    # rather than failing every request
+                    self._model = EnsembleModel(version=target_version, use_neural_net=False)
+                    self.status = "fallback"
+                    self.loaded_at = datetime.now().isoformat()
+                    logger.warning(f"Model load failed, serving untrained model: {e}")
+                raise
+
+            # Single reference assignment: in-flight requests finish on the
+            # model they already hold, new requests see the new one
+            self._model = model
+            self.version = target_version
+            self.status = "ready"
+            self.loaded_at = datetime.now().isoformat()
+            self.last_error = None
+
+            logger.info(
+                f"Serving ensemble v{model.version} "
+                f"({'trained' if model.is_trained else 'untrained, rule-based fallback'})"
+            )
+            return model
+
+    def get_status(self) -> Dict[str, Any]:
+        """Loading state for health checks"""
+        model = self._model
+        return {
+            "status": self.status,
+            "source": self.source,
+            "version": model.version if model is not None else self.version,
+            "loaded_at": self.loaded_at,
+            "last_error": self.last_error,
+            "models_loaded": {
+                # Boosters of an artifact may load lazily; a trained ensemble always has both
+                "xgboost": model is not None and model.is_trained,
+                "lightgbm": model is not None and model.is_trained,
+                "neural_net": model is not None and model.neural_net is not None,
+                "ensemble": model is not None and model.is_trained
+            }
+        }
+
+    def _background_load(self) -> None:
+        try:
+            self.reload()
+        except Exception as e:
+            logger.error(f"Background model load failed: {e}", exc_info=True)
+
+    def _build_model(self, version: str) -> EnsembleModel:
+        """Load a model from the configured source without touching `current`"""
+        if self.source == "mlflow":
+            return self._load_from_mlflow()
+
+        artifact_dir = Path(self.model_dir) / f"ensemble_v{version}"
+        model = EnsembleModel(version=version, use_neural_net=False)
+
+        if (artifact_dir / MANIFEST_FILE).exists():
+            logger.info(f"Loading ensemble from {artifact_dir}...")
+            return model.load(str(artifact_dir))
+
+        # Never replace a trained model with an untrained one
+        current = self._model
+        if current is not None and current.is_trained:
+            raise FileNotFoundError(f"No saved ensemble at {artifact_dir}")
+
+        # Keep serving (rule-based fallback) until a trained model is deployed
+        logger.warning(f"No saved ensemble at {artifact_dir} - serving untrained model")
+        return model
+
+    def _load_from_mlflow(self) -> EnsembleModel:
+        # Imported lazily: MLflow is only needed when it is the model source
+        from app.mlops.mlflow_client import MLflowManager
+
+        logger.info(
+            f"Loading {self.mlflow_model_name} from MLflow ({self.mlflow_model_stage})..."
+        )
+        model = MLflowManager().load_model(self.mlflow_model_name, stage=self.mlflow_model_stage)
+
+        if not isinstance(model, EnsembleModel):
+            raise ValueError(
+                f"MLflow model {self.mlflow_model_name} is {type(model).__name__}, expected EnsembleModel"
+            )
+        return model
+
+    @staticmethod
+    def _warm(model: EnsembleModel) -> None:
+        """Run one dummy prediction so the first real request pays no warm-up cost"""
+        if not model.is_trained:
+            return
+
+        model.score(empty_feature_matrix(1))
+
+
+# Singleton instance
+model_store = ModelStore()
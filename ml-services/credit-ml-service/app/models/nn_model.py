@@ -0,0 +1,204 @@
+"""
+Neural Network Model Implementation
+
+Small feed-forward network (MLP) on the frozen feature matrix.
+Typically a little below the boosters alone, but its errors are less
+correlated with theirs, which helps the ensemble.
+
+Training uses scikit-learn's MLPClassifier; serving is a pure-NumPy
+float32 forward pass over the saved weights (one GEMM per layer for the
+whole batch), so no ML framework is imported at inference time.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Tuple
+from datetime import datetime
+from pathlib import Path
+import json
+import logging
+
+from .base_model import BaseModel, TRAIN_METRICS_MAX_ROWS
+from app.features.schema import FEATURE_NAMES, FEATURE_SCHEMA_VERSION, as_feature_matrix
+
+logger = logging.getLogger(__name__)
+
+
+class NeuralNetModel(BaseModel):
+    """
+    MLP credit scoring model
+    
+    Inputs are standardized with training-set statistics; missing values
+    are imputed with the training mean. Hidden layers use ReLU and the
+    output a sigmoid.
+    """
+    
+    # NumPy archive of the layer weights and input scaling
+    native_extension = ".npz"
+    
+    def __init__(
+        self,
+        version: str = "1.0.0",
+        hyperparameters: Dict[str, Any] = None
+    ):
+        super().__init__(model_name="neural_net", version=version)
+        
+        self.params = hyperparameters or {
+            "hidden_layer_sizes": (64, 32),
+            "activation": "relu",
+            "alpha": 1e-4,                     # L2 regularization
+            "batch_size": 256,
+            "learning_rate_init": 1e-3,
+            "max_iter": 200,
+            "early_stopping": True,            # Holds out 10% of train for stopping
+            "n_iter_no_change": 10,
+            "random_state": 42,
+        }
+        
+        # Serving state (float32): per-layer weights and biases, input scaling
+        self.layer_weights: List[np.ndarray] = []
+        self.layer_biases: List[np.ndarray] = []
+        self.input_mean: np.ndarray = None
+        self.input_scale: np.ndarray = None
+        
+        logger.info(f"Neural net model initialized with params: {self.params}")
+    
+    def train(
+        self,
+        X_train: pd.DataFrame,
+        y_train: np.ndarray,
+        X_val: pd.DataFrame = None,
+        y_val: np.ndarray = None
+    ) -> Dict[str, Any]:
+        """Train the MLP"""
+        # Training-only dependency
+        from sklearn.neural_network import MLPClassifier
+        
+        logger.info(f"Training neural net on {len(X_train)} samples...")
+        
+        X_train = as_feature_matrix(X_train)
+        self.feature_names = list(FEATURE_NAMES)
+        
+        # Constant (or all-missing) columns are left unscaled
+        std = np.nanstd(X_train, axis=0)
+        scale = np.ones_like(std)
+        np.divide(1.0, std, out=scale, where=std > 0)
+        self.input_mean = np.nan_to_num(np.nanmean(X_train, axis=0)).astype(np.float32)
+        self.input_scale = scale.astype(np.float32)
+        
+        classifier = MLPClassifier(**self.params)
+        classifier.fit(self._standardize(X_train), y_train)
+        
+        self.layer_weights = [np.ascontiguousarray(w, dtype=np.float32) for w in classifier.coefs_]
+        self.layer_biases = [np.ascontiguousarray(b, dtype=np.float32) for b in classifier.intercepts_]
+        
+        self.is_trained = True
+        self.metadata["trained_at"] = datetime.now().isoformat()
+        self.metadata["train_samples"] = len(X_train)
+        self.metadata["n_features"] = X_train.shape[1]
+        self.metadata["n_iterations"] = int(classifier.n_iter_)
+        self.metadata["feature_schema_version"] = FEATURE_SCHEMA_VERSION
+        
+        train_metrics = self.evaluate("train", X_train, y_train, max_rows=TRAIN_METRICS_MAX_ROWS)
+        self.metadata["train_metrics"] = train_metrics
+        
+        logger.info(f"Training complete. Train AUC: {train_metrics['auc']:.4f}")
+        
+        if X_val is not None and y_val is not None:
+            val_metrics = self.evaluate("val", X_val, y_val)
+            self.metadata["val_metrics"] = val_metrics
+            logger.info(f"Validation AUC: {val_metrics['auc']:.4f}")
+        
+        return self.metadata
+    
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        """Generate binary predictions"""
+        return (self.predict_proba(X) > 0.5).astype(int)
+    
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        """Generate probability estimates (batched float32 forward pass)"""
+        if not self.is_trained:
+            raise ValueError("Model not trained yet")
+        
+        activations = self._standardize(as_feature_matrix(X))
+        last = len(self.layer_weights) - 1
+        
+        for i, (weights, bias) in enumerate(zip(self.layer_weights, self.layer_biases)):
+            activations = activations @ weights
+            activations += bias
+            if i < last:
+                np.maximum(activations, 0, out=activations)
+        
+        # Sigmoid in float64 to avoid overflow warnings on large logits
+        return 1.0 / (1.0 + np.exp(-activations[:, 0].astype(np.float64)))
+    
+    def get_feature_importance(self) -> List[Tuple[str, float]]:
+        """
+        Approximate importance: L1 norm of each input's first-layer weights
+        
+        Inputs are standardized, so weights are comparable across features.
+        Normalized to sum to 1.
+        """
+        if not self.is_trained:
+            raise ValueError("Model not trained yet")
+        
+        importance = np.abs(self.layer_weights[0]).sum(axis=1)
+        importance = importance / importance.sum()
+        
+        return sorted(
+            zip(self.feature_names, importance.tolist()),
+            key=lambda x: x[1],
+            reverse=True
+        )
+    
+    def _standardize(self, X: np.ndarray) -> np.ndarray:
+        """Scaled float32 copy of X, missing values at the training mean (0)"""
+        scaled = X - self.input_mean
+        scaled *= self.input_scale
+        np.nan_to_num(scaled, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+        return scaled
+    
+    def save(self, model_dir: str) -> str:
+        """Save weights as {model_name}_v{version}.npz plus metadata JSON"""
+        if not self.is_trained:
+            raise ValueError(f"{self.model_name} not trained yet")
+        
+        model_path = Path(model_dir)
+        model_path.mkdir(parents=True, exist_ok=True)
+        
+        model_file = model_path / f"{self.model_name}_v{self.version}{self.native_extension}"
+        self.save_native(str(model_file))
+        
+        metadata_file = model_path / f"{self.model_name}_v{self.version}_metadata.json"
+        with open(metadata_file, 'w') as f:
+            json.dump(self.metadata, f, indent=2, default=str)
+        
+        return str(model_file)
+    
+    def load(self, model_path: str) -> 'NeuralNetModel':
+        """Load a model written by save()"""
+        metadata = None
+        metadata_path = model_path.replace(self.native_extension, '_metadata.json')
+        if Path(metadata_path).exists():
+            with open(metadata_path, 'r') as f:
+                metadata = json.load(f)
+        
+        return self.load_native(model_path, metadata)
+    
+    def _save_native_model(self, path: str) -> None:
+        arrays = {"input_mean": self.input_mean, "input_scale": self.input_scale}
+        for i, (weights, bias) in enumerate(zip(self.layer_weights, self.layer_biases)):
+            arrays[f"weights_{i}"] = weights
+            arrays[f"bias_{i}"] = bias
+        
+        # np.savez appends .npz unless the name already ends with it
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+    
+    def _load_native_model(self, path: str) -> None:
+        with np.load(path) as archive:
+            n_layers = sum(1 for name in archive.files if name.startswith("weights_"))
+            self.layer_weights = [archive[f"weights_{i}"] for i in range(n_layers)]
+            self.layer_biases = [archive[f"bias_{i}"] for i in range(n_layers)]
+            self.input_mean = archive["input_mean"]
+            self.input_scale = archive["input_scale"]
@@ -0,0 +1,201 @@
+"""
+Streaming Training Data
+
+Out-of-core input for the boosters: a row range of an on-disk feature
+matrix (.npy, float32, schema layout) read one chunk at a time.
+
+- XGBoost consumes the chunks through a DataIter. QuantileDMatrix
+  quantizes each chunk into histogram bins as it arrives (about one byte
+  per value instead of four); with STREAM_EXTERNAL_MEMORY_DIR set, an
+  external-memory DMatrix pages the data to disk instead.
+- LightGBM consumes them through a Sequence: bin boundaries come from a
+  row sample, then rows are binned batch by batch.
+
+Chunks are read with plain file reads rather than a memory map, so rows
+already consumed do not stay resident in the process.
+
+Peak memory is read from the kernel's resident-set high-water mark
+(VmHWM), which can be reset on Linux to measure one training run. It is
+process-wide: models trained concurrently share one figure.
+"""
+
+import hashlib
+import logging
+import os
+import resource
+from typing import Optional, Tuple, Union
+
+import lightgbm as lgb
+import numpy as np
+import xgboost as xgb
+
+from app.features.schema import N_FEATURES
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "100000"))
+
+# Directory for XGBoost external-memory pages; unset keeps the quantized
+# matrix in memory (QuantileDMatrix)
+STREAM_EXTERNAL_MEMORY_DIR = os.getenv("STREAM_EXTERNAL_MEMORY_DIR") or None
+
+
+class RowChunks:
+    """
+    Rows [start, stop) of a .npy feature matrix and their labels, in chunks
+
+    Args:
+        features_path: float32 C-order .npy file of shape [n, N_FEATURES]
+        labels: Labels of the selected rows (small enough to hold in memory)
+        rows: Row range of the file to use (default: all rows)
+        chunk_rows: Rows per chunk (default STREAM_CHUNK_ROWS)
+    """
+
+    def __init__(
+        self,
+        features_path: str,
+        labels: np.ndarray,
+        rows: Optional[slice] = None,
+        chunk_rows: Optional[int] = None
+    ):
+        self.features_path = str(features_path)
+        self.chunk_rows = chunk_rows or STREAM_CHUNK_ROWS
+
+        with open(self.features_path, 'rb') as f:
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            self._data_offset = f.tell()
+
+        if dtype != np.float32 or fortran_order or len(shape) != 2 or shape[1] != N_FEATURES:
+            raise ValueError(
+                f"{self.features_path}: expected C-order float32 [n, {N_FEATURES}], "
+                f"got {dtype} {shape}{' (Fortran order)' if fortran_order else ''}"
+            )
+
+        self.start, self.stop, _ = (rows or slice(None)).indices(shape[0])
+        self.labels = np.asarray(labels, dtype=np.float32)
+        if len(self.labels) != self.n_rows:
+            raise ValueError(f"Got {len(self.labels)} labels for {self.n_rows} rows")
+
+    @property
+    def n_rows(self) -> int:
+        return self.stop - self.start
+
+    @property
+    def n_chunks(self) -> int:
+        return -(-self.n_rows // self.chunk_rows)
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """Feature rows [start, stop) of the range, float32 [stop - start, N_FEATURES]"""
+        start, stop = max(start, 0), min(stop, self.n_rows)
+        count = max(stop - start, 0)
+        row_bytes = N_FEATURES * np.dtype(np.float32).itemsize
+
+        return np.fromfile(
+            self.features_path,
+            dtype=np.float32,
+            count=count * N_FEATURES,
+            offset=self._data_offset + (self.start + start) * row_bytes
+        ).reshape(count, N_FEATURES)
+
+    def chunk(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(features, labels) of chunk `index`"""
+        start = index * self.chunk_rows
+        stop = min(start + self.chunk_rows, self.n_rows)
+        return self.read(start, stop), self.labels[start:stop]
+
+    def fingerprint(self) -> str:
+        """
+        Identity of the selected data, e.g. for keying training checkpoints
+
+        Hashes the file's path, size and modification time, the row range
+        and the labels; feature values are not read.
+        """
+        stat = os.stat(self.features_path)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(
+            f"{os.path.abspath(self.features_path)}:{stat.st_size}:{stat.st_mtime_ns}:"
+            f"{self.start}:{self.stop}".encode()
+        )
+        digest.update(self.labels.tobytes())
+        return digest.hexdigest()
+
+    def head(self, max_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(features, labels) of the first max_rows rows, e.g. for training-set metrics"""
+        stop = min(max_rows, self.n_rows)
+        return self.read(0, stop), self.labels[:stop]
+
+
+class ChunkDataIter(xgb.DataIter):
+    """XGBoost DataIter over RowChunks (one chunk per batch)"""
+
+    def __init__(self, chunks: RowChunks, cache_prefix: Optional[str] = None):
+        self._chunks = chunks
+        self._index = 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data) -> int:
+        if self._index == self._chunks.n_chunks:
+            return 0
+
+        X, y = self._chunks.chunk(self._index)
+        input_data(data=X, label=y)
+        self._index += 1
+        return 1
+
+    def reset(self) -> None:
+        self._index = 0
+
+
+class ChunkSequence(lgb.Sequence):
+    """LightGBM Sequence over RowChunks (batches of chunk_rows rows)"""
+
+    def __init__(self, chunks: RowChunks):
+        self._chunks = chunks
+        self.batch_size = chunks.chunk_rows
+
+    def __len__(self) -> int:
+        return self._chunks.n_rows
+
+    def __getitem__(self, index: Union[int, slice]) -> np.ndarray:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            rows = self._chunks.read(start, stop)
+            return rows[::step] if step != 1 else rows
+
+        # Single rows feed LightGBM's bin sampling, which requires float64
+        if index < 0:
+            index += len(self)
+        return self._chunks.read(index, index + 1)[0].astype(np.float64)
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the process's resident-set high-water mark (Linux only)
+
+    Returns:
+        False when unsupported; peak_rss_mb then reports the process peak
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of the process in MB (since the last reset_peak_rss)"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
@@ -0,0 +1,627 @@
+"""
+Tree Compiler
+
+Flattens trained XGBoost / LightGBM boosters into contiguous NumPy node
+arrays and scores them with a vectorized traversal, bypassing the
+libraries' Python wrappers (DMatrix construction, input validation)
+that dominate latency at small batch sizes.
+
+Node layout (one entry per node, all trees concatenated, float32
+thresholds so inputs never need widening):
+- feature: split feature index (0 for leaves)
+- threshold: go left when x < threshold (LightGBM's `x <= t` is stored
+  as `x < t'` with t' the next float32 above t)
+- left: index of the left child; the right child is always left + 1
+- default_left, missing_type: routing of missing values
+- is_leaf / value: leaves have threshold +inf and point to themselves,
+  so every row can take the same number of steps regardless of depth;
+  split nodes hold their expected value (cover-weighted mean of the
+  leaves below), used for per-feature contributions
+
+Trees are tagged with an output group; each group has its own base
+margin and sigmoid scale, which lets several boosters share one forest.
+
+Saved forests are one .npy file per array plus a small JSON header, so
+they can be loaded memory-mapped (read-only) and shared between worker
+processes through the page cache.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Missing value handling per node
+MISSING_NONE = 0   # NaN is treated as 0 (LightGBM missing_type=None)
+MISSING_ZERO = 1   # 0 and NaN take the default branch (LightGBM missing_type=Zero)
+MISSING_NAN = 2    # NaN takes the default branch (XGBoost, LightGBM missing_type=NaN)
+
+_LGB_MISSING_TYPES = {"None": MISSING_NONE, "Zero": MISSING_ZERO, "NaN": MISSING_NAN}
+
+# LightGBM's kZeroThreshold (a float literal, 1e-35f)
+_ZERO_THRESHOLD = float(np.float32(1e-35))
+
+# Rows scored per traversal chunk (bounds the [rows, trees] working set)
+_CHUNK_ROWS = 1024
+
+# FlatForest fields stored as .npy files by FlatForest.save
+_FOREST_ARRAYS = (
+    "feature", "threshold", "left", "default_left", "missing_type", "is_leaf",
+    "value", "roots", "tree_group", "base_margin", "sigmoid_scale"
+)
+_FOREST_HEADER = "forest.json"
+
+
+@dataclass
+class FlatForest:
+    """Tree ensemble compiled into flat node arrays"""
+
+    feature: np.ndarray        # int32 [n_nodes]
+    threshold: np.ndarray      # float32 [n_nodes]
+    left: np.ndarray           # int32 [n_nodes]
+    default_left: np.ndarray   # bool [n_nodes]
+    missing_type: np.ndarray   # int8 [n_nodes]
+    is_leaf: np.ndarray        # bool [n_nodes]
+    value: np.ndarray          # float64 [n_nodes]
+    roots: np.ndarray          # int32 [n_trees]
+    tree_group: np.ndarray     # int32 [n_trees]
+    base_margin: np.ndarray    # float64 [n_groups]
+    sigmoid_scale: np.ndarray  # float64 [n_groups]
+    depth: int                 # Longest root-to-leaf path
+    n_features: int
+    node_values: bool = False  # Split nodes hold expected values (older forests do not)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_groups(self) -> int:
+        return len(self.base_margin)
+
+    def save(self, directory: str) -> None:
+        """Write every array as <field>.npy plus forest.json (depth, n_features)"""
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+
+        for name in _FOREST_ARRAYS:
+            np.save(path / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+
+        with open(path / _FOREST_HEADER, 'w') as f:
+            json.dump({
+                "depth": self.depth,
+                "n_features": self.n_features,
+                "node_values": self.node_values
+            }, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: Optional[str] = "r") -> 'FlatForest':
+        """
+        Load a forest written by save()
+
+        Args:
+            directory: Directory holding the .npy files
+            mmap_mode: np.load mmap mode; "r" maps the arrays read-only
+                instead of copying them (None reads them into memory)
+        """
+        path = Path(directory)
+        with open(path / _FOREST_HEADER, 'r') as f:
+            header = json.load(f)
+
+        arrays = {
+            name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode)
+            for name in _FOREST_ARRAYS
+        }
+        return cls(
+            **arrays,
+            depth=int(header["depth"]),
+            n_features=int(header["n_features"]),
+            node_values=bool(header.get("node_values", False))
+        )
+
+    def tree_group_of_nodes(self) -> np.ndarray:
+        """Output group of every node (nodes of a tree are stored contiguously)"""
+        tree_sizes = np.diff(np.append(self.roots, len(self.feature)))
+        return np.repeat(self.tree_group, tree_sizes)
+
+    def predict_margin(self, X: np.ndarray) -> np.ndarray:
+        """
+        Raw scores (sum of leaf values + base margin) per output group
+
+        Args:
+            X: float32 feature matrix [n_rows, n_features]
+
+        Returns:
+            float64 array [n_rows, n_groups]
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} feature columns, got shape {X.shape}")
+
+        # Leaf values per tree -> per group sums as one matrix product
+        group_matrix = np.zeros((self.n_trees, self.n_groups), dtype=np.float64)
+        group_matrix[np.arange(self.n_trees), self.tree_group] = 1.0
+
+        margins = np.empty((X.shape[0], self.n_groups), dtype=np.float64)
+        for start in range(0, X.shape[0], _CHUNK_ROWS):
+            chunk = X[start:start + _CHUNK_ROWS]
+            leaves = self._traverse(chunk)
+            margins[start:start + len(chunk)] = self.value[leaves] @ group_matrix
+
+        return margins + self.base_margin
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Probability of class 1 per output group, float64 [n_rows, n_groups]"""
+        return _sigmoid(self.predict_margin(X) * self.sigmoid_scale)
+
+    def predict_contributions(self, X: np.ndarray) -> np.ndarray:
+        """
+        Per-feature contributions to the margin of each output group
+
+        Path attributions (Saabas): every split on a row's path credits
+        its feature with the change in expected value from the node to
+        the child taken. The same approximation of TreeSHAP as XGBoost's
+        approx_contribs, at the cost of one extra traversal.
+
+        Returns:
+            float64 array [n_rows, n_groups, n_features + 1], bias (base
+            margin plus the roots' expected values) last; sums to
+            predict_margin
+        """
+        if not self.node_values:
+            raise ValueError("Forest was compiled without node values; recompile it to explain")
+
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} feature columns, got shape {X.shape}")
+
+        n_cells = self.n_groups * (self.n_features + 1)
+        contributions = np.empty((X.shape[0], self.n_groups, self.n_features + 1), dtype=np.float64)
+        fast_path = not self._has_zero_missing and np.isfinite(X).all()
+
+        for start in range(0, X.shape[0], _CHUNK_ROWS):
+            chunk = X[start:start + _CHUNK_ROWS]
+            n_rows = chunk.shape[0]
+            flat_x = chunk.ravel()
+            nodes = np.tile(self.roots, n_rows)
+            row_offset = np.repeat(np.arange(n_rows, dtype=np.intp) * self.n_features, self.n_trees)
+
+            # Cell of (row, group, feature) in the flattened result
+            group_cell = (
+                np.repeat(np.arange(n_rows, dtype=np.intp) * n_cells, self.n_trees)
+                + np.tile(self.tree_group, n_rows) * (self.n_features + 1)
+            )
+            totals = np.bincount(
+                group_cell + self.n_features, weights=self.value[nodes], minlength=n_rows * n_cells
+            )
+
+            for _ in range(self.depth):
+                x = flat_x[row_offset + self.feature[nodes]]
+                if fast_path:
+                    go_right = ~(x < self.threshold[nodes])
+                else:
+                    go_right = self._route_missing(x, nodes) & ~self.is_leaf[nodes]
+
+                # Leaves point to themselves, so finished paths add nothing
+                children = self.left[nodes] + go_right
+                totals += np.bincount(
+                    group_cell + self.feature[nodes],
+                    weights=self.value[children] - self.value[nodes],
+                    minlength=n_rows * n_cells
+                )
+                nodes = children
+
+            contributions[start:start + n_rows] = totals.reshape(n_rows, self.n_groups, self.n_features + 1)
+
+        contributions[:, :, -1] += self.base_margin
+        return contributions
+
+    def _traverse(self, X: np.ndarray) -> np.ndarray:
+        """Walk every row down every tree at once, returning leaf node ids [n_rows, n_trees]"""
+        n_rows = X.shape[0]
+        flat_x = X.ravel()
+
+        # One (row, tree) path per entry
+        nodes = np.tile(self.roots, n_rows)
+        row_offset = np.repeat(np.arange(n_rows, dtype=np.intp) * self.n_features, self.n_trees)
+
+        # Finite inputs and no zero-as-missing splits: plain `x < threshold`
+        # (leaves have threshold +inf, so they stay put)
+        fast_path = not self._has_zero_missing and np.isfinite(X).all()
+
+        # Advance all paths while most are still inside a tree, then only the
+        # unfinished ones, so deep but sparse levels stay cheap
+        active = None
+        for _ in range(self.depth):
+            current = nodes if active is None else nodes[active]
+            offsets = row_offset if active is None else row_offset[active]
+            x = flat_x[offsets + self.feature[current]]
+
+            if fast_path:
+                go_right = ~(x < self.threshold[current])
+            else:
+                go_right = self._route_missing(x, current) & ~self.is_leaf[current]
+
+            advanced = self.left[current] + go_right
+            unfinished = ~self.is_leaf[advanced]
+
+            if active is None:
+                nodes = advanced
+                n_unfinished = np.count_nonzero(unfinished)
+                if n_unfinished < nodes.size // 2:
+                    active = np.flatnonzero(unfinished)
+            else:
+                nodes[active] = advanced
+                active = active[unfinished]
+
+            if active is not None and not active.size:
+                break
+
+        return nodes.reshape(n_rows, self.n_trees)
+
+    def _route_missing(self, x: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+        """Branch decisions honouring each node's missing value handling"""
+        is_nan = np.isnan(x)
+        missing_type = self.missing_type[nodes]
+
+        x = np.where(is_nan & (missing_type != MISSING_NAN), np.float32(0), x)
+        use_default = (
+            ((missing_type == MISSING_NAN) & is_nan) |
+            ((missing_type == MISSING_ZERO) & (np.abs(x) <= _ZERO_THRESHOLD))
+        )
+
+        # A +inf threshold is LightGBM's `x <= inf`: +inf inputs go left too
+        threshold = self.threshold[nodes]
+        goes_left = (x < threshold) | (threshold == np.inf)
+
+        with np.errstate(invalid="ignore"):
+            return np.where(use_default, ~self.default_left[nodes], ~goes_left)
+
+    @property
+    def _has_zero_missing(self) -> bool:
+        return bool(np.any(self.missing_type == MISSING_ZERO))
+
+
+class _ForestBuilder:
+    """
+    Lays trees out breadth-first with sibling nodes adjacent
+
+    Trees are given as nested tuples:
+    - leaf: (value, cover)
+    - split: (feature, threshold, default_left, missing_type, left, right)
+    with `x < threshold` going left. Covers (hessian sums or row counts)
+    weight the split nodes' expected values.
+    """
+
+    def __init__(self):
+        self.feature: List[int] = []
+        self.threshold: List[float] = []
+        self.left: List[int] = []
+        self.default_left: List[bool] = []
+        self.missing_type: List[int] = []
+        self.is_leaf: List[bool] = []
+        self.value: List[float] = []
+        self.roots: List[int] = []
+        self.depth = 0
+
+    def add_tree(self, tree: tuple) -> None:
+        root = self._allocate(1)
+        self.roots.append(root)
+        expected = {}
+        _expected_value(tree, expected)
+
+        level = [(root, tree)]
+        depth = 0
+        while level:
+            next_level = []
+            for slot, node in level:
+                if len(node) == 2:
+                    self.left[slot] = slot
+                    self.value[slot] = node[0]
+                    continue
+
+                feature, threshold, default_left, missing_type, left, right = node
+                children = self._allocate(2)
+                self.value[slot] = expected[id(node)][0]
+                self.feature[slot] = feature
+                self.threshold[slot] = threshold
+                self.default_left[slot] = default_left
+                self.missing_type[slot] = missing_type
+                self.is_leaf[slot] = False
+                self.left[slot] = children
+                next_level.extend([(children, left), (children + 1, right)])
+
+            if next_level:
+                depth += 1
+            level = next_level
+
+        self.depth = max(self.depth, depth)
+
+    def build(
+        self,
+        n_features: int,
+        base_margin: float,
+        sigmoid_scale: float
+    ) -> FlatForest:
+        return FlatForest(
+            feature=np.asarray(self.feature, dtype=np.int32),
+            threshold=np.asarray(self.threshold, dtype=np.float32),
+            left=np.asarray(self.left, dtype=np.int32),
+            default_left=np.asarray(self.default_left, dtype=bool),
+            missing_type=np.asarray(self.missing_type, dtype=np.int8),
+            is_leaf=np.asarray(self.is_leaf, dtype=bool),
+            value=np.asarray(self.value, dtype=np.float64),
+            roots=np.asarray(self.roots, dtype=np.int32),
+            tree_group=np.zeros(len(self.roots), dtype=np.int32),
+            base_margin=np.array([base_margin], dtype=np.float64),
+            sigmoid_scale=np.array([sigmoid_scale], dtype=np.float64),
+            depth=self.depth,
+            n_features=n_features,
+            node_values=True
+        )
+
+    def _allocate(self, n_nodes: int) -> int:
+        """Reserve n_nodes leaf-initialized slots and return the first index"""
+        first = len(self.feature)
+        for _ in range(n_nodes):
+            self.feature.append(0)
+            self.threshold.append(np.inf)
+            self.left.append(0)
+            self.default_left.append(True)
+            self.missing_type.append(MISSING_NAN)
+            self.is_leaf.append(True)
+            self.value.append(0.0)
+        return first
+
+
+def compile_xgboost(booster: Any, num_trees: Optional[int] = None) -> FlatForest:
+    """
+    Compile an XGBoost binary:logistic gbtree booster
+
+    Args:
+        booster: xgboost.Booster
+        num_trees: Only compile the first num_trees trees (e.g. best iteration)
+
+    Returns:
+        FlatForest with a single output group
+    """
+    learner = json.loads(booster.save_raw("json"))["learner"]
+
+    objective = learner["objective"]["name"]
+    if objective != "binary:logistic":
+        raise ValueError(f"Unsupported XGBoost objective: {objective}")
+    if learner["gradient_booster"]["name"] != "gbtree":
+        raise ValueError(f"Unsupported XGBoost booster: {learner['gradient_booster']['name']}")
+
+    model_param = learner["learner_model_param"]
+    # Stored as a probability; newer versions wrap it in brackets ("[5E-1]")
+    base_score = float(model_param["base_score"].strip("[]"))
+    n_features = int(model_param["num_feature"])
+
+    trees = learner["gradient_booster"]["model"]["trees"]
+    if num_trees is not None:
+        trees = trees[:num_trees]
+
+    builder = _ForestBuilder()
+    for tree in trees:
+        if any(tree.get("split_type", [])):
+            raise ValueError("Categorical XGBoost splits are not supported")
+        builder.add_tree(_xgboost_subtree(tree, 0))
+
+    return builder.build(
+        n_features=n_features,
+        base_margin=float(np.log(base_score / (1 - base_score))),
+        sigmoid_scale=1.0
+    )
+
+
+def compile_lightgbm(booster: Any, num_iteration: Optional[int] = None) -> FlatForest:
+    """
+    Compile a LightGBM binary booster
+
+    Args:
+        booster: lightgbm.Booster
+        num_iteration: Iterations to compile (defaults to the best iteration,
+            like Booster.predict)
+
+    Returns:
+        FlatForest with a single output group
+    """
+    model = booster.dump_model(num_iteration=num_iteration)
+
+    objective = model["objective"].split()
+    if objective[0] != "binary" or model["num_tree_per_iteration"] != 1:
+        raise ValueError(f"Unsupported LightGBM objective: {model['objective']}")
+    if model.get("average_output"):
+        raise ValueError("LightGBM random forest mode is not supported")
+
+    sigmoid_scale = 1.0
+    for option in objective[1:]:
+        if option.startswith("sigmoid:"):
+            sigmoid_scale = float(option.split(":", 1)[1])
+
+    thresholds = _lightgbm_thresholds(booster, num_iteration)
+    builder = _ForestBuilder()
+    for tree in model["tree_info"]:
+        builder.add_tree(_lightgbm_subtree(tree["tree_structure"], thresholds[tree["tree_index"]]))
+
+    return builder.build(
+        n_features=model["max_feature_idx"] + 1,
+        base_margin=0.0,  # LightGBM folds the initial score into the first tree
+        sigmoid_scale=sigmoid_scale
+    )
+
+
+def concatenate_forests(forests: List[FlatForest]) -> FlatForest:
+    """
+    Merge forests into one, each input becoming its own output group
+
+    Sigmoid scales are folded into the leaf values and base margins, so
+    every group of the result uses a plain sigmoid link.
+    """
+    if len({forest.n_features for forest in forests}) != 1:
+        raise ValueError("Forests were compiled for different feature counts")
+
+    node_offsets = np.cumsum([0] + [len(forest.feature) for forest in forests[:-1]])
+    group_offsets = np.cumsum([0] + [forest.n_groups for forest in forests[:-1]])
+
+    return FlatForest(
+        feature=np.concatenate([forest.feature for forest in forests]),
+        threshold=np.concatenate([forest.threshold for forest in forests]),
+        left=np.concatenate([
+            forest.left + offset for forest, offset in zip(forests, node_offsets)
+        ]).astype(np.int32),
+        default_left=np.concatenate([forest.default_left for forest in forests]),
+        missing_type=np.concatenate([forest.missing_type for forest in forests]),
+        is_leaf=np.concatenate([forest.is_leaf for forest in forests]),
+        value=np.concatenate([
+            forest.value * forest.sigmoid_scale[forest.tree_group_of_nodes()]
+            for forest in forests
+        ]),
+        roots=np.concatenate([
+            forest.roots + offset for forest, offset in zip(forests, node_offsets)
+        ]).astype(np.int32),
+        tree_group=np.concatenate([
+            forest.tree_group + offset for forest, offset in zip(forests, group_offsets)
+        ]).astype(np.int32),
+        base_margin=np.concatenate([forest.base_margin * forest.sigmoid_scale for forest in forests]),
+        sigmoid_scale=np.ones(sum(forest.n_groups for forest in forests), dtype=np.float64),
+        depth=max(forest.depth for forest in forests),
+        n_features=forests[0].n_features,
+        node_values=all(forest.node_values for forest in forests)
+    )
+
+
+def check_parity(
+    forest: FlatForest,
+    native_proba: np.ndarray,
+    X: np.ndarray,
+    group: int = 0,
+    atol: float = 1e-5
+) -> Tuple[bool, float]:
+    """
+    Compare compiled probabilities with the native library's output
+
+    Returns:
+        (within tolerance, max absolute difference)
+    """
+    compiled = forest.predict_proba(X)[:, group]
+    max_diff = float(np.max(np.abs(compiled - native_proba))) if len(X) else 0.0
+    return max_diff <= atol, max_diff
+
+
+def parity_probe(n_features: int, n_rows: int = 256, seed: int = 0) -> np.ndarray:
+    """Random rows (with NaNs and zeros) covering both sides of typical splits"""
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(-0.25, 1.25, size=(n_rows, n_features)).astype(np.float32)
+    X[rng.random(X.shape) < 0.05] = np.nan
+    X[rng.random(X.shape) < 0.05] = 0.0
+    return X
+
+
+def _xgboost_subtree(tree: Dict[str, Any], node: int) -> tuple:
+    """Nested-tuple form of an XGBoost JSON tree from `node` down"""
+    left = tree["left_children"][node]
+    if left == -1:
+        return (float(np.float32(tree["split_conditions"][node])), float(tree["sum_hessian"][node]))
+
+    return (
+        int(tree["split_indices"][node]),
+        # XGBoost compares float32 values: x < split_condition
+        np.float32(tree["split_conditions"][node]),
+        bool(tree["default_left"][node]),
+        MISSING_NAN,
+        _xgboost_subtree(tree, left),
+        _xgboost_subtree(tree, tree["right_children"][node])
+    )
+
+
+def _lightgbm_thresholds(booster: Any, num_iteration: Optional[int]) -> Dict[int, List[float]]:
+    """
+    Split thresholds of every tree, by split index, at full precision
+
+    dump_model() prints thresholds with 15 significant digits, which can
+    route values lying exactly at a split differently from LightGBM; the
+    model string keeps all 17.
+    """
+    thresholds = {}
+    tree_index = None
+    for line in booster.model_to_string(num_iteration=num_iteration).splitlines():
+        if line.startswith("Tree="):
+            tree_index = int(line[len("Tree="):])
+        elif line.startswith("threshold=") and tree_index is not None:
+            thresholds[tree_index] = [float(value) for value in line[len("threshold="):].split()]
+    return thresholds
+
+
+def _lightgbm_subtree(node: Dict[str, Any], thresholds: List[float]) -> tuple:
+    """Nested-tuple form of a LightGBM dump_model() tree node"""
+    if "leaf_value" in node:
+        return (float(node["leaf_value"]), float(node.get("leaf_count", 0)))
+
+    if node["decision_type"] != "<=":
+        raise ValueError(f"Unsupported LightGBM split: {node['decision_type']}")
+
+    return (
+        int(node["split_feature"]),
+        _lightgbm_split_threshold(thresholds[node["split_index"]]),
+        bool(node["default_left"]),
+        _LGB_MISSING_TYPES[node["missing_type"]],
+        _lightgbm_subtree(node["left_child"], thresholds),
+        _lightgbm_subtree(node["right_child"], thresholds)
+    )
+
+
+def _lightgbm_split_threshold(threshold: float) -> np.float32:
+    """
+    float32 t' such that `x < t'` reproduces LightGBM's split on float32 x
+
+    LightGBM reads inputs with |x| <= kZeroThreshold as exactly 0, which
+    only matters for thresholds inside that band: below 0 the split is
+    `x < -kZeroThreshold`, otherwise `x <= kZeroThreshold`.
+    """
+    if -_ZERO_THRESHOLD <= threshold < 0:
+        return np.float32(-_ZERO_THRESHOLD)  # Exact: kZeroThreshold is a float32
+    if 0 <= threshold < _ZERO_THRESHOLD:
+        return _float32_le_threshold(_ZERO_THRESHOLD)
+    return _float32_le_threshold(threshold)
+
+
+def _float32_le_threshold(threshold: float) -> np.float32:
+    """
+    float32 t' such that, for float32 x, `x <= threshold` <=> `x < t'`
+
+    The largest float32 not above the float64 threshold gives the same
+    `<=` result for every float32 x; the next float32 turns it into `<`.
+    """
+    with np.errstate(over="ignore"):
+        floor = np.float32(threshold)
+    # Compared in float64 (NumPy 2 would cast the Python float to float32)
+    if float(floor) > threshold:
+        floor = np.nextafter(floor, np.float32(-np.inf))
+    return np.nextafter(floor, np.float32(np.inf))
+
+
+def _expected_value(node: tuple, expected: Dict[int, Tuple[float, float]]) -> Tuple[float, float]:
+    """(cover-weighted mean of the leaves below, cover) of a nested-tuple node, memoized by id"""
+    if len(node) == 2:
+        return node
+
+    left_value, left_cover = _expected_value(node[4], expected)
+    right_value, right_cover = _expected_value(node[5], expected)
+    cover = left_cover + right_cover
+    if cover > 0:
+        value = (left_value * left_cover + right_value * right_cover) / cover
+    else:
+        value = (left_value + right_value) / 2
+    expected[id(node)] = (value, cover)
+    return value, cover
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
@@ -0,0 +1,155 @@
+"""
+Ensemble Weight Optimizer
+
+Searches blend weights for the ensemble on a validation set, given each
+base model's probabilities computed once.
+
+- Candidate weight vectors are scored together: blended scores for a
+  block of candidates are one matrix product into a reused buffer.
+- AUC is rank-based (one sort per candidate, ties get average ranks),
+  so no per-candidate sklearn call or threshold sweep is needed.
+- AUC only depends on the ratio between weights, so candidates that are
+  multiples of each other are evaluated once.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+# Bound on candidate-score buffer size (rows x candidates per block)
+_MAX_BLOCK_ELEMENTS = 8_000_000
+
+
+def rank_auc(y_true: np.ndarray, scores: np.ndarray) -> float:
+    """
+    ROC AUC from ranks (Mann-Whitney U), equal to sklearn's roc_auc_score
+
+    Args:
+        y_true: Binary labels [n_rows]
+        scores: Scores [n_rows]; higher means more likely positive
+    """
+    y_true = np.asarray(y_true).astype(bool, copy=False)
+    n_pos = int(np.count_nonzero(y_true))
+    n_neg = len(y_true) - n_pos
+    if n_pos == 0 or n_neg == 0:
+        raise ValueError("AUC needs both positive and negative labels")
+
+    order = np.argsort(scores, kind="quicksort")
+    sorted_scores = scores[order]
+
+    # Tied scores share the average of their 1-based ranks
+    starts = np.flatnonzero(np.r_[True, sorted_scores[1:] != sorted_scores[:-1]])
+    ends = np.r_[starts[1:], len(sorted_scores)]
+    positives_per_group = np.add.reduceat(y_true[order].astype(np.float64), starts)
+
+    rank_sum = float(np.dot(positives_per_group, (starts + ends + 1) / 2))
+    return (rank_sum - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+
+
+def evaluate_candidates(
+    probabilities: np.ndarray,
+    y_true: np.ndarray,
+    candidates: np.ndarray
+) -> np.ndarray:
+    """
+    AUC of every candidate weight vector
+
+    Args:
+        probabilities: Base-model probabilities [n_rows, n_models]
+        y_true: Binary labels [n_rows]
+        candidates: Weight vectors [n_candidates, n_models]
+
+    Returns:
+        AUC per candidate [n_candidates]
+    """
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    candidates = np.asarray(candidates, dtype=np.float64)
+
+    # Scale-free: evaluate each direction once
+    directions = candidates / candidates.sum(axis=1, keepdims=True)
+    unique_directions, inverse = np.unique(directions.round(12), axis=0, return_inverse=True)
+
+    n_rows = probabilities.shape[0]
+    block = max(1, min(len(unique_directions), _MAX_BLOCK_ELEMENTS // max(n_rows, 1)))
+    buffer = np.empty((block, n_rows), dtype=np.float64)
+
+    unique_auc = np.empty(len(unique_directions))
+    for start in range(0, len(unique_directions), block):
+        weights = unique_directions[start:start + block]
+        scores = buffer[:len(weights)]
+        np.matmul(weights, probabilities.T, out=scores)
+        for i in range(len(weights)):
+            unique_auc[start + i] = rank_auc(y_true, scores[i])
+
+    return unique_auc[np.ravel(inverse)]
+
+
+def optimize_simplex(
+    probabilities: np.ndarray,
+    y_true: np.ndarray,
+    start: np.ndarray,
+    max_evaluations: int = 100
+) -> Tuple[np.ndarray, float]:
+    """
+    Continuous weight search over the simplex (Nelder-Mead on softmax logits,
+    the last active model's logit fixed at 0)
+
+    AUC is piecewise constant in the weights, so the search keeps the best
+    point seen and never returns anything worse than `start`.
+
+    Args:
+        probabilities: Base-model probabilities [n_rows, n_models]
+        y_true: Binary labels [n_rows]
+        start: Initial weights [n_models], e.g. the best grid point
+        max_evaluations: Upper bound on AUC evaluations
+
+    Returns:
+        (weights summing to 1, AUC)
+    """
+    from scipy.optimize import minimize
+
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    start = np.asarray(start, dtype=np.float64)
+    active = start > 0  # Models with zero weight stay out of the blend
+
+    scores = np.empty(probabilities.shape[0], dtype=np.float64)
+    best = (start / start.sum(), -np.inf)
+
+    def to_weights(logits: np.ndarray) -> np.ndarray:
+        logits = np.append(logits, 0.0)
+        weights = np.zeros_like(start)
+        exp = np.exp(logits - logits.max())
+        weights[active] = exp / exp.sum()
+        return weights
+
+    def objective(logits: np.ndarray) -> float:
+        nonlocal best
+        weights = to_weights(logits)
+        np.matmul(probabilities, weights, out=scores)
+        auc = rank_auc(y_true, scores)
+        if auc > best[1]:
+            best = (weights, auc)
+        return -auc
+
+    if np.count_nonzero(active) < 2:
+        objective(np.zeros(0))
+        return best
+
+    # Wide initial simplex: a step of 0.5 in one logit moves its weight by ~10-25%
+    start_logits = np.log(start[active])
+    x0 = start_logits[:-1] - start_logits[-1]
+    initial_simplex = np.vstack([x0, x0 + 0.5 * np.eye(len(x0))])
+
+    minimize(
+        objective,
+        x0=x0,
+        method="Nelder-Mead",
+        options={
+            "maxfev": max_evaluations,
+            "xatol": 1e-3,
+            "fatol": 1e-7,
+            "initial_simplex": initial_simplex
+        }
+    )
+
+    return best
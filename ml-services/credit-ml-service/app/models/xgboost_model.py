@@ -13,11 +13,22 @@ Best for:
 import xgboost as xgb
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from pathlib import Path
+import os
 import logging
 
-from .base_model import BaseModel
+from .base_model import BaseModel, TRAIN_METRICS_MAX_ROWS, data_fingerprint
+from .streaming import (
+    STREAM_EXTERNAL_MEMORY_DIR,
+    ChunkDataIter,
+    RowChunks,
+    peak_rss_mb,
+    reset_peak_rss
+)
+from .tree_compiler import FlatForest, compile_xgboost
+from app.features.schema import FEATURE_NAMES, FEATURE_SCHEMA_VERSION, as_feature_matrix
 
 logger = logging.getLogger(__name__)
 
@@ -34,10 +45,15 @@ class XGBoostModel(BaseModel):
     - colsample_bytree: Fraction of features per tree
     """
     
+    # XGBoost's binary JSON (UBJSON) model format
+    native_extension = ".ubj"
+    
     def __init__(
         self,
         version: str = "1.0.0",
-        hyperparameters: Dict[str, Any] = None
+        hyperparameters: Dict[str, Any] = None,
+        early_stopping_rounds: int = 30,
+        early_stopping_min_delta: float = 1e-4
     ):
         super().__init__(model_name="xgboost", version=version)
         
@@ -52,13 +68,21 @@ class XGBoostModel(BaseModel):
             "subsample": 0.8,                  # Sample 80% of data per tree
             "colsample_bytree": 0.8,           # Sample 80% of features per tree
             "objective": "binary:logistic",    # Binary classification
-            "eval_metric": "auc",              # Optimize for AUC
+            "eval_metric": ["auc", "logloss"], # Logloss (last) drives early stopping
             "random_state": 42,
             "n_jobs": -1,                      # Use all CPU cores
             "tree_method": "hist",             # Faster training
         }
         
+        # Stop when validation logloss has not improved by min_delta for this
+        # many rounds (only when a validation set is given; n_estimators is
+        # the cap). AUC only measures ranking and peaks within a few trees,
+        # long before the probabilities reach the risk thresholds.
+        self.early_stopping_rounds = early_stopping_rounds
+        self.early_stopping_min_delta = early_stopping_min_delta
+        
         self.model = xgb.XGBClassifier(**self.params)
+        self._shap_cache = None  # (fitted model, shap.TreeExplainer) for get_explainability
         logger.info(f"XGBoost model initialized with params: {self.params}")
     
     def train(
@@ -72,35 +96,170 @@ class XGBoostModel(BaseModel):
         
         logger.info(f"Training XGBoost on {len(X_train)} samples...")
         
-        self.feature_names = list(X_train.columns)
+        # Compile against the frozen feature schema (fixed column order)
+        X_train = as_feature_matrix(X_train)
+        self.feature_names = list(FEATURE_NAMES)
         
         # Prepare evaluation set if provided
         eval_set = None
         if X_val is not None and y_val is not None:
+            X_val = as_feature_matrix(X_val)
             eval_set = [(X_val, y_val)]
         
+        n_estimators, checkpoint, resume_from = self._resume_state(
+            data_fingerprint(X_train, y_train)
+        )
+        
+        self.model = xgb.XGBClassifier(
+            **{**self.params, "n_estimators": n_estimators},
+            callbacks=self._callbacks(eval_set is not None, checkpoint) or None
+        )
+        
         # Train model
         self.model.fit(
             X_train,
             y_train,
             eval_set=eval_set,
-            verbose=False
+            verbose=False,
+            xgb_model=resume_from
+        )
+        
+        if checkpoint is not None:
+            checkpoint.unlink(missing_ok=True)
+        
+        return self._finish_training(len(X_train), X_train, y_train, X_val, y_val)
+    
+    def train_streaming(
+        self,
+        chunks: RowChunks,
+        X_val: pd.DataFrame = None,
+        y_val: np.ndarray = None
+    ) -> Dict[str, Any]:
+        """
+        Train out of core from row chunks on disk (see app.models.streaming)
+        
+        The training matrix is never materialized: chunks go through a
+        DataIter into a QuantileDMatrix (or an external-memory DMatrix when
+        STREAM_EXTERNAL_MEMORY_DIR is set). The validation set is small and
+        held in memory. Early stopping and checkpoints work as in train().
+        
+        Peak resident memory of the run is stored as metadata["peak_rss_mb"].
+        """
+        logger.info(
+            f"Training XGBoost on {chunks.n_rows} samples streamed in "
+            f"{chunks.n_chunks} chunks of {chunks.chunk_rows} rows..."
+        )
+        reset_peak_rss()
+        self.feature_names = list(FEATURE_NAMES)
+        
+        if STREAM_EXTERNAL_MEMORY_DIR:
+            Path(STREAM_EXTERNAL_MEMORY_DIR).mkdir(parents=True, exist_ok=True)
+            cache_prefix = str(Path(STREAM_EXTERNAL_MEMORY_DIR) / f"{self.model_name}_v{self.version}")
+            dtrain = xgb.DMatrix(ChunkDataIter(chunks, cache_prefix=cache_prefix))
+        else:
+            dtrain = xgb.QuantileDMatrix(
+                ChunkDataIter(chunks),
+                max_bin=self.params.get("max_bin", 256)
+            )
+        
+        evals = []
+        if X_val is not None and y_val is not None:
+            X_val = as_feature_matrix(X_val)
+            dval = (
+                xgb.DMatrix(X_val, label=y_val) if STREAM_EXTERNAL_MEMORY_DIR
+                else xgb.QuantileDMatrix(X_val, label=y_val, ref=dtrain)
+            )
+            evals = [(dval, "validation")]
+        
+        n_estimators, checkpoint, resume_from = self._resume_state(chunks.fingerprint())
+        
+        booster = xgb.train(
+            xgb.XGBClassifier(**self.params).get_xgb_params(),
+            dtrain,
+            num_boost_round=n_estimators,
+            evals=evals,
+            callbacks=self._callbacks(bool(evals), checkpoint),
+            xgb_model=resume_from,
+            verbose_eval=False
         )
+        del dtrain
+        
+        if checkpoint is not None:
+            checkpoint.unlink(missing_ok=True)
+        
+        # Same estimator type as train() produces (predict, SHAP, compile_forest)
+        self.model = xgb.XGBClassifier(**self.params)
+        self.model.load_model(bytearray(booster.save_raw("ubj")))
+        
+        X_head, y_head = chunks.head(TRAIN_METRICS_MAX_ROWS)
+        self._finish_training(chunks.n_rows, X_head, y_head, X_val, y_val)
+        
+        self.metadata["peak_rss_mb"] = round(peak_rss_mb(), 1)
+        logger.info(f"Peak resident memory: {self.metadata['peak_rss_mb']:.0f} MB")
+        
+        return self.metadata
+    
+    def _resume_state(self, data_key: str) -> Tuple[int, Optional[Path], Optional[xgb.Booster]]:
+        """Rounds left to train, checkpoint path and the booster to resume from, if any"""
+        n_estimators = self.params.get("n_estimators", 100)
+        checkpoint = self._checkpoint_path(data_key)
+        resume_from = None
         
+        # Resume from a checkpoint of an interrupted run, if any
+        if checkpoint is not None and checkpoint.exists():
+            resume_from = xgb.Booster(model_file=str(checkpoint))
+            completed = resume_from.num_boosted_rounds()
+            n_estimators = max(n_estimators - completed, 0)
+            logger.info(f"Resuming from checkpoint {checkpoint} ({completed} rounds done)")
+        
+        return n_estimators, checkpoint, resume_from
+    
+    def _callbacks(self, has_validation: bool, checkpoint: Optional[Path]) -> List:
+        """Early stopping (needs a validation set) and checkpointing callbacks"""
+        callbacks = []
+        if has_validation and self.early_stopping_rounds:
+            callbacks.append(xgb.callback.EarlyStopping(
+                rounds=self.early_stopping_rounds,
+                metric_name="logloss",
+                min_delta=self.early_stopping_min_delta
+            ))
+        if checkpoint is not None:
+            callbacks.append(_Checkpoint(checkpoint, self.checkpoint_interval))
+        return callbacks
+    
+    def _finish_training(
+        self,
+        n_samples: int,
+        X_train: np.ndarray,
+        y_train: np.ndarray,
+        X_val: np.ndarray = None,
+        y_val: np.ndarray = None
+    ) -> Dict[str, Any]:
+        """Record metadata and train/validation metrics of the fitted model"""
         self.is_trained = True
         self.metadata["trained_at"] = datetime.now().isoformat()
-        self.metadata["train_samples"] = len(X_train)
+        self.metadata["train_samples"] = n_samples
         self.metadata["n_features"] = X_train.shape[1]
+        self.metadata["feature_schema_version"] = FEATURE_SCHEMA_VERSION
+        self.metadata["best_iteration"] = getattr(self.model, "best_iteration", None)
+        self.metadata["n_trees"] = (
+            self._iteration_range()[1] or self.model.get_booster().num_boosted_rounds()
+        )
         
-        # Validate on training set
-        train_metrics = self.validate(X_train, y_train)
+        logger.info(
+            f"Fitted {self.metadata['n_trees']} trees "
+            f"(best iteration: {self.metadata['best_iteration']})"
+        )
+        
+        # Training-set metrics on a subsample (a full pass is a second inference run)
+        train_metrics = self.evaluate("train", X_train, y_train, max_rows=TRAIN_METRICS_MAX_ROWS)
         self.metadata["train_metrics"] = train_metrics
         
         logger.info(f"Training complete. Train AUC: {train_metrics['auc']:.4f}")
         
         # Validate on validation set if provided
         if X_val is not None and y_val is not None:
-            val_metrics = self.validate(X_val, y_val)
+            val_metrics = self.evaluate("val", X_val, y_val)
             self.metadata["val_metrics"] = val_metrics
             logger.info(f"Validation AUC: {val_metrics['auc']:.4f}")
         
@@ -111,7 +270,7 @@ class XGBoostModel(BaseModel):
         if not self.is_trained:
             raise ValueError("Model not trained yet")
         
-        return self.model.predict(X)
+        return self.model.predict(as_feature_matrix(X))
     
     def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
         """Generate probability estimates"""
@@ -119,9 +278,49 @@ class XGBoostModel(BaseModel):
             raise ValueError("Model not trained yet")
         
         # Return probability of default (class 1)
-        probas = self.model.predict_proba(X)
+        probas = self.model.predict_proba(as_feature_matrix(X))
         return probas[:, 1]
     
+    def predict_contributions(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Per-row feature contributions (exact TreeSHAP, native implementation)
+        
+        Returns:
+            float32 array [n_rows, n_features + 1] in log-odds units; the
+            last column is the bias, and each row sums to the raw margin
+        """
+        if not self.is_trained:
+            raise ValueError("Model not trained yet")
+        
+        return self.model.get_booster().predict(
+            xgb.DMatrix(as_feature_matrix(X)),
+            pred_contribs=True,
+            iteration_range=self._iteration_range()
+        )
+    
+    def _iteration_range(self) -> Tuple[int, int]:
+        """Trees used by predict_proba (up to the best iteration with early stopping)"""
+        best_iteration = getattr(self.model, "best_iteration", None)
+        return (0, best_iteration + 1) if best_iteration is not None else (0, 0)
+    
+    def compile_forest(self) -> FlatForest:
+        """Compile the trained booster into flat arrays (see tree_compiler)"""
+        if not self.is_trained:
+            raise ValueError("Model not trained yet")
+        
+        # predict_proba stops at the best iteration when early stopping was used
+        num_trees = self._iteration_range()[1] or None
+        
+        return compile_xgboost(self.model.get_booster(), num_trees=num_trees)
+    
+    def _save_native_model(self, path: str) -> None:
+        # The sklearn wrapper also stores its own attributes (classes, best iteration)
+        self.model.save_model(path)
+    
+    def _load_native_model(self, path: str) -> None:
+        self.model = xgb.XGBClassifier(**self.params)
+        self.model.load_model(path)
+    
     def get_feature_importance(self) -> List[Tuple[str, float]]:
         """Get feature importance from XGBoost"""
         if not self.is_trained:
@@ -142,13 +341,18 @@ class XGBoostModel(BaseModel):
         """
         Get model explainability using SHAP (if installed)
         
-        Note: SHAP takes time to compute. Use sparingly in production.
+        Note: SHAP takes time to compute. Use sparingly in production
+        (predict_contributions gives per-row values much faster).
         """
         try:
             import shap
             
-            explainer = shap.TreeExplainer(self.model)
-            shap_values = explainer.shap_values(X)
+            # Build the explainer once per fitted model
+            if self._shap_cache is None or self._shap_cache[0] is not self.model:
+                self._shap_cache = (self.model, shap.TreeExplainer(self.model))
+            explainer = self._shap_cache[1]
+            
+            shap_values = explainer.shap_values(as_feature_matrix(X))
             
             # Get top N most important features
             mean_abs_shap = np.abs(shap_values).mean(axis=0)
@@ -176,3 +380,20 @@ class XGBoostModel(BaseModel):
                 ],
                 "explainer_type": "XGBoost Feature Importance"
             }
+
+
+class _Checkpoint(xgb.callback.TrainingCallback):
+    """Saves the booster every `interval` rounds, replacing the previous checkpoint"""
+    
+    def __init__(self, path: Path, interval: int):
+        super().__init__()
+        self.path = path
+        self.interval = max(1, interval)
+    
+    def after_iteration(self, model: xgb.Booster, epoch: int, evals_log: Dict) -> bool:
+        if model.num_boosted_rounds() % self.interval == 0:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            partial = self.path.with_name(f".{self.path.name}")
+            model.save_model(str(partial))
+            os.replace(partial, self.path)
+        return False  # Never stops training
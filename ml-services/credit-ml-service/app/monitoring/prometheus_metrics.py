@@ -6,6 +6,7 @@ Exports ML-specific metrics to Prometheus for monitoring.
 
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, REGISTRY
 from fastapi import Response
+from typing import Dict, List
 import time
 
 
@@ -74,6 +75,30 @@ ml_drift_detected = Gauge(
     'Whether drift was detected (1=drifted, 0=no drift)'
 )
 
+# Drift monitor daemon metrics (one series per rolling window)
+ml_drift_window_psi_score = Gauge(
+    'ml_drift_window_psi_score',
+    'PSI per feature over a rolling window',
+    ['feature_name', 'window']
+)
+
+ml_drift_window_samples = Gauge(
+    'ml_drift_window_samples',
+    'Decisions in a rolling drift window',
+    ['window']
+)
+
+ml_drift_window_detected = Gauge(
+    'ml_drift_window_detected',
+    'Whether retraining is recommended for a rolling window (1=drifted, 0=no drift)',
+    ['window']
+)
+
+ml_drift_monitor_watermark = Gauge(
+    'ml_drift_monitor_watermark_seconds',
+    'Unix time up to which the drift monitor has processed decisions'
+)
+
 # Feature engineering metrics
 ml_feature_extraction_latency = Histogram(
     'ml_feature_extraction_latency_seconds',
@@ -86,6 +111,63 @@ ml_features_extracted_total = Counter(
     'Total number of features extracted'
 )
 
+# Inference pool metrics
+ml_inference_queue_depth = Gauge(
+    'ml_inference_queue_depth',
+    'Inference requests waiting for a worker thread',
+    ['pool']
+)
+
+ml_inference_queue_wait = Histogram(
+    'ml_inference_queue_wait_seconds',
+    'Time inference requests wait for a worker thread',
+    ['pool'],
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0]
+)
+
+ml_inference_rejected_total = Counter(
+    'ml_inference_rejected_total',
+    'Inference requests rejected because the queue was full',
+    ['pool']
+)
+
+# Micro-batching metrics
+ml_micro_batch_size = Histogram(
+    'ml_micro_batch_size',
+    'Number of requests coalesced into one micro-batch',
+    ['batcher'],
+    buckets=[1, 2, 4, 8, 16, 32, 64, 128, 256]
+)
+
+ml_micro_batch_queue_delay = Histogram(
+    'ml_micro_batch_queue_delay_seconds',
+    'Time a request waits for its micro-batch to be dispatched',
+    ['batcher'],
+    buckets=[0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05]
+)
+
+# Prediction cache metrics
+ml_prediction_cache_hits_total = Counter(
+    'ml_prediction_cache_hits_total',
+    'Predictions served from the prediction cache',
+    ['tier']
+)
+
+ml_prediction_cache_misses_total = Counter(
+    'ml_prediction_cache_misses_total',
+    'Prediction cache lookups that had to score the request'
+)
+
+ml_prediction_cache_bytes = Gauge(
+    'ml_prediction_cache_bytes',
+    'Approximate memory held by the local prediction cache'
+)
+
+ml_prediction_cache_entries = Gauge(
+    'ml_prediction_cache_entries',
+    'Entries in the local prediction cache'
+)
+
 # Error metrics
 ml_errors_total = Counter(
     'ml_errors_total',
@@ -137,6 +219,59 @@ def record_drift_detection(drifted: bool):
     ml_drift_detected.set(1 if drifted else 0)
 
 
+def record_window_drift(window: str, psi_by_feature: Dict[str, float], n_samples: int, drifted: bool):
+    """Record drift results of one rolling window"""
+    for feature_name, psi in psi_by_feature.items():
+        ml_drift_window_psi_score.labels(feature_name=feature_name, window=window).set(psi)
+    ml_drift_window_samples.labels(window=window).set(n_samples)
+    ml_drift_window_detected.labels(window=window).set(1 if drifted else 0)
+
+
+def record_drift_watermark(timestamp: float):
+    """Record the drift monitor's processing watermark"""
+    ml_drift_monitor_watermark.set(timestamp)
+
+
 def record_error(error_type: str):
     """Record an error"""
     ml_errors_total.labels(error_type=error_type).inc()
+
+
+def record_inference_queued(pool: str, queue_depth: int):
+    """Record a request entering the inference queue"""
+    ml_inference_queue_depth.labels(pool=pool).set(queue_depth)
+
+
+def record_inference_started(pool: str, queue_depth: int, wait_seconds: float):
+    """Record a request leaving the inference queue for a worker"""
+    ml_inference_queue_depth.labels(pool=pool).set(queue_depth)
+    ml_inference_queue_wait.labels(pool=pool).observe(wait_seconds)
+
+
+def record_inference_rejected(pool: str):
+    """Record a request rejected by a full inference queue"""
+    ml_inference_rejected_total.labels(pool=pool).inc()
+
+
+def record_micro_batch(batcher: str, batch_size: int, queue_delays: List[float]):
+    """Record a dispatched micro-batch and how long each request waited"""
+    ml_micro_batch_size.labels(batcher=batcher).observe(batch_size)
+    histogram = ml_micro_batch_queue_delay.labels(batcher=batcher)
+    for delay in queue_delays:
+        histogram.observe(delay)
+
+
+def record_cache_hit(tier: str):
+    """Record a prediction served from the cache (tier: local or shared)"""
+    ml_prediction_cache_hits_total.labels(tier=tier).inc()
+
+
+def record_cache_miss():
+    """Record a prediction cache miss"""
+    ml_prediction_cache_misses_total.inc()
+
+
+def update_cache_size(size_bytes: int, entries: int):
+    """Update local prediction cache size"""
+    ml_prediction_cache_bytes.set(size_bytes)
+    ml_prediction_cache_entries.set(entries)
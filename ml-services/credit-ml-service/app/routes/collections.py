@@ -20,6 +20,8 @@ import numpy as np
 from datetime import datetime
 import logging
 
+from app.utils.inference_pool import inference_pool, InferencePoolFull
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/predict/collections", tags=["collections"])
@@ -378,63 +380,71 @@ async def predict_collection_strategy(request: CollectionPredictionRequest):
     """
     
     try:
-        logger.info(f"Predicting strategy for invoice: ₹{request.invoice_amount}, {request.days_overdue} days overdue")
-        
-        # Feature extraction
-        features = extract_features(request)
-        
-        # Predict strategy
-        best_idx, probabilities = predict_strategy_rule_based(features, request)
-        recommended_strategy = COLLECTION_STRATEGIES[best_idx]
-        confidence = float(probabilities[best_idx])
-        
-        # Success prediction
-        success_rate = predict_success_rate(request, recommended_strategy)
-        collection_days = predict_collection_days(request, recommended_strategy)
-        
-        # Expected recovery
-        expected_recovery = request.invoice_amount * success_rate
-        
-        # Predicted outcome
-        if success_rate > 0.75:
-            predicted_outcome = "paid_full"
-        elif success_rate > 0.50:
-            predicted_outcome = "paid_partial"
-        else:
-            predicted_outcome = "no_response"
-        
-        # Alternative strategies (top 3 excluding best)
-        alternatives = []
-        sorted_indices = np.argsort(probabilities)[::-1]
-        for idx in sorted_indices[1:4]:  # Top 3 alternatives
-            alt_strategy = COLLECTION_STRATEGIES[idx]
-            alt_confidence = float(probabilities[idx])
-            alt_success = predict_success_rate(request, alt_strategy)
-            
-            alternatives.append(AlternativeStrategy(
-                strategy=alt_strategy,
-                confidence=alt_confidence,
-                success_rate=alt_success
-            ))
-        
-        response = CollectionPredictionResponse(
-            recommended_strategy=recommended_strategy,
-            confidence=confidence,
-            predicted_outcome=predicted_outcome,
-            predicted_collection_days=collection_days,
-            expected_recovery_amount=expected_recovery,
-            alternative_strategies=alternatives,
-            model_version="1.0.0-rules"
-        )
-        
-        logger.info(f"Prediction: {recommended_strategy} (confidence: {confidence:.2f}, success: {success_rate:.2f})")
-        
-        return response
+        # CPU-bound scoring runs on the inference pool, off the event loop
+        return await inference_pool.run(_predict_collection_strategy, request)
         
+    except InferencePoolFull as e:
+        logger.warning(f"Prediction rejected: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Prediction error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
+def _predict_collection_strategy(request: CollectionPredictionRequest) -> CollectionPredictionResponse:
+    """Score one collection request (runs on an inference pool thread)"""
+    logger.info(f"Predicting strategy for invoice: ₹{request.invoice_amount}, {request.days_overdue} days overdue")
+    
+    # Feature extraction
+    features = extract_features(request)
+    
+    # Predict strategy
+    best_idx, probabilities = predict_strategy_rule_based(features, request)
+    recommended_strategy = COLLECTION_STRATEGIES[best_idx]
+    confidence = float(probabilities[best_idx])
+    
+    # Success prediction
+    success_rate = predict_success_rate(request, recommended_strategy)
+    collection_days = predict_collection_days(request, recommended_strategy)
+    
+    # Expected recovery
+    expected_recovery = request.invoice_amount * success_rate
+    
+    # Predicted outcome
+    if success_rate > 0.75:
+        predicted_outcome = "paid_full"
+    elif success_rate > 0.50:
+        predicted_outcome = "paid_partial"
+    else:
+        predicted_outcome = "no_response"
+    
+    # Alternative strategies (top 3 excluding best)
+    alternatives = []
+    sorted_indices = np.argsort(probabilities)[::-1]
+    for idx in sorted_indices[1:4]:  # Top 3 alternatives
+        alt_strategy = COLLECTION_STRATEGIES[idx]
+        alt_confidence = float(probabilities[idx])
+        alt_success = predict_success_rate(request, alt_strategy)
+    
+        alternatives.append(AlternativeStrategy(
+            strategy=alt_strategy,
+            confidence=alt_confidence,
+            success_rate=alt_success
+        ))
+    
+    response = CollectionPredictionResponse(
+        recommended_strategy=recommended_strategy,
+        confidence=confidence,
+        predicted_outcome=predicted_outcome,
+        predicted_collection_days=collection_days,
+        expected_recovery_amount=expected_recovery,
+        alternative_strategies=alternatives,
+        model_version="1.0.0-rules"
+    )
+    
+    logger.info(f"Prediction: {recommended_strategy} (confidence: {confidence:.2f}, success: {success_rate:.2f})")
+    
+    return response
+
 @router.get("/strategies")
 async def list_strategies():
     """
@@ -1,10 +1,16 @@
 """Training package initialization"""
 
 from .synthetic_data import SyntheticDataGenerator, generate_train_test_split
+from .dataset_store import Dataset, DatasetStore
+from .hyperparameter_search import HyperparameterSearch, SearchResult
 from .trainer import train_and_evaluate
 
 __all__ = [
     'SyntheticDataGenerator',
     'generate_train_test_split',
+    'Dataset',
+    'DatasetStore',
+    'HyperparameterSearch',
+    'SearchResult',
     'train_and_evaluate'
 ]
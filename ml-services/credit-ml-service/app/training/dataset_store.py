@@ -0,0 +1,355 @@
+"""
+Dataset Store
+
+Writes training datasets to disk once and reads them back memory-mapped,
+so repeated training runs skip data generation and share the page cache
+instead of each holding DataFrame copies.
+
+Layout of one dataset:
+    {DATASET_DIR}/{key}/
+      manifest.json    parameters, feature schema version, row count, label rate
+      features.npy     float32 [n_rows, N_FEATURES], schema column order
+      labels.npy       int8 [n_rows]
+
+The key is a hash of the parameters that produced the data (generator
+seed, sample count, tier ratios, feature schema version), so asking for
+the same synthetic dataset twice finds the stored copy.
+
+Rows are stored in a stratified random order: each class is shuffled,
+then defaults are spread evenly among non-defaults, so every contiguous
+row range has the dataset's default rate to within one row. Train/val/test
+splits are therefore stratified, yet still contiguous row ranges returned
+as views of the mapped file, not copies.
+
+Parquet import/export uses pyarrow (imported only when used).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.features.schema import FEATURE_NAMES, FEATURE_SCHEMA_VERSION, N_FEATURES, as_feature_matrix
+from app.models.streaming import RowChunks
+from app.training.synthetic_data import SyntheticDataGenerator
+
+logger = logging.getLogger(__name__)
+
+DATASET_DIR = os.getenv("DATASET_DIR", "./data/datasets")
+MANIFEST_FILE = "manifest.json"
+
+# Bumped when generated data changes for the same parameters
+GENERATOR_VERSION = 3
+
+# Bumped when the row order of stored datasets changes (part of every key)
+LAYOUT_VERSION = 2
+
+# Rows gathered per block when reordering a written dataset
+REORDER_BLOCK_ROWS = 250_000
+
+LABEL_COLUMN = "default_label"
+
+
+@dataclass
+class Dataset:
+    """Features and labels of a stored dataset (memory-mapped, read-only)"""
+
+    X: np.ndarray                # float32 [n_rows, N_FEATURES]
+    y: np.ndarray                # int8 [n_rows]
+    directory: Path
+    manifest: Dict[str, Any]
+
+    def __len__(self) -> int:
+        return len(self.y)
+
+    def train_val_test_split(
+        self,
+        test_size: float = 0.2,
+        val_size: float = 0.1
+    ) -> Tuple[np.ndarray, ...]:
+        """
+        Split into train/validation/test row ranges (views, no copies)
+
+        Rows are stored in stratified random order (see write), so each
+        range is a random sample with the dataset's default rate, as with
+        the stratified generate_train_test_split.
+
+        Returns:
+            (X_train, y_train, X_val, y_val, X_test, y_test)
+        """
+        train, val, test = self.split_ranges(test_size, val_size)
+
+        logger.info(
+            f"Dataset split: Train={train.stop - train.start}, "
+            f"Val={val.stop - val.start}, Test={test.stop - test.start}"
+        )
+
+        return (
+            self.X[train], self.y[train],
+            self.X[val], self.y[val],
+            self.X[test], self.y[test]
+        )
+
+    def split_ranges(self, test_size: float = 0.2, val_size: float = 0.1) -> Tuple[slice, slice, slice]:
+        """(train, val, test) row ranges used by train_val_test_split"""
+        n_test = int(len(self) * test_size)
+        n_val = int(len(self) * val_size)
+        return slice(n_test + n_val, len(self)), slice(n_test, n_test + n_val), slice(0, n_test)
+
+    def chunks(self, rows: slice, chunk_rows: Optional[int] = None) -> RowChunks:
+        """Row range streamed from disk in chunks, for out-of-core training"""
+        return RowChunks(self.directory / "features.npy", self.y[rows], rows=rows, chunk_rows=chunk_rows)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Features and labels as a DataFrame (copies into memory)"""
+        df = pd.DataFrame(np.asarray(self.X), columns=list(FEATURE_NAMES))
+        df[LABEL_COLUMN] = np.asarray(self.y)
+        return df
+
+
+class DatasetStore:
+    """Directory of stored datasets, keyed by the parameters that produced them"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or DATASET_DIR)
+
+    @staticmethod
+    def key_for(params: Dict[str, Any]) -> str:
+        """Dataset key: SHA-256 of the canonical parameter JSON (first 16 hex digits)"""
+        params = {
+            **params,
+            "feature_schema_version": FEATURE_SCHEMA_VERSION,
+            "layout_version": LAYOUT_VERSION
+        }
+        canonical = json.dumps(params, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+    def exists(self, key: str) -> bool:
+        return (self.root / key / MANIFEST_FILE).exists()
+
+    def synthetic(
+        self,
+        n_samples: int,
+        random_seed: int = 42,
+        good_ratio: float = 0.70,
+        medium_ratio: float = 0.20,
+        bad_ratio: float = 0.10,
+        chunk_size: int = 250_000
+    ) -> Dataset:
+        """
+        Synthetic dataset for these parameters, generated and stored on first use
+
+        Generation streams chunks to disk, so peak memory is bounded by
+        chunk_size rather than n_samples.
+        """
+        params = {
+            "source": "synthetic",
+            "generator_version": GENERATOR_VERSION,
+            "n_samples": n_samples,
+            "random_seed": random_seed,
+            "ratios": [good_ratio, medium_ratio, bad_ratio]
+        }
+        key = self.key_for(params)
+
+        if self.exists(key):
+            logger.info(f"Using stored synthetic dataset {key} ({n_samples} rows)")
+            return self.load(key)
+
+        generator = SyntheticDataGenerator(random_seed=random_seed)
+        chunks = generator.iter_chunks(n_samples, good_ratio, medium_ratio, bad_ratio, chunk_size)
+        return self.write(key, chunks, n_samples, params, shuffle_seed=random_seed)
+
+    def import_frame(self, df: pd.DataFrame, name: str, random_seed: int = 42) -> Dataset:
+        """
+        Store a feature DataFrame (schema columns plus default_label)
+
+        Args:
+            df: Features and labels
+            name: Identifies the data (e.g. a file name or export date)
+            random_seed: Seed of the row permutation applied on write
+        """
+        params = {
+            "source": "frame",
+            "name": name,
+            "n_rows": len(df),
+            "content": hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy()).hexdigest(),
+            "random_seed": random_seed
+        }
+        return self.write(self.key_for(params), [df], len(df), params, shuffle_seed=random_seed)
+
+    def import_parquet(self, path: str, random_seed: int = 42, batch_rows: int = 250_000) -> Dataset:
+        """
+        Store a Parquet file or partitioned directory, read in row batches
+
+        Needs pyarrow.
+        """
+        # Imported lazily: only dataset import/export needs pyarrow
+        import pyarrow.dataset as pa_dataset
+
+        source = pa_dataset.dataset(path, format="parquet")
+        n_rows = source.count_rows()
+        params = {
+            "source": "parquet",
+            "path": str(Path(path).resolve()),
+            "modified_ns": os.stat(path).st_mtime_ns,
+            "n_rows": n_rows,
+            "random_seed": random_seed
+        }
+
+        columns = list(FEATURE_NAMES) + [LABEL_COLUMN]
+        chunks = (
+            batch.to_pandas()
+            for batch in source.to_batches(columns=columns, batch_size=batch_rows)
+        )
+        return self.write(self.key_for(params), chunks, n_rows, params, shuffle_seed=random_seed)
+
+    def export_parquet(self, dataset: Dataset, path: str, rows_per_file: int = 1_000_000) -> str:
+        """
+        Write a dataset as a directory of Parquet files (part-00000.parquet, ...)
+
+        Needs pyarrow.
+        """
+        # Imported lazily: only dataset import/export needs pyarrow
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        out_dir = Path(path)
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        for part, start in enumerate(range(0, len(dataset), rows_per_file)):
+            rows = slice(start, start + rows_per_file)
+            arrays = [pa.array(dataset.X[rows, j]) for j in range(N_FEATURES)]
+            arrays.append(pa.array(dataset.y[rows]))
+            table = pa.Table.from_arrays(arrays, names=list(FEATURE_NAMES) + [LABEL_COLUMN])
+            pq.write_table(table, out_dir / f"part-{part:05d}.parquet")
+
+        logger.info(f"Exported dataset {dataset.directory.name} to {out_dir}")
+        return str(out_dir)
+
+    def write(
+        self,
+        key: str,
+        chunks: Iterable[pd.DataFrame],
+        n_rows: int,
+        params: Dict[str, Any],
+        shuffle_seed: int = 0
+    ) -> Dataset:
+        """
+        Write chunks of (features + default_label) frames as dataset `key`
+
+        Chunks are converted to float32 schema layout one at a time and
+        appended to a preallocated memory-mapped file. Rows are then copied
+        block by block into stratified order (see stratified_order, seeded
+        with shuffle_seed), so staging briefly needs twice the dataset's
+        disk space. The dataset is written aside and renamed into place.
+        """
+        dataset_dir = self.root / key
+        staging_dir = dataset_dir.with_name(f".{key}.tmp")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        staging_dir.mkdir(parents=True)
+
+        X_written = np.lib.format.open_memmap(
+            staging_dir / "features.unordered.npy", mode="w+", dtype=np.float32, shape=(n_rows, N_FEATURES)
+        )
+        y_written = np.empty(n_rows, dtype=np.int8)
+
+        written = 0
+        for chunk in chunks:
+            rows = slice(written, written + len(chunk))
+            X_written[rows] = as_feature_matrix(chunk)
+            y_written[rows] = chunk[LABEL_COLUMN].to_numpy()
+            written += len(chunk)
+
+        if written != n_rows:
+            del X_written
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise ValueError(f"Expected {n_rows} rows for dataset {key}, got {written}")
+
+        order = stratified_order(y_written, shuffle_seed)
+        X = np.lib.format.open_memmap(
+            staging_dir / "features.npy", mode="w+", dtype=np.float32, shape=(n_rows, N_FEATURES)
+        )
+        for start in range(0, n_rows, REORDER_BLOCK_ROWS):
+            block = order[start:start + REORDER_BLOCK_ROWS]
+            # Gathering in file order keeps reads of the unordered file sequential
+            by_position = np.argsort(block)
+            X[start + by_position] = X_written[block[by_position]]
+        del X_written
+        (staging_dir / "features.unordered.npy").unlink()
+
+        y = np.lib.format.open_memmap(
+            staging_dir / "labels.npy", mode="w+", dtype=np.int8, shape=(n_rows,)
+        )
+        y[:] = y_written[order]
+
+        manifest = {
+            "key": key,
+            "params": params,
+            "feature_schema_version": FEATURE_SCHEMA_VERSION,
+            "n_rows": n_rows,
+            "n_features": N_FEATURES,
+            "default_rate": float(y.mean()) if n_rows else 0.0
+        }
+        X.flush()
+        y.flush()
+        del X, y
+
+        with open(staging_dir / MANIFEST_FILE, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        # Another process may have stored the same dataset meanwhile
+        if dataset_dir.exists():
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        else:
+            staging_dir.rename(dataset_dir)
+
+        logger.info(f"Stored dataset {key}: {n_rows} rows at {dataset_dir}")
+        return self.load(key)
+
+    def load(self, key: str) -> Dataset:
+        """Open stored dataset `key` memory-mapped"""
+        dataset_dir = self.root / key
+        with open(dataset_dir / MANIFEST_FILE, 'r') as f:
+            manifest = json.load(f)
+
+        if manifest["feature_schema_version"] != FEATURE_SCHEMA_VERSION:
+            raise ValueError(
+                f"Dataset {key} uses feature schema v{manifest['feature_schema_version']}, "
+                f"service uses v{FEATURE_SCHEMA_VERSION}"
+            )
+
+        return Dataset(
+            X=np.load(dataset_dir / "features.npy", mmap_mode="r"),
+            y=np.load(dataset_dir / "labels.npy", mmap_mode="r"),
+            directory=dataset_dir,
+            manifest=manifest
+        )
+
+    def manifests(self) -> Iterator[Dict[str, Any]]:
+        """Manifests of all stored datasets"""
+        for manifest_path in sorted(self.root.glob(f"*/{MANIFEST_FILE}")):
+            with open(manifest_path, 'r') as f:
+                yield json.load(f)
+
+
+def stratified_order(y: np.ndarray, seed: int = 0) -> np.ndarray:
+    """
+    Row permutation spreading each class evenly over the whole range
+
+    Rows of each class are shuffled, and the k-th of n rows of a class is
+    placed at relative position (k + 0.5) / n. Any contiguous range of the
+    reordered rows then holds each class in proportion, to within one row.
+    """
+    rng = np.random.default_rng(seed)
+    position = np.empty(len(y), dtype=np.float64)
+    for label in np.unique(y):
+        rows = np.flatnonzero(y == label)
+        position[rng.permutation(rows)] = (np.arange(len(rows)) + 0.5) / len(rows)
+    return np.argsort(position, kind="stable")
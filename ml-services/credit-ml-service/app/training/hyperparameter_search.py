@@ -0,0 +1,435 @@
+"""
+Hyperparameter Search
+
+Successive halving over any BaseModel: sample n_trials parameter sets,
+score them all with a small training budget, keep the best 1/eta, and
+repeat with eta times the budget until one rung is run at full budget.
+
+- Budget is the model's iteration count (n_estimators for the boosters,
+  max_iter for the neural net); the boosters also early-stop on each
+  fold's validation split.
+- Each rung runs fold 0 first. Trials far outside the survivors (not in
+  the top 2x the number kept) are stopped without running the other folds.
+- Trials run as (trial, fold) tasks on a process pool. Workers receive
+  the data once (inherited on fork), build each fold's arrays on first
+  use and reuse them for every later trial on that fold.
+- Results are logged to MLflow through MLflowManager when one is given.
+
+Usage:
+    python -m app.training.hyperparameter_search --model xgboost --samples 100000 --trials 27
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.features.schema import as_feature_matrix
+from app.models import XGBoostModel, LightGBMModel, NeuralNetModel
+
+logger = logging.getLogger(__name__)
+
+MODEL_TYPES = {
+    "xgboost": XGBoostModel,
+    "lightgbm": LightGBMModel,
+    "neural_net": NeuralNetModel,
+}
+
+# Iteration-count parameter used as the successive-halving budget
+BUDGET_PARAMS = {
+    "xgboost": "n_estimators",
+    "lightgbm": "n_estimators",
+    "neural_net": "max_iter",
+}
+
+# Search spaces: ("int", low, high), ("uniform", low, high),
+# ("log", low, high) (log-uniform) or ("choice", [values])
+SEARCH_SPACES: Dict[str, Dict[str, tuple]] = {
+    "xgboost": {
+        "max_depth": ("int", 3, 9),
+        "learning_rate": ("log", 0.01, 0.3),
+        "min_child_weight": ("choice", [1, 3, 5, 10]),
+        "gamma": ("choice", [0.0, 0.1, 0.5, 1.0]),
+        "subsample": ("uniform", 0.6, 1.0),
+        "colsample_bytree": ("uniform", 0.5, 1.0),
+        "reg_lambda": ("log", 0.1, 10.0),
+    },
+    "lightgbm": {
+        "num_leaves": ("choice", [15, 31, 63, 127]),
+        "learning_rate": ("log", 0.01, 0.3),
+        "min_child_samples": ("choice", [10, 20, 50, 100]),
+        "colsample_bytree": ("uniform", 0.5, 1.0),
+        "reg_alpha": ("log", 1e-3, 1.0),
+        "reg_lambda": ("log", 1e-3, 1.0),
+    },
+    "neural_net": {
+        "hidden_layer_sizes": ("choice", [(32,), (64, 32), (128, 64), (128, 64, 32)]),
+        "alpha": ("log", 1e-5, 1e-2),
+        "learning_rate_init": ("log", 1e-4, 1e-2),
+        "batch_size": ("choice", [128, 256, 512]),
+    },
+}
+
+
+def sample_params(space: Dict[str, tuple], rng: np.random.Generator) -> Dict[str, Any]:
+    """Draw one parameter set from a search space"""
+    params = {}
+    for name, (kind, *args) in space.items():
+        if kind == "int":
+            params[name] = int(rng.integers(args[0], args[1] + 1))
+        elif kind == "uniform":
+            params[name] = float(rng.uniform(args[0], args[1]))
+        elif kind == "log":
+            params[name] = float(np.exp(rng.uniform(np.log(args[0]), np.log(args[1]))))
+        elif kind == "choice":
+            params[name] = args[0][int(rng.integers(len(args[0])))]
+        else:
+            raise ValueError(f"Unknown search space kind for {name}: {kind}")
+    return params
+
+
+@dataclass
+class Trial:
+    """One sampled parameter set and its scores per rung"""
+    trial_id: int
+    params: Dict[str, Any]
+    scores: Dict[int, float] = field(default_factory=dict)   # rung -> mean validation AUC
+    stopped_at: Optional[int] = None                         # rung it was dropped at
+
+    @property
+    def score(self) -> float:
+        return self.scores[max(self.scores)] if self.scores else float("-inf")
+
+
+@dataclass
+class SearchResult:
+    """Outcome of a search"""
+    model_type: str
+    best_params: Dict[str, Any]         # Full hyperparameters (defaults + best trial + budget)
+    best_score: float                   # Mean cross-validated AUC at full budget
+    trials: List[Trial]
+    rungs: List[Dict[str, Any]]         # Budget, trials run, survivors and time per rung
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "model_type": self.model_type,
+            "best_params": self.best_params,
+            "best_score": self.best_score,
+            "rungs": self.rungs,
+            "trials": [
+                {
+                    "trial_id": trial.trial_id,
+                    "params": trial.params,
+                    "scores": trial.scores,
+                    "stopped_at": trial.stopped_at
+                }
+                for trial in self.trials
+            ]
+        }
+
+
+# Per-worker state: the data, fold indices and fold arrays built so far
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(X: np.ndarray, y: np.ndarray, folds: List[Tuple[np.ndarray, np.ndarray]]) -> None:
+    _worker.update(X=X, y=np.asarray(y), folds=folds, cache={})
+
+    # Trial models are throwaway: never checkpoint them
+    os.environ.pop("TRAINING_CHECKPOINT_DIR", None)
+
+
+def _fold_arrays(fold: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(X_train, y_train, X_val, y_val) of a fold, built once per worker"""
+    cache = _worker["cache"]
+    if fold not in cache:
+        train_idx, val_idx = _worker["folds"][fold]
+        X, y = _worker["X"], _worker["y"]
+        cache[fold] = (
+            as_feature_matrix(X[train_idx]), y[train_idx],
+            as_feature_matrix(X[val_idx]), y[val_idx]
+        )
+    return cache[fold]
+
+
+def _run_task(model_type: str, params: Dict[str, Any], fold: int) -> float:
+    """Train on one fold and return its validation AUC"""
+    logging.getLogger("app.models").setLevel(logging.WARNING)
+
+    model = MODEL_TYPES[model_type](hyperparameters=params)
+    metadata = model.train(*_fold_arrays(fold))
+    return float(metadata["val_metrics"]["auc"])
+
+
+class HyperparameterSearch:
+    """
+    Successive-halving search for one model type
+
+    Args:
+        model_type: "xgboost", "lightgbm" or "neural_net"
+        n_trials: Parameter sets sampled for the first rung
+        eta: Keep 1/eta of the trials per rung; budget grows by eta
+        min_budget: Budget of the first rung (default: max_budget / eta^(rungs-1))
+        max_budget: Budget of the last rung (default: the model's default)
+        cv: Cross-validation folds per trial
+        n_workers: Worker processes (default: all CPUs)
+        random_state: Seed for sampling and folds
+        search_space: Overrides SEARCH_SPACES[model_type]
+        mlflow_manager: Logs the search as one MLflow run when given
+    """
+
+    def __init__(
+        self,
+        model_type: str,
+        n_trials: int = 27,
+        eta: int = 3,
+        min_budget: Optional[int] = None,
+        max_budget: Optional[int] = None,
+        cv: int = 3,
+        n_workers: Optional[int] = None,
+        random_state: int = 42,
+        search_space: Optional[Dict[str, tuple]] = None,
+        mlflow_manager: Any = None
+    ):
+        if model_type not in MODEL_TYPES:
+            raise ValueError(f"Unknown model type: {model_type}")
+
+        self.model_type = model_type
+        self.n_trials = n_trials
+        self.eta = eta
+        self.cv = cv
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.random_state = random_state
+        self.search_space = search_space or SEARCH_SPACES[model_type]
+        self.mlflow_manager = mlflow_manager
+
+        self.default_params = dict(MODEL_TYPES[model_type]().params)
+        self.budget_param = BUDGET_PARAMS[model_type]
+        self.budgets = self._budgets(min_budget, max_budget or self.default_params[self.budget_param])
+
+    def _budgets(self, min_budget: Optional[int], max_budget: int) -> List[int]:
+        """Budget per rung: geometric from min_budget up to max_budget"""
+        n_rungs = int(math.log(self.n_trials, self.eta) + 1e-9) + 1
+        if min_budget is not None:
+            n_rungs = min(n_rungs, int(math.log(max_budget / min_budget, self.eta) + 1e-9) + 1)
+
+        return [
+            max(1, int(round(max_budget / self.eta ** (n_rungs - 1 - rung))))
+            for rung in range(n_rungs)
+        ]
+
+    def run(self, X: np.ndarray, y: np.ndarray) -> SearchResult:
+        """
+        Search on (X, y), cross-validated with stratified folds
+
+        X may be a memory-mapped array (e.g. from the dataset store);
+        workers share it rather than receiving copies.
+        """
+        from sklearn.model_selection import StratifiedKFold
+
+        y = np.asarray(y)
+        rng = np.random.default_rng(self.random_state)
+        folds = list(
+            StratifiedKFold(n_splits=self.cv, shuffle=True, random_state=self.random_state)
+            .split(np.zeros(len(y)), y)
+        )
+
+        trials = [
+            Trial(trial_id=i, params=sample_params(self.search_space, rng))
+            for i in range(self.n_trials)
+        ]
+        threads = max(1, (os.cpu_count() or 1) // self.n_workers)
+
+        logger.info(
+            f"Searching {self.model_type}: {self.n_trials} trials, budgets {self.budgets} "
+            f"({self.budget_param}), {self.cv} folds, {self.n_workers} workers x {threads} threads"
+        )
+        self._start_mlflow(len(y))
+
+        rungs = []
+        alive = trials
+        with ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            initializer=_init_worker,
+            initargs=(X, y, folds)
+        ) as pool:
+            for rung, budget in enumerate(self.budgets):
+                started = time.perf_counter()
+                last_rung = rung == len(self.budgets) - 1
+                n_keep = 1 if last_rung else max(1, len(alive) // self.eta)
+
+                # Fold 0 for everyone, then the other folds for promising trials only
+                fold_scores = {trial.trial_id: [] for trial in alive}
+                self._run_folds(pool, alive, budget, [0], threads, fold_scores)
+
+                ranked = sorted(alive, key=lambda t: fold_scores[t.trial_id][0], reverse=True)
+                promising, stopped = ranked[:2 * n_keep], ranked[2 * n_keep:]
+                self._run_folds(pool, promising, budget, list(range(1, self.cv)), threads, fold_scores)
+
+                for trial in alive:
+                    trial.scores[rung] = float(np.mean(fold_scores[trial.trial_id]))
+                for trial in stopped:
+                    trial.stopped_at = rung
+
+                alive = sorted(promising, key=lambda t: t.scores[rung], reverse=True)
+                for trial in alive[n_keep:]:
+                    trial.stopped_at = rung
+                alive = alive[:n_keep]
+
+                rungs.append({
+                    "rung": rung,
+                    "budget": budget,
+                    "trials": len(fold_scores),
+                    "stopped_after_first_fold": len(stopped),
+                    "kept": len(alive),
+                    "best_score": alive[0].scores[rung],
+                    "seconds": round(time.perf_counter() - started, 2)
+                })
+                logger.info(
+                    f"Rung {rung}: {budget} {self.budget_param}, {len(fold_scores)} trials "
+                    f"({len(stopped)} stopped after fold 0), best AUC {alive[0].scores[rung]:.4f}, "
+                    f"{rungs[-1]['seconds']:.1f}s"
+                )
+                self._log_rung(rung, rungs[-1], fold_scores, alive[0])
+
+        best = alive[0]
+        result = SearchResult(
+            model_type=self.model_type,
+            best_params={**self.default_params, **best.params, self.budget_param: self.budgets[-1]},
+            best_score=best.score,
+            trials=trials,
+            rungs=rungs
+        )
+        self._finish_mlflow(result)
+
+        logger.info(f"Best {self.model_type} trial {best.trial_id}: AUC {best.score:.4f} with {best.params}")
+        return result
+
+    def _run_folds(
+        self,
+        pool: ProcessPoolExecutor,
+        trials: List[Trial],
+        budget: int,
+        folds: List[int],
+        threads: int,
+        fold_scores: Dict[int, List[float]]
+    ) -> None:
+        """Run every (trial, fold) task and append the AUCs to fold_scores (fold order)"""
+        futures = []
+        for trial in trials:
+            params = {**self.default_params, **trial.params, self.budget_param: budget}
+            if "n_jobs" in params:
+                params["n_jobs"] = threads
+            for fold in folds:
+                futures.append((trial, pool.submit(_run_task, self.model_type, params, fold)))
+
+        for trial, future in futures:
+            fold_scores[trial.trial_id].append(future.result())
+
+    def _start_mlflow(self, n_rows: int) -> None:
+        if self.mlflow_manager is None:
+            return
+
+        try:
+            self.mlflow_manager.start_run(
+                experiment_name="credit_scoring_hpo",
+                run_name=f"{self.model_type}_search_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            )
+            self.mlflow_manager.log_params({
+                "model_type": self.model_type,
+                "n_trials": self.n_trials,
+                "eta": self.eta,
+                "budgets": self.budgets,
+                "cv_folds": self.cv,
+                "n_rows": n_rows,
+                "random_seed": self.random_state
+            })
+        except Exception as e:
+            logger.warning(f"MLflow search run start failed: {e}")
+            self.mlflow_manager = None
+
+    def _log_rung(
+        self,
+        rung: int,
+        summary: Dict[str, Any],
+        fold_scores: Dict[int, List[float]],
+        best: Trial
+    ) -> None:
+        if self.mlflow_manager is None:
+            return
+
+        metrics = {
+            f"trial_{trial_id}_auc": float(np.mean(scores))
+            for trial_id, scores in fold_scores.items()
+        }
+        metrics.update({
+            "rung_best_auc": best.scores[rung],
+            "rung_budget": summary["budget"],
+            "rung_seconds": summary["seconds"]
+        })
+        try:
+            self.mlflow_manager.log_metrics(metrics, step=rung)
+        except Exception as e:
+            # Tracking is best effort: a failed log must not abort the search
+            logger.warning(f"MLflow rung {rung} logging failed: {e}")
+
+    def _finish_mlflow(self, result: SearchResult) -> None:
+        if self.mlflow_manager is None:
+            return
+
+        try:
+            self.mlflow_manager.log_params({f"best_{k}": v for k, v in result.best_params.items()})
+            self.mlflow_manager.log_metrics({"best_cv_auc": result.best_score})
+            self.mlflow_manager.end_run()
+        except Exception as e:
+            logger.warning(f"MLflow search logging failed: {e}")
+
+
+if __name__ == "__main__":
+    from app.training.dataset_store import DatasetStore
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description="Successive-halving hyperparameter search")
+    parser.add_argument("--model", type=str, default="xgboost", choices=list(MODEL_TYPES))
+    parser.add_argument("--samples", type=int, default=10000, help="Synthetic dataset size")
+    parser.add_argument("--trials", type=int, default=27)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--cv", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", type=str, default=None, help="Write the result as JSON")
+    parser.add_argument("--mlflow", action="store_true", help="Log the search to MLflow")
+    args = parser.parse_args()
+
+    mlflow_manager = None
+    if args.mlflow:
+        from app.mlops.mlflow_client import MLflowManager
+        mlflow_manager = MLflowManager()
+
+    dataset = DatasetStore().synthetic(n_samples=args.samples)
+    X_train, y_train, _, _, _, _ = dataset.train_val_test_split()
+
+    result = HyperparameterSearch(
+        args.model,
+        n_trials=args.trials,
+        eta=args.eta,
+        cv=args.cv,
+        n_workers=args.workers,
+        mlflow_manager=mlflow_manager
+    ).run(X_train, y_train)
+
+    print(json.dumps({"best_params": result.best_params, "best_score": result.best_score}, indent=2, default=str))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result.to_dict(), f, indent=2, default=str)
@@ -12,13 +12,18 @@ Strategy:
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List
-import random
-from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, Tuple
 import logging
 
+from app.features.engineering import FeatureEngineer
+from app.features.schema import FEATURE_NAMES, SECTION_SLICES
+
 logger = logging.getLogger(__name__)
 
+# Rows drawn per generation block. Each block has its own seeded Generator,
+# so the data depends on the seed but not on how it is chunked
+GENERATION_BLOCK_ROWS = 16_384
+
 
 class SyntheticDataGenerator:
     """
@@ -29,11 +34,18 @@ class SyntheticDataGenerator:
     - Banking signals (20)
     - Alert signals (5)
     - Default label (0/1)
+    
+    Generation is column-wise: every feature of a risk tier is drawn with
+    one array call per block of GENERATION_BLOCK_ROWS rows, so millions of
+    rows take seconds. Blocks draw from child Generators of the seed, so a
+    new generator with the same seed gives the same dataset whatever the
+    chunk_size.
     """
     
+    RISK_LEVELS = ("good", "medium", "bad")
+    
     def __init__(self, random_seed: int = 42):
-        np.random.seed(random_seed)
-        random.seed(random_seed)
+        self.rng = np.random.default_rng(random_seed)
         logger.info(f"Synthetic data generator initialized with seed: {random_seed}")
     
     def generate_dataset(
@@ -41,7 +53,8 @@ class SyntheticDataGenerator:
         n_samples: int = 10000,
         good_ratio: float = 0.70,
         medium_ratio: float = 0.20,
-        bad_ratio: float = 0.10
+        bad_ratio: float = 0.10,
+        chunk_size: int = 250_000
     ) -> pd.DataFrame:
         """
         Generate complete dataset
@@ -51,268 +64,383 @@ class SyntheticDataGenerator:
             good_ratio: Fraction of "good" (non-default) profiles
             medium_ratio: Fraction of "medium risk" profiles
             bad_ratio: Fraction of "bad" (default) profiles
+            chunk_size: Rows generated per step (bounds temporary memory)
         
         Returns:
-            DataFrame with features and labels
+            DataFrame with features (schema column order) and labels
         """
         logger.info(f"Generating {n_samples} synthetic profiles...")
         
+        df = pd.concat(
+            self.iter_chunks(n_samples, good_ratio, medium_ratio, bad_ratio, chunk_size),
+            ignore_index=True
+        )
+        
+        logger.info(f"Generated {len(df)} profiles. Default rate: {df['default_label'].mean():.2%}")
+        
+        return df
+    
+    def iter_chunks(
+        self,
+        n_samples: int,
+        good_ratio: float = 0.70,
+        medium_ratio: float = 0.20,
+        bad_ratio: float = 0.10,
+        chunk_size: int = 250_000
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Generate the dataset as consecutive schema frames of chunk_size rows
+        
+        Tier counts are exact over the whole dataset and the tiers are
+        shuffled across it (not per chunk). Rows are drawn in fixed blocks
+        and sliced into chunks, so chunk_size only changes how the same
+        rows are split.
+        """
         # Calculate counts
         n_good = int(n_samples * good_ratio)
         n_medium = int(n_samples * medium_ratio)
         n_bad = n_samples - n_good - n_medium
+        logger.info(f"Profiles: {n_good} good, {n_medium} medium, {n_bad} bad")
         
-        profiles = []
+        # Shuffled risk tier of every row (indexes RISK_LEVELS)
+        tiers = np.repeat(np.arange(3, dtype=np.int8), [n_good, n_medium, n_bad])
+        self.rng.shuffle(tiers)
         
-        # Generate good profiles
-        logger.info(f"Generating {n_good} good profiles...")
-        for _ in range(n_good):
-            profiles.append(self._generate_profile("good"))
+        # Entropy of the block Generators (drawn once, so successive
+        # datasets from one generator still differ)
+        block_entropy = int(self.rng.integers(2**63))
+        block = (-1, None, None)  # (index, values, labels) of the last generated block
         
-        # Generate medium profiles
-        logger.info(f"Generating {n_medium} medium profiles...")
-        for _ in range(n_medium):
-            profiles.append(self._generate_profile("medium"))
+        for start in range(0, n_samples, chunk_size):
+            stop = min(start + chunk_size, n_samples)
+            values, labels = [], []
+            
+            for index in range(start // GENERATION_BLOCK_ROWS, (stop - 1) // GENERATION_BLOCK_ROWS + 1):
+                block_start = index * GENERATION_BLOCK_ROWS
+                if block[0] != index:
+                    rng = np.random.default_rng(np.random.SeedSequence(block_entropy, spawn_key=(index,)))
+                    block = (index, *self._generate_block(tiers[block_start:block_start + GENERATION_BLOCK_ROWS], rng))
+                rows = slice(max(start, block_start) - block_start, stop - block_start)
+                values.append(block[1][rows])
+                labels.append(block[2][rows])
+            
+            yield self._to_schema_frame(np.concatenate(values), np.concatenate(labels), index_start=start)
+    
+    def _generate_block(self, block_tiers: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Source features and labels of one block of rows
         
-        # Generate bad profiles
-        logger.info(f"Generating {n_bad} bad profiles...")
-        for _ in range(n_bad):
-            profiles.append(self._generate_profile("bad"))
+        Args:
+            block_tiers: Risk tier of each row (indexes RISK_LEVELS)
+            rng: Generator of this block
         
-        # Shuffle
-        random.shuffle(profiles)
+        Returns:
+            (values [n_rows, n_source_features] in schema order, labels [n_rows])
+        """
+        source_names = FEATURE_NAMES[:SECTION_SLICES['derived'].start]
+        # Column-major: each feature column is filled with contiguous writes
+        values = np.empty((len(block_tiers), len(source_names)), dtype=np.float64, order='F')
+        labels = np.empty(len(block_tiers), dtype=np.int64)
         
-        # Convert to DataFrame
-        df = pd.DataFrame(profiles)
+        for tier, risk_level in enumerate(self.RISK_LEVELS):
+            rows = np.flatnonzero(block_tiers == tier)
+            if len(rows) == 0:
+                continue
+            columns = self._generate_tier(risk_level, len(rows), rng)
+            for j, name in enumerate(source_names):
+                values[rows, j] = columns[name]
+            labels[rows] = columns["default_label"]
         
-        logger.info(f"Generated {len(df)} profiles. Default rate: {df['default_label'].mean():.2%}")
+        return values, labels
+    
+    def write_csv(self, path: str, n_samples: int, chunk_size: int = 250_000, **ratios) -> str:
+        """
+        Generate a dataset straight to CSV, one chunk at a time
         
-        return df
+        Memory stays bounded by chunk_size regardless of n_samples.
+        ratios are passed to iter_chunks (good_ratio, medium_ratio, bad_ratio).
+        """
+        for i, chunk in enumerate(self.iter_chunks(n_samples, chunk_size=chunk_size, **ratios)):
+            chunk.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        
+        logger.info(f"Wrote {n_samples} synthetic profiles to {path}")
+        return path
     
-    def _generate_profile(self, risk_level: str) -> Dict[str, Any]:
+    @staticmethod
+    def _to_schema_frame(values: np.ndarray, labels: np.ndarray, index_start: int = 0) -> pd.DataFrame:
         """
-        Generate a single credit profile
+        Add derived features and order columns as in the feature schema
+        
+        Synthetic profiles always carry GST and banking data, so the
+        missing indicators and completeness match a fully populated profile.
+        
+        Args:
+            values: Source features in schema order [n_rows, n_source_features]
+            labels: Default labels [n_rows]
+            index_start: Index of the first row (chunks continue the index)
+        """
+        n_rows = len(values)
+        derived = FeatureEngineer.compute_derived_features(
+            values,
+            has_gst=np.ones(n_rows, dtype=bool),
+            has_banking=np.ones(n_rows, dtype=bool),
+            data_completeness=np.full(n_rows, 100.0)
+        )
+        
+        # Column-major float32, the layout of a single-block DataFrame (no transpose copy)
+        matrix = np.empty((n_rows, len(FEATURE_NAMES)), dtype=np.float32, order='F')
+        matrix[:, :values.shape[1]] = values
+        matrix[:, values.shape[1]:] = derived
+        
+        features = pd.DataFrame(
+            matrix,
+            columns=list(FEATURE_NAMES),
+            index=pd.RangeIndex(index_start, index_start + n_rows)
+        )
+        features["default_label"] = labels
+        return features
+    
+    def _generate_tier(self, risk_level: str, n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """
+        Generate n credit profiles of one risk level, column-wise
         
         Args:
             risk_level: "good", "medium", or "bad"
+            n: Number of profiles
+            rng: Generator the profiles are drawn from
         
         Returns:
-            Dictionary with all features and label
+            Dictionary with an array per feature and the label
         """
-        profile = {}
+        columns = {}
         
         # Generate GST signals
-        profile.update(self._generate_gst_signals(risk_level))
+        columns.update(self._generate_gst_signals(risk_level, n, rng))
         
         # Generate banking signals
-        profile.update(self._generate_banking_signals(risk_level))
+        columns.update(self._generate_banking_signals(risk_level, n, rng))
         
         # Generate alert signals
-        profile.update(self._generate_alert_signals(risk_level))
+        columns.update(self._generate_alert_signals(risk_level, n, rng))
         
         # Generate composite scores
-        profile.update(self._generate_score_signals(risk_level))
+        columns.update(self._generate_score_signals(risk_level, n, rng))
         
         # Default label
         if risk_level == "good":
-            profile["default_label"] = 0
+            columns["default_label"] = np.zeros(n, dtype=np.int64)
         elif risk_level == "medium":
-            profile["default_label"] = 1 if random.random() < 0.3 else 0  # 30% default
+            columns["default_label"] = (rng.random(n) < 0.3).astype(np.int64)  # 30% default
         else:  # bad
-            profile["default_label"] = 1 if random.random() < 0.8 else 0  # 80% default
+            columns["default_label"] = (rng.random(n) < 0.8).astype(np.int64)  # 80% default
+        
+        return columns
+    
+    @staticmethod
+    def _samplers(rng: np.random.Generator, n: int) -> Tuple[Callable, Callable, np.ndarray]:
+        """Array draws for one tier: uniform(low, high), flag(p) (1 with probability p, else 0), zeros"""
+        def uniform(low: float, high: float) -> np.ndarray:
+            return rng.uniform(low, high, n)
+        
+        def flag(p: float) -> np.ndarray:
+            return (rng.random(n) < p).astype(np.float64)
         
-        return profile
+        return uniform, flag, np.zeros(n)
     
-    def _generate_gst_signals(self, risk_level: str) -> Dict[str, float]:
+    def _generate_gst_signals(self, risk_level: str, n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
         """Generate 50 GST features based on risk level"""
+        uniform, flag, zeros = self._samplers(rng, n)
         
         if risk_level == "good":
             # Strong GST performance
-            gst_score = np.random.uniform(70, 95)
-            cagr = np.random.uniform(10, 50)
-            monthly_avg = np.random.uniform(0.5, 0.9)  # Normalized
-            compliance_score = np.random.uniform(80, 100)
-            fraud_score = np.random.uniform(80, 100)
-            bounce_rate = np.random.uniform(0, 0.02)
+            gst_score = uniform(70, 95)
+            cagr = uniform(10, 50)
+            monthly_avg = uniform(0.5, 0.9)  # Normalized
+            compliance_score = uniform(80, 100)
+            fraud_score = uniform(80, 100)
+            bounce_rate = uniform(0, 0.02)
             
         elif risk_level == "medium":
             # Moderate GST performance
-            gst_score = np.random.uniform(45, 70)
-            cagr = np.random.uniform(-10, 20)
-            monthly_avg = np.random.uniform(0.3, 0.6)
-            compliance_score = np.random.uniform(50, 80)
-            fraud_score = np.random.uniform(50, 80)
-            bounce_rate = np.random.uniform(0.02, 0.05)
+            gst_score = uniform(45, 70)
+            cagr = uniform(-10, 20)
+            monthly_avg = uniform(0.3, 0.6)
+            compliance_score = uniform(50, 80)
+            fraud_score = uniform(50, 80)
+            bounce_rate = uniform(0.02, 0.05)
             
         else:  # bad
             # Poor GST performance
-            gst_score = np.random.uniform(20, 45)
-            cagr = np.random.uniform(-50, 0)
-            monthly_avg = np.random.uniform(0.1, 0.4)
-            compliance_score = np.random.uniform(20, 50)
-            fraud_score = np.random.uniform(20, 50)
-            bounce_rate = np.random.uniform(0.05, 0.15)
+            gst_score = uniform(20, 45)
+            cagr = uniform(-50, 0)
+            monthly_avg = uniform(0.1, 0.4)
+            compliance_score = uniform(20, 50)
+            fraud_score = uniform(20, 50)
+            bounce_rate = uniform(0.05, 0.15)
         
         # Normalize to 0-1
         return {
             "gst_overall_score": gst_score / 100,
             "gst_cagr": np.clip((cagr + 50) / 150, 0, 1),  # -50 to 100 → 0 to 1
-            "gst_mom_growth": np.random.uniform(0.3, 0.7),
+            "gst_mom_growth": uniform(0.3, 0.7),
             "gst_monthly_avg": monthly_avg,
-            "gst_seasonality": np.random.uniform(0.4, 0.6),
-            "gst_hhi": np.random.uniform(0.3, 0.7),
-            "gst_avg_transaction": np.random.uniform(0.3, 0.7),
-            "gst_b2b_ratio": np.random.uniform(0.4, 0.8),
-            "gst_export_pct": np.random.uniform(0, 0.3),
-            "gst_interstate_pct": np.random.uniform(0.2, 0.5),
+            "gst_seasonality": uniform(0.4, 0.6),
+            "gst_hhi": uniform(0.3, 0.7),
+            "gst_avg_transaction": uniform(0.3, 0.7),
+            "gst_b2b_ratio": uniform(0.4, 0.8),
+            "gst_export_pct": uniform(0, 0.3),
+            "gst_interstate_pct": uniform(0.2, 0.5),
             
             "gst_compliance_score": compliance_score / 100,
-            "gst_filing_regularity": np.random.uniform(0.7, 1.0) if risk_level == "good" else np.random.uniform(0.3, 0.7),
-            "gst_late_filing_count": np.random.uniform(0, 0.1) if risk_level == "good" else np.random.uniform(0.2, 0.8),
-            "gst_tax_timeliness": np.random.uniform(0.7, 1.0) if risk_level == "good" else np.random.uniform(0.3, 0.7),
-            "gst_outstanding_dues": np.random.uniform(0, 0.2) if risk_level == "good" else np.random.uniform(0.3, 0.8),
-            "gst_penalty_count": np.random.uniform(0, 0.1) if risk_level == "good" else np.random.uniform(0.2, 0.6),
-            "gst_notice_count": np.random.uniform(0, 0.1) if risk_level == "good" else np.random.uniform(0.2, 0.6),
-            "gst_refund_claims": np.random.uniform(0, 0.3),
-            "gst_itc_utilization": np.random.uniform(0.6, 0.9),
-            "gst_itc_reversal_freq": np.random.uniform(0, 0.2),
-            "gst_amendment_freq": np.random.uniform(0, 0.2),
+            "gst_filing_regularity": uniform(0.7, 1.0) if risk_level == "good" else uniform(0.3, 0.7),
+            "gst_late_filing_count": uniform(0, 0.1) if risk_level == "good" else uniform(0.2, 0.8),
+            "gst_tax_timeliness": uniform(0.7, 1.0) if risk_level == "good" else uniform(0.3, 0.7),
+            "gst_outstanding_dues": uniform(0, 0.2) if risk_level == "good" else uniform(0.3, 0.8),
+            "gst_penalty_count": uniform(0, 0.1) if risk_level == "good" else uniform(0.2, 0.6),
+            "gst_notice_count": uniform(0, 0.1) if risk_level == "good" else uniform(0.2, 0.6),
+            "gst_refund_claims": uniform(0, 0.3),
+            "gst_itc_utilization": uniform(0.6, 0.9),
+            "gst_itc_reversal_freq": uniform(0, 0.2),
+            "gst_amendment_freq": uniform(0, 0.2),
             "gst_consistency_score": compliance_score / 100,
             
-            "gst_customer_count": np.random.uniform(0.3, 0.8),
-            "gst_supplier_count": np.random.uniform(0.3, 0.8),
-            "gst_customer_hhi": np.random.uniform(0.3, 0.7),
-            "gst_supplier_hhi": np.random.uniform(0.3, 0.7),
-            "gst_geographic_diversity": np.random.uniform(0.4, 0.8),
-            "gst_top5_customer_pct": np.random.uniform(0.3, 0.7),
-            "gst_top5_supplier_pct": np.random.uniform(0.3, 0.7),
-            "gst_new_customer_rate": np.random.uniform(0.1, 0.3),
-            "gst_customer_churn": np.random.uniform(0.05, 0.2),
-            "gst_network_score": np.random.uniform(0.5, 0.9) if risk_level == "good" else np.random.uniform(0.2, 0.5),
+            "gst_customer_count": uniform(0.3, 0.8),
+            "gst_supplier_count": uniform(0.3, 0.8),
+            "gst_customer_hhi": uniform(0.3, 0.7),
+            "gst_supplier_hhi": uniform(0.3, 0.7),
+            "gst_geographic_diversity": uniform(0.4, 0.8),
+            "gst_top5_customer_pct": uniform(0.3, 0.7),
+            "gst_top5_supplier_pct": uniform(0.3, 0.7),
+            "gst_new_customer_rate": uniform(0.1, 0.3),
+            "gst_customer_churn": uniform(0.05, 0.2),
+            "gst_network_score": uniform(0.5, 0.9) if risk_level == "good" else uniform(0.2, 0.5),
             
             "gst_fraud_score": fraud_score / 100,
-            "gst_circular_trading": 1 if (risk_level == "bad" and random.random() < 0.3) else 0,
-            "gst_fake_invoice": 1 if (risk_level == "bad" and random.random() < 0.2) else 0,
+            "gst_circular_trading": flag(0.3) if risk_level == "bad" else zeros,
+            "gst_fake_invoice": flag(0.2) if risk_level == "bad" else zeros,
             "gst_gstr_mismatch": bounce_rate,
-            "gst_itc_anomaly": 1 if (risk_level == "bad" and random.random() < 0.2) else 0,
-            "gst_dormant_periods": np.random.uniform(0, 0.1) if risk_level == "good" else np.random.uniform(0.2, 0.5),
-            "gst_activity_spikes": np.random.uniform(0, 0.1) if risk_level == "good" else np.random.uniform(0.2, 0.5),
-            "gst_related_party_txn": np.random.uniform(0, 0.3),
+            "gst_itc_anomaly": flag(0.2) if risk_level == "bad" else zeros,
+            "gst_dormant_periods": uniform(0, 0.1) if risk_level == "good" else uniform(0.2, 0.5),
+            "gst_activity_spikes": uniform(0, 0.1) if risk_level == "good" else uniform(0.2, 0.5),
+            "gst_related_party_txn": uniform(0, 0.3),
             
-            "gst_ccc_days": np.random.uniform(0.3, 0.5),
-            "gst_dso_days": np.random.uniform(0.3, 0.6),
-            "gst_dio_days": np.random.uniform(0.3, 0.6),
-            "gst_dpo_days": np.random.uniform(0.3, 0.6),
-            "gst_wc_trend": np.random.uniform(0.4, 0.7),
-            "gst_wc_score": np.random.uniform(0.5, 0.9) if risk_level == "good" else np.random.uniform(0.2, 0.5),
+            "gst_ccc_days": uniform(0.3, 0.5),
+            "gst_dso_days": uniform(0.3, 0.6),
+            "gst_dio_days": uniform(0.3, 0.6),
+            "gst_dpo_days": uniform(0.3, 0.6),
+            "gst_wc_trend": uniform(0.4, 0.7),
+            "gst_wc_score": uniform(0.5, 0.9) if risk_level == "good" else uniform(0.2, 0.5),
             
-            "gst_business_age_years": np.random.uniform(0.2, 0.8),
-            "gst_reg_type_pvt": random.choice([0, 1]),
-            "gst_industry_benchmark": np.random.uniform(0.4, 0.7),
-            "gst_peer_rank": np.random.uniform(0.3, 0.7),
+            "gst_business_age_years": uniform(0.2, 0.8),
+            "gst_reg_type_pvt": rng.integers(0, 2, n).astype(np.float64),
+            "gst_industry_benchmark": uniform(0.4, 0.7),
+            "gst_peer_rank": uniform(0.3, 0.7),
         }
     
-    def _generate_banking_signals(self, risk_level: str) -> Dict[str, float]:
+    def _generate_banking_signals(self, risk_level: str, n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
         """Generate 22 banking features based on risk level"""
+        uniform, flag, zeros = self._samplers(rng, n)
         
         if risk_level == "good":
             # Strong banking performance
-            income = np.random.uniform(0.6, 0.9)
-            bounce_rate = np.random.uniform(0, 0.02)
-            savings_rate = np.random.uniform(0.15, 0.35)
-            liquidity_buffer = np.random.uniform(0.5, 0.9)
+            income = uniform(0.6, 0.9)
+            bounce_rate = uniform(0, 0.02)
+            savings_rate = uniform(0.15, 0.35)
+            liquidity_buffer = uniform(0.5, 0.9)
             
         elif risk_level == "medium":
-            income = np.random.uniform(0.4, 0.6)
-            bounce_rate = np.random.uniform(0.02, 0.08)
-            savings_rate = np.random.uniform(0.05, 0.15)
-            liquidity_buffer = np.random.uniform(0.2, 0.5)
+            income = uniform(0.4, 0.6)
+            bounce_rate = uniform(0.02, 0.08)
+            savings_rate = uniform(0.05, 0.15)
+            liquidity_buffer = uniform(0.2, 0.5)
             
         else:  # bad
-            income = np.random.uniform(0.2, 0.4)
-            bounce_rate = np.random.uniform(0.08, 0.20)
-            savings_rate = np.random.uniform(0, 0.05)
-            liquidity_buffer = np.random.uniform(0, 0.2)
+            income = uniform(0.2, 0.4)
+            bounce_rate = uniform(0.08, 0.20)
+            savings_rate = uniform(0, 0.05)
+            liquidity_buffer = uniform(0, 0.2)
         
         return {
             "bank_monthly_income": income,
-            "bank_income_stability": np.random.uniform(0.6, 0.9) if risk_level == "good" else np.random.uniform(0.3, 0.6),
-            "bank_monthly_expense": np.random.uniform(0.4, 0.7),
-            "bank_net_cash_flow": income * np.random.uniform(0.1, 0.3),
-            "bank_cash_trend": np.random.uniform(0.5, 0.8) if risk_level == "good" else np.random.uniform(0.2, 0.5),
-            "bank_cash_volatility": np.random.uniform(0.6, 0.9) if risk_level == "good" else np.random.uniform(0.3, 0.6),
+            "bank_income_stability": uniform(0.6, 0.9) if risk_level == "good" else uniform(0.3, 0.6),
+            "bank_monthly_expense": uniform(0.4, 0.7),
+            "bank_net_cash_flow": income * uniform(0.1, 0.3),
+            "bank_cash_trend": uniform(0.5, 0.8) if risk_level == "good" else uniform(0.2, 0.5),
+            "bank_cash_volatility": uniform(0.6, 0.9) if risk_level == "good" else uniform(0.3, 0.6),
             
-            "bank_emi_amount": np.random.uniform(0.2, 0.5),
-            "bank_rent_fixed": np.random.uniform(0.2, 0.4),
-            "bank_discretionary": np.random.uniform(0.1, 0.3),
+            "bank_emi_amount": uniform(0.2, 0.5),
+            "bank_rent_fixed": uniform(0.2, 0.4),
+            "bank_discretionary": uniform(0.1, 0.3),
             "bank_bounce_rate": bounce_rate,  # CRITICAL FEATURE
-            "bank_overdraft_usage": np.random.uniform(0, 0.1) if risk_level == "good" else np.random.uniform(0.2, 0.6),
+            "bank_overdraft_usage": uniform(0, 0.1) if risk_level == "good" else uniform(0.2, 0.6),
             
             "bank_savings_rate": savings_rate,
-            "bank_avg_balance": income * np.random.uniform(1.5, 3.0),
-            "bank_min_balance": income * np.random.uniform(0.5, 1.5),
-            "bank_balance_trend": np.random.uniform(0.5, 0.8) if risk_level == "good" else np.random.uniform(0.2, 0.5),
+            "bank_avg_balance": income * uniform(1.5, 3.0),
+            "bank_min_balance": income * uniform(0.5, 1.5),
+            "bank_balance_trend": uniform(0.5, 0.8) if risk_level == "good" else uniform(0.2, 0.5),
             
-            "bank_account_age_years": np.random.uniform(0.3, 0.9),
-            "bank_relationships": np.random.uniform(0.2, 0.6),
-            "bank_digital_activity": np.random.uniform(0.5, 0.9),
+            "bank_account_age_years": uniform(0.3, 0.9),
+            "bank_relationships": uniform(0.2, 0.6),
+            "bank_digital_activity": uniform(0.5, 0.9),
             
             "bank_liquidity_buffer": liquidity_buffer,
-            "bank_emergency_fund": np.random.uniform(0.5, 0.9) if risk_level == "good" else np.random.uniform(0.2, 0.5),
+            "bank_emergency_fund": uniform(0.5, 0.9) if risk_level == "good" else uniform(0.2, 0.5),
             
-            "bank_overall_score": np.random.uniform(0.7, 0.95) if risk_level == "good" else (
-                np.random.uniform(0.45, 0.7) if risk_level == "medium" else np.random.uniform(0.2, 0.45)
+            "bank_overall_score": uniform(0.7, 0.95) if risk_level == "good" else (
+                uniform(0.45, 0.7) if risk_level == "medium" else uniform(0.2, 0.45)
             ),
-            "bank_data_fresh": 1 if random.random() < 0.8 else 0.5,
+            "bank_data_fresh": np.where(rng.random(n) < 0.8, 1.0, 0.5),
         }
     
-    def _generate_alert_signals(self, risk_level: str) -> Dict[str, float]:
+    def _generate_alert_signals(self, risk_level: str, n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
         """Generate 5 alert features"""
+        uniform, flag, zeros = self._samplers(rng, n)
         
         if risk_level == "good":
             return {
-                "alert_critical_count": 0,
-                "alert_warning_count": np.random.uniform(0, 0.1),
-                "alert_has_emi_bounce": 0,
-                "alert_has_cash_drop": 0,
-                "alert_total_count": np.random.uniform(0, 0.1),
+                "alert_critical_count": zeros,
+                "alert_warning_count": uniform(0, 0.1),
+                "alert_has_emi_bounce": zeros,
+                "alert_has_cash_drop": zeros,
+                "alert_total_count": uniform(0, 0.1),
             }
         elif risk_level == "medium":
             return {
-                "alert_critical_count": np.random.uniform(0, 0.2),
-                "alert_warning_count": np.random.uniform(0.1, 0.4),
-                "alert_has_emi_bounce": 1 if random.random() < 0.2 else 0,
-                "alert_has_cash_drop": 1 if random.random() < 0.3 else 0,
-                "alert_total_count": np.random.uniform(0.2, 0.5),
+                "alert_critical_count": uniform(0, 0.2),
+                "alert_warning_count": uniform(0.1, 0.4),
+                "alert_has_emi_bounce": flag(0.2),
+                "alert_has_cash_drop": flag(0.3),
+                "alert_total_count": uniform(0.2, 0.5),
             }
         else:  # bad
             return {
-                "alert_critical_count": np.random.uniform(0.3, 0.7),
-                "alert_warning_count": np.random.uniform(0.4, 0.8),
-                "alert_has_emi_bounce": 1 if random.random() < 0.6 else 0,
-                "alert_has_cash_drop": 1 if random.random() < 0.5 else 0,
-                "alert_total_count": np.random.uniform(0.5, 1.0),
+                "alert_critical_count": uniform(0.3, 0.7),
+                "alert_warning_count": uniform(0.4, 0.8),
+                "alert_has_emi_bounce": flag(0.6),
+                "alert_has_cash_drop": flag(0.5),
+                "alert_total_count": uniform(0.5, 1.0),
             }
     
-    def _generate_score_signals(self, risk_level: str) -> Dict[str, float]:
+    def _generate_score_signals(self, risk_level: str, n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
         """Generate 5 composite score features"""
+        uniform, flag, zeros = self._samplers(rng, n)
         
         if risk_level == "good":
-            overall = np.random.uniform(0.75, 0.95)
+            overall = uniform(0.75, 0.95)
         elif risk_level == "medium":
-            overall = np.random.uniform(0.50, 0.75)
+            overall = uniform(0.50, 0.75)
         else:
-            overall = np.random.uniform(0.20, 0.50)
+            overall = uniform(0.20, 0.50)
         
-        gst_score = overall + np.random.uniform(-0.1, 0.1)
-        bank_score = overall + np.random.uniform(-0.1, 0.1)
+        gst_score = overall + uniform(-0.1, 0.1)
+        bank_score = overall + uniform(-0.1, 0.1)
         
         return {
             "score_gst": np.clip(gst_score, 0, 1),
             "score_banking": np.clip(bank_score, 0, 1),
-            "score_alert_penalty": np.random.uniform(0.8, 1.0) if risk_level == "good" else np.random.uniform(0.4, 0.8),
+            "score_alert_penalty": uniform(0.8, 1.0) if risk_level == "good" else uniform(0.4, 0.8),
             "score_overall": overall,
-            "score_confidence": np.random.uniform(0.7, 0.95),
+            "score_confidence": uniform(0.7, 0.95),
         }
 
 
@@ -14,10 +14,14 @@ import pandas as pd
 import json
 from datetime import datetime
 import os
+import numpy as np
 
-from app.training.synthetic_data import SyntheticDataGenerator, generate_train_test_split
-from app.models import XGBoostModel, LightGBMModel, EnsembleModel
+from app.training.dataset_store import DatasetStore
+from app.training.hyperparameter_search import HyperparameterSearch
+from app.models import XGBoostModel, LightGBMModel, NeuralNetModel, EnsembleModel
 from app.mlops.mlflow_client import MLflowManager
+from app.mlops.drift_detection import DriftDetector
+from app.mlops.quantile_sketch import FeatureSketches
 
 logging.basicConfig(
     level=logging.INFO,
@@ -30,16 +34,24 @@ def train_and_evaluate(
     model_type: str = "ensemble",
     n_samples: int = 10000,
     model_dir: str = "./models",
-    use_mlflow: bool = True
+    use_mlflow: bool = True,
+    data_dir: str = None,
+    streaming: bool = False,
+    tune_trials: int = 0
 ):
     """
     Complete training pipeline with MLflow tracking
     
     Args:
-        model_type: "xgboost", "lightgbm", or "ensemble"
+        model_type: "xgboost", "lightgbm", "neural_net", or "ensemble"
         n_samples: Number of synthetic samples to generate
         model_dir: Directory to save trained models
         use_mlflow: Whether to log to MLflow
+        data_dir: Dataset store directory (defaults to DATASET_DIR)
+        streaming: Train boosters out of core, streaming the training rows
+            from disk in chunks (xgboost, lightgbm, ensemble without neural net)
+        tune_trials: Run a successive-halving hyperparameter search with this
+            many trials per base model on the training split first (0: off)
     """
     
     logger.info("=" * 80)
@@ -56,18 +68,17 @@ def train_and_evaluate(
             logger.warning(f"MLflow initialization failed: {e}. Continuing without MLflow.")
             use_mlflow = False
     
-    # Step 1: Generate synthetic data
-    logger.info(f"\n[1/5] Generating {n_samples} synthetic profiles...")
-    generator = SyntheticDataGenerator(random_seed=42)
-    df = generator.generate_dataset(n_samples=n_samples)
+    # Step 1: Synthetic data (generated once per parameter set, then memory-mapped)
+    logger.info(f"\n[1/5] Loading {n_samples} synthetic profiles...")
+    dataset = DatasetStore(data_dir).synthetic(n_samples=n_samples, random_seed=42)
     
-    logger.info(f"Dataset generated: {df.shape}")
-    logger.info(f"Default rate: {df['default_label'].mean():.2%}")
-    logger.info(f"Features: {df.shape[1] - 1}")
+    logger.info(f"Dataset: {dataset.X.shape} ({dataset.directory})")
+    logger.info(f"Default rate: {dataset.manifest['default_rate']:.2%}")
+    logger.info(f"Features: {dataset.X.shape[1]}")
     
-    # Step 2: Train/val/test split
+    # Step 2: Train/val/test split (row ranges of the mapped arrays, no copies)
     logger.info("\n[2/5] Splitting into train/val/test...")
-    X_train, y_train, X_val, y_val, X_test, y_test = generate_train_test_split(df)
+    X_train, y_train, X_val, y_val, X_test, y_test = dataset.train_val_test_split()
     
     logger.info(f"Train set: {len(X_train)} samples ({y_train.mean():.2%} default)")
     logger.info(f"Val set: {len(X_val)} samples ({y_val.mean():.2%} default)")
@@ -80,11 +91,33 @@ def train_and_evaluate(
         model = XGBoostModel(version="1.0.0")
     elif model_type == "lightgbm":
         model = LightGBMModel(version="1.0.0")
+    elif model_type == "neural_net":
+        model = NeuralNetModel(version="1.0.0")
     elif model_type == "ensemble":
-        model = EnsembleModel(version="1.0.0", use_neural_net=False)
+        model = EnsembleModel(
+            version="1.0.0",
+            use_neural_net=os.getenv("USE_NEURAL_NET", "false").lower() == "true"
+        )
     else:
         raise ValueError(f"Unknown model type: {model_type}")
     
+    if streaming and not hasattr(model, "train_streaming"):
+        raise ValueError(f"{model_type} does not support streaming training")
+    
+    if tune_trials:
+        components = (
+            [m for m in (model.xgboost, model.lightgbm, model.neural_net) if m is not None]
+            if model_type == "ensemble" else [model]
+        )
+        for component in components:
+            result = HyperparameterSearch(
+                component.model_name,
+                n_trials=tune_trials,
+                mlflow_manager=mlflow_manager
+            ).run(X_train, y_train)
+            component.params = result.best_params
+            logger.info(f"Tuned {component.model_name}: CV AUC {result.best_score:.4f}")
+    
     # Start MLflow run
     run_id = None
     if use_mlflow and mlflow_manager:
@@ -122,7 +155,11 @@ def train_and_evaluate(
     
     # Step 4: Train model
     logger.info(f"\n[4/5] Training {model_type} model...")
-    train_metrics = model.train(X_train, y_train, X_val, y_val)
+    if streaming:
+        train_rows, _, _ = dataset.split_ranges()
+        train_metrics = model.train_streaming(dataset.chunks(train_rows), X_val, y_val)
+    else:
+        train_metrics = model.train(X_train, y_train, X_val, y_val)
     
     logger.info("\n" + "=" * 60)
     logger.info("TRAINING RESULTS")
@@ -197,6 +234,10 @@ def train_and_evaluate(
     model_path = model.save(model_dir)
     logger.info(f"Model saved to: {model_path}")
     
+    # Drift reference: quantile sketches of the training features and predictions
+    reference_path = _save_drift_reference(model, X_train, model_dir)
+    logger.info(f"Drift reference saved to: {reference_path}")
+    
     # Log model to MLflow
     if use_mlflow and mlflow_manager:
         try:
@@ -254,13 +295,29 @@ def train_and_evaluate(
     return model, test_metrics
 
 
+def _save_drift_reference(model, X_train, model_dir: str, chunk_rows: int = 250_000) -> str:
+    """
+    Sketch the training rows and their predictions in one chunked pass
+    and save them as the drift reference ({model_dir}/drift_reference.json)
+    """
+    sketches = FeatureSketches()
+    for start in range(0, len(X_train), chunk_rows):
+        chunk = np.asarray(X_train[start:start + chunk_rows])
+        sketches.update(chunk)
+        sketches.update_column("predictions", model.predict_proba(chunk))
+    
+    reference_path = str(Path(model_dir) / "drift_reference.json")
+    DriftDetector().save_reference_sketches(sketches, reference_path)
+    return reference_path
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Train credit scoring models")
     parser.add_argument(
         "--model",
         type=str,
         default="ensemble",
-        choices=["xgboost", "lightgbm", "ensemble"],
+        choices=["xgboost", "lightgbm", "neural_net", "ensemble"],
         help="Model type to train"
     )
     parser.add_argument(
@@ -275,6 +332,23 @@ if __name__ == "__main__":
         default="./models",
         help="Directory to save trained models"
     )
+    parser.add_argument(
+        "--data-dir",
+        type=str,
+        default=None,
+        help="Dataset store directory (default: DATASET_DIR or ./data/datasets)"
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Stream training rows from disk (out-of-core boosters)"
+    )
+    parser.add_argument(
+        "--tune-trials",
+        type=int,
+        default=0,
+        help="Tune hyperparameters first with this many search trials per model (0: off)"
+    )
     parser.add_argument(
         "--no-mlflow",
         action="store_true",
@@ -287,5 +361,8 @@ if __name__ == "__main__":
         model_type=args.model,
         n_samples=args.samples,
         model_dir=args.model_dir,
-        use_mlflow=not args.no_mlflow
+        use_mlflow=not args.no_mlflow,
+        data_dir=args.data_dir,
+        streaming=args.streaming,
+        tune_trials=args.tune_trials
     )
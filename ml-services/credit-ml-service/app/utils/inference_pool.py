@@ -0,0 +1,135 @@
+"""
+Inference Pool
+
+Bounded thread pool for CPU-bound work (feature building, booster
+inference) called from async endpoints, so a slow prediction never
+blocks the event loop. XGBoost and LightGBM release the GIL while
+predicting, so threads scale across cores without pickling inputs.
+
+Configuration:
+- MAX_WORKERS: number of inference threads (default 4)
+- INFERENCE_MAX_QUEUE: requests allowed to wait for a thread before
+  new ones are rejected with 503 (default 8 x MAX_WORKERS)
+"""
+
+import asyncio
+import os
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.monitoring.prometheus_metrics import (
+    record_inference_queued,
+    record_inference_started,
+    record_inference_rejected
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InferencePoolFull(Exception):
+    """Raised when the inference queue is at capacity"""
+
+
+class InferencePool:
+    """
+    Thread pool with a bounded wait queue and queue metrics
+
+    Only submissions waiting for a free thread count towards the queue
+    limit; running tasks are bounded by the pool size.
+    """
+
+    def __init__(
+        self,
+        name: str = "inference",
+        max_workers: Optional[int] = None,
+        max_queue: Optional[int] = None
+    ):
+        self.name = name
+        self.max_workers = max_workers or int(os.getenv("MAX_WORKERS", "4"))
+        self.max_queue = max_queue or int(
+            os.getenv("INFERENCE_MAX_QUEUE", str(8 * self.max_workers))
+        )
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+
+        logger.info(
+            f"Inference pool '{name}' configured "
+            f"(workers: {self.max_workers}, max queue: {self.max_queue})"
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        """Submissions waiting for a free thread"""
+        return self._queued
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run fn(*args) on the pool and await its result
+
+        Raises:
+            InferencePoolFull: If max_queue submissions are already waiting
+        """
+        with self._lock:
+            if self._queued >= self.max_queue:
+                record_inference_rejected(self.name)
+                raise InferencePoolFull(
+                    f"Inference queue full ({self._queued} waiting, limit {self.max_queue})"
+                )
+            self._queued += 1
+            record_inference_queued(self.name, self._queued)
+
+        submitted_at = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        queued = [True]
+
+        try:
+            return await loop.run_in_executor(
+                self._get_executor(), self._run_task, fn, args, submitted_at, queued
+            )
+        finally:
+            # Cancelled (client gone, timeout) or failed before a thread
+            # picked it up: give the queue slot back
+            if self._dequeue(queued):
+                record_inference_queued(self.name, self._queued)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads (called on application shutdown)"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created lazily so importing the module never starts threads
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix=self.name
+                    )
+        return self._executor
+
+    def _dequeue(self, queued: list) -> bool:
+        """Release a submission's queue slot; only the first call per submission does"""
+        with self._lock:
+            if not queued[0]:
+                return False
+            queued[0] = False
+            self._queued -= 1
+            return True
+
+    def _run_task(self, fn: Callable[..., Any], args: tuple, submitted_at: float, queued: list) -> Any:
+        if not self._dequeue(queued):
+            return None  # The caller stopped waiting before a thread was free
+
+        record_inference_started(self.name, self._queued, time.perf_counter() - submitted_at)
+        return fn(*args)
+
+
+# Singleton instance shared by prediction endpoints
+inference_pool = InferencePool()
@@ -0,0 +1,171 @@
+"""
+Micro-Batcher
+
+Coalesces concurrent single-item requests into one vectorized call.
+
+Requests are collected for up to a short window (or until the batch is
+full), then the whole batch is processed by one call on the inference
+pool and each caller's future is resolved with its own result. Callers
+keep per-request semantics while boosters run once per batch.
+"""
+
+import asyncio
+import time
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+from app.monitoring.prometheus_metrics import record_micro_batch
+from app.utils.inference_pool import InferencePoolFull
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Collects items submitted on one event loop and processes them in batches
+
+    Args:
+        process_batch: Sync function mapping a list of items to a list of
+            results (same order, same length)
+        runner: Async callable used to execute process_batch off the event
+            loop, e.g. InferencePool.run
+        name: Label for metrics and logs
+        max_batch_size: Flush as soon as this many items are waiting
+        window_ms: Longest time the first item of a batch waits for others
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        runner: Callable[..., Awaitable[Any]],
+        name: str = "predict",
+        max_batch_size: int = 64,
+        window_ms: float = 2.0
+    ):
+        self.process_batch = process_batch
+        self.runner = runner
+        self.name = name
+        self.max_batch_size = max(1, max_batch_size)
+        self.window_seconds = max(0.0, window_ms) / 1000
+
+        # (item, future, submitted_at); only touched from the event loop
+        self._pending: List[Tuple[Any, asyncio.Future, float]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Batches in flight; referenced here so the loop cannot collect them
+        self._tasks: Set[asyncio.Task] = set()
+
+        logger.info(
+            f"Micro-batcher '{name}' configured "
+            f"(max batch: {self.max_batch_size}, window: {window_ms}ms)"
+        )
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_seconds, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Dispatch everything waiting as one batch"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        dispatched_at = time.perf_counter()
+        record_micro_batch(
+            self.name,
+            len(batch),
+            [dispatched_at - submitted_at for _, _, submitted_at in batch]
+        )
+
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """
+        Dispatch anything still waiting and let in-flight batches finish
+        (called on application shutdown); batches still running after
+        `timeout` seconds are cancelled, along with their callers
+        """
+        self._flush()
+        if not self._tasks:
+            return
+
+        tasks = list(self._tasks)
+        _, still_running = await asyncio.wait(tasks, timeout=timeout)
+        for task in still_running:
+            task.cancel()
+        if still_running:
+            logger.warning(f"Micro-batcher '{self.name}' cancelled {len(still_running)} batches on stop")
+            await asyncio.gather(*still_running, return_exceptions=True)
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future, float]]) -> None:
+        items = [item for item, _, _ in batch]
+        futures = [future for _, future, _ in batch]
+
+        try:
+            results = await self.runner(self.process_batch, items)
+        except asyncio.CancelledError:
+            for future in futures:
+                future.cancel()
+            raise
+        except InferencePoolFull as e:
+            # Overloaded: resubmitting would only add load, every caller gets the 503
+            for future in futures:
+                self._set_exception(future, e)
+            return
+        except Exception as e:
+            if len(items) == 1:
+                self._set_exception(futures[0], e)
+                return
+
+            # Isolate the failing request(s): score each item on its own,
+            # still as a single task on the runner
+            logger.warning(f"Micro-batch of {len(items)} failed ({e}), retrying items individually")
+            try:
+                outcomes = await self.runner(self._process_individually, items)
+            except asyncio.CancelledError:
+                for future in futures:
+                    future.cancel()
+                raise
+            except Exception as retry_error:
+                for future in futures:
+                    self._set_exception(future, retry_error)
+                return
+
+            for future, (result, error) in zip(futures, outcomes):
+                if error is not None:
+                    self._set_exception(future, error)
+                elif not future.done():
+                    future.set_result(result)
+            return
+
+        for future, result in zip(futures, results):
+            if not future.done():  # Caller may have been cancelled
+                future.set_result(result)
+
+    def _process_individually(self, items: List[Any]) -> List[Tuple[Any, Optional[Exception]]]:
+        outcomes = []
+        for item in items:
+            try:
+                outcomes.append((self.process_batch([item])[0], None))
+            except Exception as e:
+                outcomes.append((None, e))
+        return outcomes
+
+    @staticmethod
+    def _set_exception(future: asyncio.Future, error: Exception) -> None:
+        if not future.done():
+            future.set_exception(error)
@@ -0,0 +1,288 @@
+"""
+Prediction Cache
+
+Caches finished PredictResponses keyed by a canonical hash of the
+request payload plus the serving model's identity, so a buyer re-scored
+with an identical unified profile skips feature engineering and the
+ensemble entirely.
+
+Two tiers:
+- local: in-process LRU with TTL, bounded by the bytes of the stored
+  responses (not by entry count)
+- shared (optional): a backend shared between pods, e.g. Redis
+
+Keys include the model version and training timestamp, so a reloaded
+model never serves the previous model's results; reload also clears
+the cache explicitly.
+
+Configuration:
+- PREDICTION_CACHE_ENABLED: turn the cache on/off (default true)
+- PREDICTION_CACHE_MAX_MB: local tier size (default 64)
+- CACHE_TTL_SECONDS: entry lifetime in both tiers (default 300)
+- PREDICTION_CACHE_SHARED: shared tier, "redis", "memory" (in-process
+  stand-in with the same interface) or empty for none (default)
+- REDIS_URL: Redis connection for the "redis" shared tier
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.monitoring.prometheus_metrics import (
+    record_cache_hit,
+    record_cache_miss,
+    update_cache_size
+)
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "credit-ml:predict:"
+
+# Per-entry bookkeeping (key, OrderedDict node, expiry) counted towards the size bound
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+class LocalLRUCache:
+    """
+    In-process LRU cache with per-entry TTL, bounded by total value size
+
+    Thread-safe; values are serialized responses (bytes).
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        footprint = self._footprint(key, value)
+        if footprint > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._size += footprint
+
+            # Evict least recently used entries until within the size bound
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+            update_cache_size(self._size, len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            update_cache_size(0, 0)
+
+    def _remove(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self._size -= self._footprint(key, value)
+
+    @staticmethod
+    def _footprint(key: str, value: bytes) -> int:
+        return len(key) + len(value) + _ENTRY_OVERHEAD_BYTES
+
+
+class SharedCacheBackend:
+    """Interface of a cache shared between processes (all methods async)"""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        raise NotImplementedError
+
+    async def clear(self, prefix: str) -> None:
+        """Delete every key starting with prefix"""
+        raise NotImplementedError
+
+
+class MemorySharedBackend(SharedCacheBackend):
+    """In-process stand-in for Redis (development and tests)"""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[bytes, float]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return entry[0]
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._entries[key] = (value, time.monotonic() + ttl_seconds)
+
+    async def clear(self, prefix: str) -> None:
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+
+class RedisSharedBackend(SharedCacheBackend):
+    """Redis via redis.asyncio (the redis package is only needed for this backend)"""
+
+    def __init__(self, url: str):
+        # Imported lazily: Redis is optional
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        await self._client.set(key, value, px=int(ttl_seconds * 1000))
+
+    async def clear(self, prefix: str) -> None:
+        async for key in self._client.scan_iter(match=f"{prefix}*"):
+            await self._client.unlink(key)
+
+
+class PredictionCache:
+    """
+    Two-tier cache of serialized prediction responses
+
+    Cache failures never fail a prediction: shared-tier errors are logged
+    and treated as misses.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        shared: Optional[SharedCacheBackend] = None
+    ):
+        if enabled is None:
+            enabled = os.getenv("PREDICTION_CACHE_ENABLED", "true").lower() == "true"
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds or float(os.getenv("CACHE_TTL_SECONDS", "300"))
+        max_bytes = max_bytes or int(float(os.getenv("PREDICTION_CACHE_MAX_MB", "64")) * 1024 * 1024)
+
+        self.local = LocalLRUCache(max_bytes, self.ttl_seconds)
+        self.shared = shared if shared is not None else self._shared_from_env()
+
+        logger.info(
+            f"Prediction cache {'enabled' if enabled else 'disabled'} "
+            f"(local: {max_bytes // (1024 * 1024)}MB, ttl: {self.ttl_seconds:.0f}s, "
+            f"shared: {type(self.shared).__name__ if self.shared else 'none'})"
+        )
+
+    @staticmethod
+    def key_for(payload: Dict[str, Any], model_identity: str) -> str:
+        """
+        Cache key: model identity + SHA-256 of the canonical request JSON
+
+        Canonical form sorts keys and drops insignificant whitespace, so
+        equal payloads hash equally regardless of field order.
+
+        Args:
+            payload: JSON-compatible request payload
+            model_identity: Identifies the model that would score it
+        """
+        canonical = json.dumps(
+            payload,
+            sort_keys=True,
+            separators=(",", ":")
+        )
+        digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        return f"{KEY_PREFIX}{model_identity}:{digest}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Serialized response for key, or None on a miss"""
+        if not self.enabled:
+            return None
+
+        value = self.local.get(key)
+        tier = "local"
+
+        if value is None and self.shared is not None:
+            try:
+                value = await self.shared.get(key)
+            except Exception as e:
+                logger.warning(f"Shared prediction cache read failed: {e}")
+                value = None
+            if value is not None:
+                tier = "shared"
+                self.local.set(key, value)
+
+        if value is None:
+            record_cache_miss()
+            return None
+
+        record_cache_hit(tier)
+        return value
+
+    async def put(self, key: str, value: bytes) -> None:
+        """Store a serialized response in both tiers"""
+        if not self.enabled:
+            return
+
+        self.local.set(key, value)
+
+        if self.shared is not None:
+            try:
+                await self.shared.set(key, value, self.ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Shared prediction cache write failed: {e}")
+
+    async def invalidate(self) -> None:
+        """Drop every cached prediction (called after a model reload)"""
+        self.local.clear()
+
+        if self.shared is not None:
+            try:
+                await self.shared.clear(KEY_PREFIX)
+            except Exception as e:
+                logger.warning(f"Shared prediction cache clear failed: {e}")
+
+        logger.info("Prediction cache invalidated")
+
+    @staticmethod
+    def _shared_from_env() -> Optional[SharedCacheBackend]:
+        backend = os.getenv("PREDICTION_CACHE_SHARED", "").lower()
+
+        if backend == "redis":
+            return RedisSharedBackend(os.getenv("REDIS_URL", "redis://localhost:6379"))
+        if backend == "memory":
+            return MemorySharedBackend()
+        if backend:
+            raise ValueError(f"Unknown PREDICTION_CACHE_SHARED backend: {backend}")
+        return None
+
+
+# Singleton instance used by the prediction endpoints
+prediction_cache = PredictionCache()
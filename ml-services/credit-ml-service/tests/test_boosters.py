@@ -0,0 +1,63 @@
+"""Training behaviour of the XGBoost / LightGBM models on synthetic profiles"""
+
+import numpy as np
+import pytest
+
+from app.api.predict import _categorize_risk
+from app.models.lightgbm_model import LightGBMModel
+from app.models.xgboost_model import XGBoostModel
+from app.training.dataset_store import DatasetStore
+
+MODEL_TYPES = [XGBoostModel, LightGBMModel]
+
+
+@pytest.fixture(scope="module")
+def splits(tmp_path_factory):
+    dataset = DatasetStore(str(tmp_path_factory.mktemp("datasets"))).synthetic(
+        n_samples=10000, random_seed=42
+    )
+    return dataset.train_val_test_split()
+
+
+@pytest.mark.parametrize("model_type", MODEL_TYPES)
+def test_early_stopping_keeps_probabilities_spanning_risk_levels(model_type, splits):
+    X_train, y_train, X_val, y_val, X_test, _ = splits
+    model = model_type()
+    metadata = model.train(X_train, y_train, X_val, y_val)
+
+    # Stopping on validation AUC used to end after a handful of trees, with
+    # every probability still close to the base rate (all LOW / MEDIUM)
+    assert metadata["n_trees"] > model.early_stopping_rounds
+    levels = {_categorize_risk(p) for p in model.predict_proba(X_test)}
+    assert levels == {"LOW", "MEDIUM", "HIGH", "CRITICAL"}
+
+
+@pytest.mark.parametrize("model_type", MODEL_TYPES)
+def test_checkpoint_is_keyed_by_params_and_data(model_type, splits, tmp_path):
+    X_train, y_train = splits[0], splits[1]
+    model = model_type()
+    model.checkpoint_dir = str(tmp_path)
+
+    path = model._checkpoint_path("data-a")
+    assert path == model._checkpoint_path("data-a")
+    assert path != model._checkpoint_path("data-b")
+
+    model.params = {**model.params, "learning_rate": 0.1}
+    assert path != model._checkpoint_path("data-a")
+
+    # Raising the round cap resumes the same run
+    model.params = {**model.params, "learning_rate": 0.05, "n_estimators": 500}
+    assert path == model._checkpoint_path("data-a")
+
+
+def test_lightgbm_native_load_round_trips_through_pickle(splits, tmp_path):
+    X_train, y_train, _, _, X_test, _ = splits
+    trained = LightGBMModel(hyperparameters={**LightGBMModel().params, "n_estimators": 20})
+    trained.train(X_train, y_train)
+    trained.save_native(str(tmp_path / "lightgbm.txt"))
+
+    loaded = LightGBMModel().load_native(str(tmp_path / "lightgbm.txt"), dict(trained.metadata))
+    assert loaded.model is loaded.booster
+
+    reloaded = LightGBMModel().load(loaded.save(str(tmp_path / "pickled")))
+    np.testing.assert_allclose(reloaded.predict_proba(X_test), trained.predict_proba(X_test))
@@ -0,0 +1,40 @@
+"""Stored dataset layout and splits"""
+
+import numpy as np
+import pandas as pd
+
+from app.features.schema import FEATURE_NAMES
+from app.training.dataset_store import LABEL_COLUMN, DatasetStore, stratified_order
+
+
+def _frame(n_rows: int = 5000, default_rate: float = 0.07, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.random((n_rows, len(FEATURE_NAMES))), columns=list(FEATURE_NAMES))
+    df[FEATURE_NAMES[0]] = np.arange(n_rows)  # Row id, to check rows keep their labels
+    df[LABEL_COLUMN] = (rng.random(n_rows) < default_rate).astype(np.int8)
+    return df
+
+
+def test_stratified_order_spreads_classes_evenly():
+    y = (np.random.default_rng(1).random(10007) < 0.03).astype(np.int8)
+    order = stratified_order(y, seed=1)
+
+    assert np.array_equal(np.sort(order), np.arange(len(y)))
+    prefix_positives = np.cumsum(y[order])
+    expected = np.arange(1, len(y) + 1) * y.mean()
+    assert np.abs(prefix_positives - expected).max() <= 1
+
+
+def test_splits_are_stratified_views(tmp_path):
+    df = _frame()
+    dataset = DatasetStore(str(tmp_path)).import_frame(df, name="frame")
+    X_train, y_train, X_val, y_val, X_test, y_test = dataset.train_val_test_split()
+
+    for X_split, y_split in ((X_train, y_train), (X_val, y_val), (X_test, y_test)):
+        assert np.shares_memory(X_split, dataset.X)
+        assert abs(y_split.sum() - len(y_split) * dataset.y.mean()) <= 2
+
+    # Rows were moved together with their labels
+    row_ids = np.asarray(dataset.X[:, 0]).astype(int)
+    assert np.array_equal(np.sort(row_ids), np.arange(len(df)))
+    np.testing.assert_array_equal(dataset.y, df[LABEL_COLUMN].to_numpy()[row_ids])
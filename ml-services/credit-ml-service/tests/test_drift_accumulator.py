@@ -0,0 +1,54 @@
+"""Reference handling of the in-process drift accumulator"""
+
+import numpy as np
+import pandas as pd
+
+import app.mlops.drift_accumulator as drift_accumulator_module
+from app.features.schema import FEATURE_NAMES, N_FEATURES
+from app.mlops.drift_accumulator import DriftAccumulator, drift_reference_path
+from app.mlops.drift_detection import DriftDetector
+
+
+def _write_reference(path, columns, seed: int = 0) -> str:
+    rng = np.random.default_rng(seed)
+    features = pd.DataFrame(rng.normal(size=(2000, len(columns))), columns=columns)
+    DriftDetector().save_reference_distributions(features, rng.random(2000), save_path=str(path))
+    return str(path)
+
+
+def test_reference_path_defaults_to_model_dir(monkeypatch):
+    monkeypatch.delenv("DRIFT_REFERENCE_PATH", raising=False)
+    monkeypatch.setenv("MODEL_DIR", "/srv/models")
+    assert drift_reference_path() == "/srv/models/drift_reference.json"
+
+    monkeypatch.setenv("DRIFT_REFERENCE_PATH", "/elsewhere/reference.json")
+    assert drift_reference_path() == "/elsewhere/reference.json"
+
+
+def test_model_reload_replaces_reference_and_drops_counts(tmp_path, monkeypatch):
+    accumulator = DriftAccumulator(DriftDetector(), min_samples=1, clock=lambda: 1000.0)
+    assert not accumulator.enabled
+
+    monkeypatch.setenv("MODEL_DIR", str(tmp_path))
+    monkeypatch.delenv("DRIFT_REFERENCE_PATH", raising=False)
+    monkeypatch.setattr(drift_accumulator_module, "drift_accumulator", accumulator)
+
+    # A model deployed with a reference of two features
+    _write_reference(tmp_path / "drift_reference.json", list(FEATURE_NAMES[:2]))
+    drift_accumulator_module.reload_drift_reference()
+    assert accumulator.names == [*FEATURE_NAMES[:2], "predictions"]
+
+    rows = np.random.default_rng(1).normal(size=(50, N_FEATURES))
+    accumulator.update(rows, np.full(50, 0.2))
+    assert accumulator.window_counts()[1] == 50
+
+    # The next model's reference covers other features: counts restart
+    _write_reference(tmp_path / "drift_reference.json", list(FEATURE_NAMES[:3]), seed=2)
+    drift_accumulator_module.reload_drift_reference()
+    assert accumulator.names == [*FEATURE_NAMES[:3], "predictions"]
+    assert accumulator.window_counts()[1] == 0
+
+    accumulator.update(rows, np.full(50, 0.2))
+    result = accumulator.check_drift()
+    assert result["n_samples"] == 50
+    assert set(result["feature_drift"]["psi_by_feature"]) == set(FEATURE_NAMES[:3])
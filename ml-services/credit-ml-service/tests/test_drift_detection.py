@@ -0,0 +1,61 @@
+"""Batch PSI paths of DriftDetector against the per-feature path"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.mlops.drift_detection import DriftDetector, histograms
+
+
+def _reference_detector(save_path: str) -> DriftDetector:
+    rng = np.random.default_rng(0)
+    detector = DriftDetector()
+    detector.save_reference_distributions(
+        pd.DataFrame({
+            "income": rng.lognormal(10, 1, 5000),
+            "age": rng.integers(18, 80, 5000).astype(float),
+            "flag": (rng.random(5000) < 0.3).astype(float),  # Repeated quantile edges
+        }),
+        save_path=save_path
+    )
+    # A feature with fewer bins than the others
+    detector.reference_distributions["short"] = {"bins": [0.0, 0.5, 1.0], "distribution": [10, 30]}
+    return detector
+
+
+def test_histograms_match_numpy():
+    rng = np.random.default_rng(1)
+    edges = [np.array([0.0, 0.2, 0.2, 0.7, 1.0]), np.array([-1.0, 0.0, 1.0])]
+    values = rng.normal(0.3, 0.6, (1000, 2))
+    values[::7, 0] = 0.2
+    values[::11, 1] = 1.0
+    values[::13] = np.nan
+
+    counts = histograms(values, edges)
+    np.testing.assert_array_equal(counts[0], np.histogram(values[:, 0], edges[0])[0])
+    np.testing.assert_array_equal(counts[1], np.histogram(values[:, 1], edges[1])[0].tolist() + [0, 0])
+
+
+def test_multivariate_drift_matches_feature_drift(tmp_path):
+    detector = _reference_detector(str(tmp_path / "reference.json"))
+    rng = np.random.default_rng(2)
+    current = pd.DataFrame({
+        "income": rng.lognormal(10.3, 1.2, 2000),
+        "age": rng.integers(18, 90, 2000).astype(float),
+        "flag": (rng.random(2000) < 0.5).astype(float),
+        "short": rng.random(2000) * 1.2,
+        "unreferenced": rng.random(2000),
+    })
+    current.loc[::17, "income"] = np.nan
+
+    result = detector.detect_multivariate_drift(current)
+
+    expected = [detector.detect_feature_drift(name, current[name].values) for name in current.columns]
+    drifted = [r for r in expected if r.get("drifted")]
+    assert drifted
+    assert result["total_features"] == len(expected)
+    assert [r["feature"] for r in result["feature_details"]] == [r["feature"] for r in drifted]
+    for got, want in zip(result["feature_details"], drifted):
+        assert got["psi"] == pytest.approx(want["psi"], rel=1e-9)
+        assert got["severity"] == want["severity"]
+    assert result["max_psi"] == pytest.approx(max(r["psi"] for r in expected if r["psi"] is not None))
@@ -0,0 +1,202 @@
+"""Paginated decision fetching of the drift monitor, against a stub decisions API"""
+
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.features.schema import FEATURE_NAMES, as_feature_matrix
+from app.mlops.drift_detection import DriftDetector
+from app.mlops.drift_monitor import DriftMonitor, DriftMonitorDaemon, FetchError
+from app.training.synthetic_data import SyntheticDataGenerator
+
+N_DECISIONS = 3000
+
+
+def _profiles(n_rows: int, seed: int):
+    df = SyntheticDataGenerator(random_seed=seed).generate_dataset(n_rows)
+    X = as_feature_matrix(df[list(FEATURE_NAMES)])
+    predictions = np.random.default_rng(seed).beta(2, 8, n_rows)
+    return X, predictions
+
+
+@pytest.fixture(scope="module")
+def reference_path(tmp_path_factory):
+    X, predictions = _profiles(5000, seed=1)
+    path = tmp_path_factory.mktemp("drift") / "drift_reference.json"
+    DriftDetector().save_reference_distributions(
+        pd.DataFrame(X, columns=list(FEATURE_NAMES)), predictions, save_path=str(path)
+    )
+    return str(path)
+
+
+class DecisionsAPI:
+    """
+    Stub of GET /credit-decisions/recent over decisions of the last 24h
+
+    Cursors are row offsets within the requested range. Counts the rows
+    served in successful responses and the requests in flight.
+    """
+
+    def __init__(self, n_rows: int = N_DECISIONS, delay: float = 0.0, fail_first_attempts: bool = False):
+        self.X, self.predictions = _profiles(n_rows, seed=2)
+        # Drifted from the reference: riskier scores, larger leading features
+        self.predictions = self.predictions ** 0.7
+        self.X[:, :5] *= 1.3
+        now = time.time()
+        self.times = np.sort(now - np.random.default_rng(3).random(n_rows) * 23.5 * 3600)
+        self.delay = delay
+        self.fail_first_attempts = fail_first_attempts
+        self.served = Counter()
+        self.attempts = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return self._page(request)
+        finally:
+            self.in_flight -= 1
+
+    def _page(self, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        key = (params["from"], params.get("cursor"))
+        self.attempts[key] += 1
+        if self.fail_first_attempts and self.attempts[key] == 1:
+            return httpx.Response(503)
+
+        start = datetime.fromisoformat(params["from"]).timestamp()
+        end = datetime.fromisoformat(params["to"]).timestamp()
+        rows = np.flatnonzero((self.times >= start) & (self.times < end))
+        offset, limit = int(params.get("cursor", 0)), int(params["limit"])
+        page = rows[offset:offset + limit]
+        self.served.update(page.tolist())
+
+        return httpx.Response(200, json={
+            "predictions": self.predictions[page].tolist(),
+            "features": [
+                {name: float(value) for name, value in zip(FEATURE_NAMES, self.X[i]) if not np.isnan(value)}
+                for i in page
+            ],
+            "next_cursor": str(offset + limit) if offset + limit < len(rows) else None
+        })
+
+
+def _monitor(reference_path: str, api, **kwargs) -> DriftMonitor:
+    monitor = DriftMonitor(
+        reference_data_path=reference_path,
+        page_size=kwargs.pop("page_size", 100),
+        transport=httpx.MockTransport(api),
+        **kwargs
+    )
+    monitor.backoff_seconds = 0.001
+    return monitor
+
+
+def test_pagination_fetches_every_decision_once(reference_path):
+    api = DecisionsAPI()
+    data = asyncio.run(_monitor(reference_path, api).fetch_recent_predictions(hours=24))
+
+    assert len(data["predictions"]) == N_DECISIONS
+    assert set(api.served) == set(range(N_DECISIONS))
+    assert max(api.served.values()) == 1
+    # Several pages per slice: the cursor was followed to the end
+    assert len(api.attempts) > len({start for start, _ in api.attempts})
+
+
+def test_retries_503_without_duplicate_rows(reference_path):
+    api = DecisionsAPI(fail_first_attempts=True)
+    result = asyncio.run(_monitor(reference_path, api).check_drift_streaming(hours=24))
+
+    assert result["n_samples"] == N_DECISIONS
+    assert set(api.attempts.values()) == {2}
+    assert max(api.served.values()) == 1
+
+
+def test_concurrent_requests_capped(reference_path):
+    api = DecisionsAPI(delay=0.01)
+    result = asyncio.run(_monitor(reference_path, api, concurrency=3).check_drift_streaming(hours=24))
+
+    assert result["n_samples"] == N_DECISIONS
+    assert 1 < api.max_in_flight <= 3
+
+
+def test_not_found_raises_fetch_error(reference_path):
+    async def not_found(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404)
+
+    monitor = _monitor(reference_path, not_found)
+    with pytest.raises(FetchError, match="HTTP 404"):
+        asyncio.run(monitor.check_drift_streaming(hours=1))
+
+    result = asyncio.run(monitor.run_monitoring(hours=1))
+    assert "HTTP 404" in result["error"]
+    assert result["should_retrain"] is False
+
+
+@pytest.mark.parametrize("body", [b"[]", b'"page"', b"null"])
+def test_non_object_page_raises_fetch_error(reference_path, body):
+    async def not_a_page(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body, headers={"content-type": "application/json"})
+
+    with pytest.raises(FetchError, match="expected a JSON object"):
+        asyncio.run(_monitor(reference_path, not_a_page).check_drift_streaming(hours=1))
+
+
+def test_naive_page_timestamps_are_utc(monkeypatch):
+    # Server-local time must not matter
+    monkeypatch.setenv("TZ", "Asia/Kolkata")
+    time.tzset()
+    try:
+        _, _, times = DriftMonitor._page_arrays({
+            "predictions": [0.1, 0.2, 0.3],
+            "features": [{}, {}, {}],
+            "timestamps": ["2026-01-01T00:00:00", "2026-01-01T05:30:00+05:30", 1767225600]
+        })
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    expected = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+    np.testing.assert_array_equal(times, [expected] * 3)
+
+
+def test_streamed_psi_matches_in_memory_path(reference_path):
+    monitor = _monitor(reference_path, DecisionsAPI(), page_size=250)
+    streamed = asyncio.run(monitor.check_drift_streaming(hours=24))
+    in_memory = monitor.check_drift(asyncio.run(monitor.fetch_recent_predictions(hours=24)))
+
+    assert streamed["prediction_drift"]["psi"] == pytest.approx(in_memory["prediction_drift"]["psi"], rel=1e-9)
+    for key in ("average_psi", "max_psi", "drifted_features"):
+        assert streamed["feature_drift"][key] == pytest.approx(in_memory["feature_drift"][key], rel=1e-9)
+    assert streamed["should_retrain"] == in_memory["should_retrain"]
+
+
+def test_daemon_strips_window_labels_and_queries_in_utc(reference_path, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Drift alerts write their report under ./drift_reports
+    api = DecisionsAPI()
+    daemon = DriftMonitorDaemon(
+        _monitor(reference_path, api),
+        windows=" 1h, 24h ,".split(","),
+        alert_window=" 24h",
+        lag_seconds=0,
+        backfill_hours=24,
+        state_path=str(tmp_path / "drift_monitor.npz"),
+        min_samples=10
+    )
+    assert set(daemon.windows) == {"1h", "24h"}
+    assert daemon.alert_window == "24h"
+
+    result = asyncio.run(daemon.run_cycle())
+    assert set(result["windows"]) == {"1h", "24h"}
+    assert result["fetched"] == N_DECISIONS
+    assert all(datetime.fromisoformat(start).utcoffset() is not None for start, _ in api.attempts)
+    assert datetime.fromisoformat(result["watermark"]).utcoffset().total_seconds() == 0
@@ -0,0 +1,41 @@
+"""Successive-halving search"""
+
+import numpy as np
+
+from app.features.schema import N_FEATURES
+from app.training.hyperparameter_search import HyperparameterSearch
+
+
+class _FailingTracker:
+    """MLflow manager whose metric logging always fails"""
+
+    def __init__(self):
+        self.metric_calls = 0
+
+    def start_run(self, **kwargs):
+        pass
+
+    def log_params(self, params):
+        pass
+
+    def log_metrics(self, metrics, step=None):
+        self.metric_calls += 1
+        raise ConnectionError("tracking server unavailable")
+
+    def end_run(self):
+        pass
+
+
+def test_search_survives_mlflow_logging_failures():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, N_FEATURES)).astype(np.float32)
+    y = (X[:, 0] + rng.normal(size=600) > 1).astype(int)
+    tracker = _FailingTracker()
+
+    result = HyperparameterSearch(
+        "xgboost", n_trials=3, eta=3, max_budget=9, cv=2, n_workers=1, mlflow_manager=tracker
+    ).run(X, y)
+
+    assert [rung["budget"] for rung in result.rungs] == [3, 9]
+    assert tracker.metric_calls == len(result.rungs) + 1  # Every rung, then the final result
+    assert 0.5 < result.best_score <= 1.0
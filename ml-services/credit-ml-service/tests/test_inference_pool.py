@@ -0,0 +1,76 @@
+"""Tests for the bounded inference pool"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.utils.inference_pool import InferencePool, InferencePoolFull
+
+
+def test_run_returns_result():
+    pool = InferencePool(name="test", max_workers=2, max_queue=4)
+    try:
+        assert asyncio.run(pool.run(sum, [1, 2, 3])) == 6
+        assert pool.queue_depth == 0
+    finally:
+        pool.shutdown()
+
+
+def test_exception_releases_slot():
+    pool = InferencePool(name="test", max_workers=1, max_queue=1)
+
+    def fail():
+        raise ValueError("boom")
+
+    async def scenario():
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                await pool.run(fail)
+        return await pool.run(lambda: "ok")
+
+    try:
+        assert asyncio.run(scenario()) == "ok"
+        assert pool.queue_depth == 0
+    finally:
+        pool.shutdown()
+
+
+def test_cancelled_waiters_release_their_slots():
+    pool = InferencePool(name="test", max_workers=1, max_queue=3)
+    release = threading.Event()
+    started = threading.Event()
+    calls = []
+
+    def block():
+        started.set()
+        release.wait(5)
+        return "blocked"
+
+    async def scenario():
+        blocker = asyncio.create_task(pool.run(block))
+        await asyncio.to_thread(started.wait, 5)
+
+        # Fill the queue behind the busy worker, then give up on every waiter
+        waiters = [asyncio.create_task(pool.run(calls.append, i)) for i in range(3)]
+        await asyncio.sleep(0)
+        assert pool.queue_depth == 3
+        with pytest.raises(InferencePoolFull):
+            await pool.run(calls.append, 99)
+
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        assert pool.queue_depth == 0
+
+        release.set()
+        assert await blocker == "blocked"
+        return await pool.run(lambda: "after")
+
+    try:
+        assert asyncio.run(scenario()) == "after"
+        assert pool.queue_depth == 0
+        assert calls == []  # Cancelled work never ran
+    finally:
+        release.set()
+        pool.shutdown()
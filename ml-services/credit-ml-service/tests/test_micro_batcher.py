@@ -0,0 +1,88 @@
+"""Tests for the micro-batcher"""
+
+import asyncio
+
+from app.utils.inference_pool import InferencePoolFull
+from app.utils.micro_batcher import MicroBatcher
+
+
+async def _run_inline(fn, *args):
+    await asyncio.sleep(0.01)
+    return fn(*args)
+
+
+def test_concurrent_submissions_share_a_batch():
+    sizes = []
+
+    def double(items):
+        sizes.append(len(items))
+        return [2 * item for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(double, runner=_run_inline, max_batch_size=8, window_ms=5)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert asyncio.run(scenario()) == [0, 2, 4, 6, 8]
+    assert sizes == [5]
+
+
+def test_scoring_error_is_isolated_to_its_item():
+    def score(items):
+        if "bad" in items:
+            raise ValueError("cannot score")
+        return [item.upper() for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(score, runner=_run_inline, max_batch_size=8, window_ms=5)
+        return await asyncio.gather(*(batcher.submit(item) for item in ("a", "bad", "c")), return_exceptions=True)
+
+    a, bad, c = asyncio.run(scenario())
+    assert (a, c) == ("A", "C")
+    assert isinstance(bad, ValueError)
+
+
+def test_full_pool_fails_every_item_without_retrying():
+    calls = []
+
+    async def full_pool(fn, *args):
+        calls.append(fn)
+        raise InferencePoolFull("Inference queue full")
+
+    async def scenario():
+        batcher = MicroBatcher(lambda items: items, runner=full_pool, max_batch_size=8, window_ms=5)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+    outcomes = asyncio.run(scenario())
+    assert all(isinstance(outcome, InferencePoolFull) for outcome in outcomes)
+    assert len(calls) == 1
+
+
+def test_stop_finishes_waiting_and_in_flight_batches():
+    async def scenario():
+        batcher = MicroBatcher(lambda items: items, runner=_run_inline, max_batch_size=2, window_ms=1000)
+        waiters = [asyncio.ensure_future(batcher.submit(i)) for i in range(3)]
+        await asyncio.sleep(0)
+
+        # Two items are in flight, one waits for the (long) window
+        assert len(batcher._tasks) == 1
+        await batcher.stop()
+        assert not batcher._tasks
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(scenario()) == [0, 1, 2]
+
+
+def test_stop_cancels_batches_past_the_timeout():
+    async def slow_runner(fn, *args):
+        await asyncio.sleep(10)
+        return fn(*args)
+
+    async def scenario():
+        batcher = MicroBatcher(lambda items: items, runner=slow_runner, max_batch_size=1)
+        waiter = asyncio.ensure_future(batcher.submit("x"))
+        await asyncio.sleep(0)
+        await batcher.stop(timeout=0.01)
+        return await asyncio.gather(waiter, return_exceptions=True)
+
+    (outcome,) = asyncio.run(scenario())
+    assert isinstance(outcome, asyncio.CancelledError)
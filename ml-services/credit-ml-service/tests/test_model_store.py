@@ -0,0 +1,22 @@
+"""Model loading at startup (app.models.model_store)"""
+
+import logging
+import shutil
+from pathlib import Path
+
+from app.models.model_store import ModelStore
+
+MODEL_DIR = Path(__file__).resolve().parents[1] / "models"
+
+
+def test_directory_without_artifact_serves_untrained_model_without_errors(tmp_path, caplog):
+    # The checked-in models/ holds only the old ensemble_v1.0.0.pkl, which is not an artifact
+    shutil.copytree(MODEL_DIR, tmp_path / "models")
+    store = ModelStore(model_dir=str(tmp_path / "models"), version="1.0.0", source="disk")
+
+    with caplog.at_level(logging.WARNING):
+        model = store.reload()
+
+    assert store.status == "ready"
+    assert not model.is_trained
+    assert not [record for record in caplog.records if record.levelno >= logging.ERROR]
@@ -0,0 +1,137 @@
+"""Prediction API routes, served by an ensemble loaded from a saved artifact"""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.api.predict as predict
+from app.api.predict import router
+from app.models import EnsembleModel, model_store
+from app.training.dataset_store import DatasetStore
+
+NDJSON = {"content-type": "application/x-ndjson"}
+
+
+def _request(i: int) -> dict:
+    return {
+        "tenant_id": "tenant-1",
+        "buyer_id": f"buyer-{i}",
+        "gst": {"available": True, "signals": {"overallScore": 40 + i}},
+        "banking": {"available": i % 2 == 0, "signals": {"overallScore": 70}},
+        "alerts": {"active": [], "criticalCount": i % 3, "warningCount": 1}
+    }
+
+
+def _ndjson(lines) -> bytes:
+    return "\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines).encode()
+
+
+@pytest.fixture(scope="module")
+def artifact_dir(tmp_path_factory):
+    dataset = DatasetStore(str(tmp_path_factory.mktemp("datasets"))).synthetic(
+        n_samples=3000, random_seed=0
+    )
+    X_train, y_train, X_val, y_val, _, _ = dataset.train_val_test_split()
+
+    model = EnsembleModel()
+    for booster in (model.xgboost, model.lightgbm):
+        booster.params = {**booster.params, "n_estimators": 30}
+    model.train(X_train, y_train, X_val, y_val)
+    return model.save(str(tmp_path_factory.mktemp("models")))
+
+
+@pytest.fixture
+def client(artifact_dir, monkeypatch):
+    monkeypatch.setattr(model_store, "_model", EnsembleModel().load(artifact_dir))
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_model_info_reports_boosters_of_a_loaded_artifact(client):
+    model = model_store.current
+    response = client.get("/api/models/info")
+
+    assert response.status_code == 200
+    info = response.json()
+    assert info["ensemble"]["is_trained"] is True
+    for name in ("xgboost", "lightgbm"):
+        assert info["base_models"][name]["is_trained"] is True
+        assert info["base_models"][name]["native_loaded"] is False
+
+    # Reporting did not load the native boosters; using them does
+    assert not model.xgboost.is_trained
+    model.compile_backend()
+    info = client.get("/api/models/info").json()
+    assert all(booster["native_loaded"] for booster in info["base_models"].values())
+
+
+@pytest.mark.parametrize("wrap", [lambda requests: requests, lambda requests: {"requests": requests}])
+def test_json_batch_scores_every_buyer_in_order(client, wrap):
+    response = client.post("/api/predict/batch", json=wrap([_request(i) for i in range(5)]))
+
+    assert response.status_code == 200
+    batch = response.json()
+    assert batch["count"] == 5
+    assert [p["buyer_id"] for p in batch["predictions"]] == [f"buyer-{i}" for i in range(5)]
+    assert {p["model_type"] for p in batch["predictions"]} == {"ensemble"}
+
+
+def test_ndjson_batch_streams_one_response_per_line(client):
+    body = _ndjson([_request(i) for i in range(5)]) + b"\n\n"
+    response = client.post("/api/predict/batch", content=body, headers=NDJSON)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    predictions = [json.loads(line) for line in response.text.splitlines()]
+    assert [p["buyer_id"] for p in predictions] == [f"buyer-{i}" for i in range(5)]
+
+
+@pytest.mark.parametrize("body", [
+    {"requests": 5},
+    {"requests": "buyer-1"},
+    {"requests": None},
+    {"requests": {"buyer_id": "buyer-1"}},
+    {},
+    42,
+    [{"buyer_id": "buyer-1"}],
+])
+def test_malformed_json_batch_is_rejected(client, body):
+    assert client.post("/api/predict/batch", json=body).status_code == 422
+
+
+def test_invalid_json_body_is_rejected(client):
+    response = client.post("/api/predict/batch", content=b"[{", headers={"content-type": "application/json"})
+    assert response.status_code == 400
+
+
+def test_malformed_ndjson_line_is_rejected(client):
+    body = _ndjson([_request(0), '{"buyer_id": "buyer-1"}', _request(2)])
+    response = client.post("/api/predict/batch", content=body, headers=NDJSON)
+
+    assert response.status_code == 422
+    assert "line 2" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("body, headers", [
+    (b"[]", {"content-type": "application/json"}),
+    (b'{"requests": []}', {"content-type": "application/json"}),
+    (b"\n \n", NDJSON),
+])
+def test_empty_batch_is_rejected(client, body, headers):
+    response = client.post("/api/predict/batch", content=body, headers=headers)
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Batch contains no requests"
+
+
+def test_oversize_batch_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(predict, "MAX_BATCH_SIZE", 3)
+    requests = [_request(i) for i in range(4)]
+
+    assert client.post("/api/predict/batch", json=requests).status_code == 413
+    assert client.post("/api/predict/batch", json={"requests": requests}).status_code == 413
+    assert client.post("/api/predict/batch", content=_ndjson(requests), headers=NDJSON).status_code == 413
+    assert client.post("/api/predict/batch", json=requests[:3]).status_code == 200
@@ -0,0 +1,41 @@
+"""Drift statistics computed from KLL sketches against exact values"""
+
+import numpy as np
+import pytest
+
+from app.mlops.quantile_sketch import (
+    WASSERSTEIN_TRIM,
+    KLLSketch,
+    wasserstein_distance,
+    wasserstein_error_bound
+)
+
+
+def _exact_trimmed_wasserstein(a: np.ndarray, b: np.ndarray, trim: float = WASSERSTEIN_TRIM) -> float:
+    levels = trim + (1 - 2 * trim) * (np.arange(20000) + 0.5) / 20000
+    return float(np.mean(np.abs(np.quantile(a, levels) - np.quantile(b, levels))) * (1 - 2 * trim))
+
+
+@pytest.mark.parametrize("shift, sigma", [(0.0, 1.0), (0.05, 1.0), (0.2, 1.0), (0.0, 1.3), (0.5, 1.5)])
+def test_wasserstein_within_error_bound_on_lognormal(shift, sigma):
+    rng = np.random.default_rng(0)
+    reference_values = rng.lognormal(10, 1.0, 500_000)
+    current_values = rng.lognormal(10 + shift, sigma, 500_000)
+    reference = KLLSketch(k=200, seed=1).update(reference_values)
+    current = KLLSketch(k=200, seed=2).update(current_values)
+
+    exact = _exact_trimmed_wasserstein(reference_values, current_values)
+    estimate = wasserstein_distance(reference, current)
+    assert abs(estimate - exact) <= wasserstein_error_bound(reference, current)
+
+
+def test_wasserstein_accurate_for_large_drift():
+    rng = np.random.default_rng(1)
+    reference_values = rng.lognormal(10, 1.0, 500_000)
+    current_values = rng.lognormal(10.5, 1.5, 500_000)
+
+    estimate = wasserstein_distance(
+        KLLSketch(k=200, seed=1).update(reference_values),
+        KLLSketch(k=200, seed=2).update(current_values)
+    )
+    assert estimate == pytest.approx(_exact_trimmed_wasserstein(reference_values, current_values), rel=0.1)
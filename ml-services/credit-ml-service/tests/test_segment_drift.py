@@ -0,0 +1,160 @@
+"""Per-segment drift (app.mlops.segment_drift) against per-segment DriftDetector runs"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.features.schema import FEATURE_NAMES, as_feature_matrix
+from app.mlops.drift_detection import DriftDetector
+from app.mlops.segment_drift import SegmentDriftDetector, segment_groups
+from app.training.synthetic_data import SyntheticDataGenerator
+
+TENANTS = np.array(["t1", "t2", "t3"])
+SIZES = np.array(["small", "large"])
+
+
+def _rows(n_rows: int, seed: int):
+    df = SyntheticDataGenerator(random_seed=seed).generate_dataset(n_rows)
+    X = as_feature_matrix(df[list(FEATURE_NAMES)])
+    rng = np.random.default_rng(seed)
+    probabilities = rng.beta(2, 8, n_rows)
+    segments = pd.DataFrame({
+        "tenant_id": TENANTS[rng.integers(0, len(TENANTS), n_rows)],
+        "company_size": SIZES[rng.integers(0, len(SIZES), n_rows)]
+    })
+    return X, segments, probabilities
+
+
+@pytest.fixture(scope="module")
+def detector(tmp_path_factory):
+    X, _, probabilities = _rows(6000, seed=1)
+    path = tmp_path_factory.mktemp("drift") / "drift_reference.json"
+    detector = DriftDetector()
+    detector.save_reference_distributions(
+        pd.DataFrame(X, columns=list(FEATURE_NAMES)), probabilities, save_path=str(path)
+    )
+    return detector
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    return _rows(6000, seed=2)
+
+
+@pytest.fixture(scope="module")
+def current():
+    X, segments, probabilities = _rows(3000, seed=3)
+    # Tenant t2 drifts: larger leading features, riskier scores
+    t2 = (segments["tenant_id"] == "t2").to_numpy()
+    X[np.ix_(t2, np.arange(5))] *= 1.4
+    probabilities[t2] = probabilities[t2] ** 0.6
+    return X, segments, probabilities
+
+
+def _segment_detector(detector: DriftDetector, X: np.ndarray, probabilities: np.ndarray) -> DriftDetector:
+    """DriftDetector whose reference is these rows, binned on the global edges"""
+    segment = DriftDetector(psi_threshold=detector.psi_threshold)
+    values = dict(zip(FEATURE_NAMES, X.T), predictions=probabilities)
+    segment.reference_distributions = {
+        name: {"bins": reference["bins"], "distribution": np.histogram(values[name], reference["bins"])[0].tolist()}
+        for name, reference in detector.reference_distributions.items()
+    }
+    return segment
+
+
+def test_segment_groups_decodes_combined_keys():
+    segments = pd.DataFrame({
+        "tenant_id": ["b", "a", "b", "a", "c"],
+        "company_size": ["large", "small", "large", "large", "small"]
+    })
+    keys, groups = segment_groups(segments, ["tenant_id", "company_size"])
+
+    assert keys.tolist() == ["a|large", "a|small", "b|large", "c|small"]
+    assert keys[groups].tolist() == [
+        f"{tenant}|{size}" for tenant, size in zip(segments["tenant_id"], segments["company_size"])
+    ]
+
+
+def test_segment_groups_keeps_missing_values_and_separators_apart():
+    segments = pd.DataFrame({
+        "tenant_id": ["a|b", "a", "a", None, np.nan],
+        "industry": ["c", "b|c", "b|c", "x", "x"]
+    })
+    keys, groups = segment_groups(segments, ["tenant_id", "industry"])
+
+    # "a|b" + "c" and "a" + "b|c" stay distinct; None and NaN are one segment
+    assert len(set(keys.tolist())) == len(keys) == 3
+    assert groups[1] == groups[2] and groups[3] == groups[4]
+    assert len({groups[0], groups[1], groups[3]}) == 3
+    assert keys[groups[3]] == "nan|x"
+    # Single columns are keyed by the raw value
+    keys, groups = segment_groups(segments, ["industry"])
+    assert keys[groups].tolist() == ["c", "b|c", "b|c", "x", "x"]
+
+
+def test_segment_psi_matches_per_segment_detector_runs(detector, baseline, current):
+    segment_drift = SegmentDriftDetector(detector, segmentations=[("tenant_id",)], min_samples=100)
+    segment_drift.fit_reference(*baseline)
+    results = segment_drift.detect(*current, top_features=3)
+    ranked = results["segmentations"]["tenant_id"]
+
+    assert [segment["segment"] for segment in ranked][0] == "t2"
+    assert sorted(segment["segment"] for segment in ranked) == TENANTS.tolist()
+
+    X_base, segments_base, probabilities_base = baseline
+    X, segments, probabilities = current
+    for segment in ranked:
+        base_rows = (segments_base["tenant_id"] == segment["segment"]).to_numpy()
+        rows = (segments["tenant_id"] == segment["segment"]).to_numpy()
+        expected = _segment_detector(detector, X_base[base_rows], probabilities_base[base_rows])
+
+        drift = expected.detect_multivariate_drift(pd.DataFrame(X[rows], columns=list(FEATURE_NAMES)))
+        assert segment["n_samples"] == rows.sum()
+        assert segment["reference_samples"] == base_rows.sum()
+        assert segment["max_psi"] == pytest.approx(drift["max_psi"], rel=1e-9)
+        assert segment["average_psi"] == pytest.approx(drift["average_psi"], rel=1e-9)
+        assert segment["drifted_features"] == drift["drifted_features"]
+        assert segment["prediction_psi"] == pytest.approx(
+            expected.detect_prediction_drift(probabilities[rows])["psi"], rel=1e-9
+        )
+
+
+def test_small_and_unknown_segments_are_skipped(detector, baseline, current):
+    X_base, segments_base, probabilities_base = baseline
+    keep = (segments_base["tenant_id"] != "t3").to_numpy()
+    segment_drift = SegmentDriftDetector(detector, segmentations=[("tenant_id",), ("tenant_id", "company_size")])
+    segment_drift.fit_reference(X_base[keep], segments_base[keep], probabilities_base[keep])
+
+    segment_drift.min_samples = 600
+    results = segment_drift.detect(*current)
+
+    # t3 has no reference; tenant x size segments have fewer than 600 current rows
+    assert [segment["segment"] for segment in results["segmentations"]["tenant_id"]] == ["t2", "t1"]
+    assert results["skipped"]["tenant_id"] == ["t3"]
+    assert results["segmentations"]["tenant_id+company_size"] == []
+    assert len(results["skipped"]["tenant_id+company_size"]) == 6
+
+
+def test_saved_reference_gives_the_same_results(detector, baseline, current, tmp_path):
+    segment_drift = SegmentDriftDetector(detector, segmentations=[("tenant_id",), ("tenant_id", "company_size")])
+    segment_drift.fit_reference(*baseline)
+    segment_drift.save_reference(str(tmp_path / "segments.npz"))
+
+    loaded = SegmentDriftDetector(detector, segmentations=segment_drift.segmentations)
+    loaded.load_reference(str(tmp_path / "segments.npz"))
+    expected, actual = segment_drift.detect(*current), loaded.detect(*current)
+    assert actual["segmentations"] == expected["segmentations"]
+    assert actual["skipped"] == expected["skipped"]
+
+    other = DriftDetector()
+    other.reference_distributions = {name: detector.reference_distributions[name] for name in FEATURE_NAMES[:3]}
+    with pytest.raises(ValueError, match="different global reference"):
+        SegmentDriftDetector(other).load_reference(str(tmp_path / "segments.npz"))
+
+
+def test_reference_without_features_is_rejected(detector):
+    predictions_only = DriftDetector()
+    predictions_only.reference_distributions = {"predictions": detector.reference_distributions["predictions"]}
+
+    with pytest.raises(ValueError, match="features"):
+        SegmentDriftDetector(predictions_only)
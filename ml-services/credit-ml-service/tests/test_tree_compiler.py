@@ -0,0 +1,194 @@
+"""Parity of compiled flat forests with native XGBoost / LightGBM"""
+
+import json
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+from app.models.tree_compiler import (
+    FlatForest,
+    compile_lightgbm,
+    compile_xgboost,
+    concatenate_forests
+)
+
+N_FEATURES = 6
+ATOL = 1e-6
+
+
+def _training_data(n_rows: int = 2000, seed: int = 0):
+    """Mixed-scale features with missing values and exact zeros"""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, N_FEATURES)).astype(np.float32)
+    X[:, 1] = np.round(X[:, 1] * 4) / 4             # Few distinct values: many ties at thresholds
+    X[:, 2] = rng.lognormal(10, 1.5, n_rows)         # Monetary scale
+    X[rng.random(n_rows) < 0.2, 3] = 0.0
+    X[rng.random(X.shape) < 0.1] = np.nan
+
+    logit = X[:, 0] + 0.5 * np.nan_to_num(X[:, 1]) + np.isnan(X[:, 4]) - 0.3
+    y = (rng.random(n_rows) < 1 / (1 + np.exp(-logit))).astype(int)
+    return X, y
+
+
+def _split_values(forest: FlatForest) -> np.ndarray:
+    """Rows placing every feature exactly on, and just either side of, the split thresholds"""
+    inner = ~forest.is_leaf
+    rows = []
+    for feature, threshold in zip(forest.feature[inner], forest.threshold[inner]):
+        for value in (
+            np.nextafter(threshold, np.float32(-np.inf)),
+            threshold,
+            np.nextafter(threshold, np.float32(np.inf))
+        ):
+            row = np.zeros(N_FEATURES, dtype=np.float32)
+            row[feature] = value
+            rows.append(row)
+    return np.array(rows, dtype=np.float32)
+
+
+def _probe(forest: FlatForest, seed: int = 1) -> np.ndarray:
+    """Random rows (NaNs, zeros) plus threshold edge rows"""
+    X, _ = _training_data(500, seed=seed)
+    X[:50] = np.nan
+    X[50:100] = 0.0
+    edges = _split_values(forest)
+    edges[::7] = np.nan  # Missing values in edge rows too
+    return np.vstack([X, edges])
+
+
+@pytest.fixture(scope="module")
+def data():
+    return _training_data()
+
+
+@pytest.fixture(scope="module")
+def xgb_model(data):
+    X, y = data
+    model = xgb.XGBClassifier(n_estimators=60, max_depth=5, learning_rate=0.1, base_score=0.3)
+    return model.fit(X, y)
+
+
+@pytest.fixture(scope="module")
+def lgb_model(data):
+    X, y = data
+    model = lgb.LGBMClassifier(n_estimators=60, num_leaves=15, learning_rate=0.1, verbose=-1)
+    return model.fit(X, y)
+
+
+def test_xgboost_probabilities_match(xgb_model):
+    forest = compile_xgboost(xgb_model.get_booster())
+    X = _probe(forest)
+
+    native = xgb_model.predict_proba(X)[:, 1]
+    np.testing.assert_allclose(forest.predict_proba(X)[:, 0], native, atol=ATOL)
+
+
+def test_xgboost_margins_match(xgb_model):
+    forest = compile_xgboost(xgb_model.get_booster())
+    X = _probe(forest)
+
+    native = xgb_model.get_booster().predict(xgb.DMatrix(X), output_margin=True)
+    np.testing.assert_allclose(forest.predict_margin(X)[:, 0], native, atol=1e-5)
+    assert forest.n_trees == 60
+
+
+def test_xgboost_truncated_to_best_iteration(xgb_model):
+    forest = compile_xgboost(xgb_model.get_booster(), num_trees=20)
+    X = _probe(forest)
+
+    native = xgb_model.get_booster().predict(xgb.DMatrix(X), iteration_range=(0, 20))
+    np.testing.assert_allclose(forest.predict_proba(X)[:, 0], native, atol=ATOL)
+
+
+def test_lightgbm_probabilities_match(lgb_model):
+    forest = compile_lightgbm(lgb_model.booster_)
+    X = _probe(forest)
+
+    native = lgb_model.predict_proba(X)[:, 1]
+    np.testing.assert_allclose(forest.predict_proba(X)[:, 0], native, atol=ATOL)
+
+
+def test_lightgbm_margins_match(lgb_model):
+    forest = compile_lightgbm(lgb_model.booster_)
+    X = _probe(forest)
+
+    native = lgb_model.booster_.predict(X, raw_score=True)
+    np.testing.assert_allclose(forest.predict_margin(X)[:, 0], native, atol=1e-5)
+
+
+@pytest.mark.parametrize("params", [
+    {"zero_as_missing": True},   # missing_type=Zero: 0 and NaN take the default branch
+    {"use_missing": False},      # missing_type=None: NaN is treated as 0
+    {"objective": "binary", "sigmoid": 0.7}
+])
+def test_lightgbm_missing_modes_and_sigmoid(data, params):
+    X, y = data
+    model = lgb.LGBMClassifier(n_estimators=30, num_leaves=15, verbose=-1, **params).fit(X, y)
+    forest = compile_lightgbm(model.booster_)
+    probe = _probe(forest)
+
+    np.testing.assert_allclose(forest.predict_proba(probe)[:, 0], model.predict_proba(probe)[:, 1], atol=ATOL)
+
+
+def test_fused_forest_matches_both_libraries(xgb_model, lgb_model):
+    forest = concatenate_forests([
+        compile_xgboost(xgb_model.get_booster()),
+        compile_lightgbm(lgb_model.booster_)
+    ])
+    X = _probe(forest)
+
+    proba = forest.predict_proba(X)
+    np.testing.assert_allclose(proba[:, 0], xgb_model.predict_proba(X)[:, 1], atol=ATOL)
+    np.testing.assert_allclose(proba[:, 1], lgb_model.predict_proba(X)[:, 1], atol=ATOL)
+
+
+def test_saved_forest_loads_memory_mapped(xgb_model, tmp_path):
+    forest = compile_xgboost(xgb_model.get_booster())
+    forest.save(str(tmp_path / "forest"))
+    loaded = FlatForest.load(str(tmp_path / "forest"))
+    X = _probe(forest)
+
+    assert isinstance(loaded.value, np.memmap)
+    np.testing.assert_array_equal(loaded.predict_proba(X), forest.predict_proba(X))
+
+
+def test_categorical_splits_are_rejected(data):
+    """Categorical splits are not compiled; the ensemble then stays on native inference"""
+    X, y = data
+    frame = pd.DataFrame(np.nan_to_num(X[:, :3]), columns=["a", "b", "c"])
+    frame["category"] = pd.Categorical(np.random.default_rng(0).integers(0, 5, len(frame)))
+    y = (frame["category"].cat.codes.to_numpy() % 2 == 0).astype(int)
+
+    xgb_categorical = xgb.XGBClassifier(n_estimators=5, tree_method="hist", enable_categorical=True).fit(frame, y)
+    with pytest.raises(ValueError, match="Categorical"):
+        compile_xgboost(xgb_categorical.get_booster())
+
+    lgb_categorical = lgb.LGBMClassifier(n_estimators=5, verbose=-1, min_child_samples=5).fit(frame, y)
+    dumped = json.dumps(lgb_categorical.booster_.dump_model())
+    assert '"=="' in dumped
+    with pytest.raises(ValueError, match="Unsupported LightGBM split"):
+        compile_lightgbm(lgb_categorical.booster_)
+
+
+def test_contributions_match_xgboost_approx_contribs(xgb_model):
+    forest = compile_xgboost(xgb_model.get_booster())
+    X = _probe(forest)
+
+    contributions = forest.predict_contributions(X)
+    native = xgb_model.get_booster().predict(xgb.DMatrix(X), pred_contribs=True, approx_contribs=True)
+    np.testing.assert_allclose(contributions[:, 0], native, atol=1e-5)
+
+
+def test_fused_contributions_sum_to_margins(xgb_model, lgb_model):
+    forest = concatenate_forests([
+        compile_xgboost(xgb_model.get_booster()),
+        compile_lightgbm(lgb_model.booster_)
+    ])
+    X = _probe(forest)
+
+    contributions = forest.predict_contributions(X)
+    assert contributions.shape == (len(X), 2, N_FEATURES + 1)
+    np.testing.assert_allclose(contributions.sum(axis=2), forest.predict_margin(X), atol=1e-9)